@@ -11,18 +11,59 @@ folders for conversion.
 """
 
 import argparse
+import contextlib
+import errno
+import functools
+import hashlib
+import importlib.machinery
+import importlib.util
+import io
+import operator
 import re
+import string
 import sys
-import subprocess
-import tempfile
 import shutil
 import json
-import urllib.request
-import urllib.error
+import os
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Sequence, Set, Tuple, Callable
 from collections import defaultdict
-import yaml
+from types import ModuleType
+
+
+def _lazy_import(name: str) -> ModuleType:
+    """
+    Import a module whose code only runs when one of its attributes is first used.
+    
+    The extension starts the converter once per conversion, so modules that
+    only some paths need (PyYAML, asyncio) are bound this way instead of
+    being loaded on every start. Modules used by a single function are
+    imported inside it instead.
+    
+    Args:
+        name: Absolute module name
+        
+    Returns:
+        The module, or a placeholder that loads it on first attribute access
+        
+    Raises:
+        ModuleNotFoundError: If the module is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+asyncio = _lazy_import('asyncio')
+yaml = _lazy_import('yaml')
 
 # Version information
 __version__ = "1.0.0"
@@ -30,16 +71,2044 @@ __update_url__ = "https://raw.githubusercontent.com/thynaptic/Cursor2Copilot-Rul
 __version_url__ = "https://raw.githubusercontent.com/thynaptic/Cursor2Copilot-Rules-Coverter/main/VERSION"
 __github_releases__ = "https://github.com/thynaptic/Cursor2Copilot-Rules-Coverter/releases/latest"
 
+# Counters that are accumulated per file and merged across workers / cache hits
+FILE_COUNTER_KEYS = ('total_files', 'successful', 'failed', 'skipped', 'total_rules', 'total_size_bytes')
+
+# Phases timed per file and cumulatively; glob, compact and write are only cumulative
+TIMING_PHASES = ('glob', 'read', 'preprocess', 'yaml', 'fallback', 'render', 'compact', 'write')
+
+# Write buffer for streamed output files
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Directories the scanner never enters; build output is normally covered by .gitignore
+DEFAULT_IGNORE_DIRS = ('.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv',
+                       '.tox', '.mypy_cache', '.pytest_cache', '.backups', '.convertmdc-cache')
+
+# --repo/--repos: clones running at once, and the per-git-command timeout in seconds
+DEFAULT_FETCH_CONCURRENCY = 4
+GIT_TIMEOUT = 300
+
+# Bare mirrors of fetched repositories, kept under <cache-dir>/repos
+DEFAULT_REPO_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_REPO_MAX_AGE = 3600
+
+# Backups kept per output file or repository; 0 keeps all of them, so pruning is opt-in
+DEFAULT_BACKUP_KEEP = 0
+
+# --shard: instructions files are named <name>.instructions.md, listed in INDEX file
+SHARD_SUFFIX = '.instructions.md'
+SHARD_INDEX = 'index.md'
+SHARD_MANIFEST = '.convertmdc-shards.json'
+
+# --watch: quiet time before a rebuild, and the polling period without inotify
+DEFAULT_WATCH_DEBOUNCE_MS = 300
+DEFAULT_POLL_INTERVAL = 1.0
+# Bump when the cached entry layout or the rendered output changes
+_CACHE_FORMAT = 6
+# Bump when the layout of the repository mirrors or their index changes
+_REPO_CACHE_FORMAT = 1
+# Stands for the source path in cached error messages, which are shared by files with the same content
+_CACHE_PATH_PLACEHOLDER = '\0source\0'
+
+# Rule keys held in Rule attributes; any others are kept in Rule.extra
+_RULE_FIELDS = ('id', 'description', 'severity')
+
+# Compaction (--compact/--max-tokens): rules are kept in this order when a budget is tight
+SEVERITY_PRIORITY = {'error': 0, 'warning': 1, 'info': 2, 'hint': 3}
+
+# Pieces of sections rendered by convert_to_copilot_instructions, as seen by OutputCompactor
+_COMPACT_SOURCE = re.compile(r'^- \*\*Source:\*\* `([^`\n]*)`$', re.MULTILINE)
+_COMPACT_METADATA_LINES = re.compile(r'^- \*\*(?:Source|Always Apply):\*\* [^\n]*\n', re.MULTILINE)
+_COMPACT_METADATA_HEADING = re.compile(r'^## Metadata\n\n', re.MULTILINE)
+_COMPACT_REFERENCES = re.compile(r'^## References\n\n(?:- [^\n]*\n)*\n?', re.MULTILINE)
+_COMPACT_RULES_END = re.compile(r'^## (?:Enforcement|References)\n|\n---\n\Z', re.MULTILINE)
+_COMPACT_RULE_HEADING = re.compile(r'^### ([^\n]*)\n\n\*\*Severity:\*\* `([^`\n]*)`\n', re.MULTILINE)
+
+# Files of at least this many bytes are memory-mapped by read_rule_file
+MMAP_THRESHOLD = 1024 * 1024
+
+# Every character that \s matches in text, as UTF-8, so scans of mapped bytes see the same runs
+_UTF8_WHITESPACE = (rb'(?:[\t-\r\x1c- ]|\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]'
+                    rb'|\xe2\x81\x9f|\xe3\x80\x80)')
+
+
+class _ScanSyntax:
+    """Markers and patterns used by scan_mdc_sections, for text or for mapped UTF-8 bytes."""
+    
+    def __init__(self, text: bool):
+        encode = (lambda value: value) if text else (lambda value: value.encode('ascii'))
+        whitespace = r'\s' if text else _UTF8_WHITESPACE
+        # All patterns are matched anchored at a position
+        self.whitespace_run = re.compile(whitespace + encode('*'))
+        self.section_key = re.compile(encode(r'[a-z_]+:'))
+        self.candidate_line = re.compile(encode(r'^[-a-z_]'), re.MULTILINE)
+        self.frontmatter = re.compile(encode('^---') + whitespace + encode(r'*\n(.*?\n)---')
+                                      + whitespace + encode(r'*\n'), re.DOTALL)
+        self.newline = encode('\n')
+        self.closing_marker = encode('\n---')
+        self.marker = encode('---')
+        self.rules = encode('rules:')
+        self.enforcement = encode('enforcement:')
+        self.references = encode('references:')
+        # mmap has no startswith
+        self.startswith = str.startswith if text else (
+            lambda content, prefix, pos: content[pos:pos + len(prefix)] == prefix)
+
+
+_TEXT_SYNTAX = _ScanSyntax(text=True)
+_MAPPED_SYNTAX = _ScanSyntax(text=False)
+
+
+def _marker_end(content: Any, pos: int, syntax: _ScanSyntax = _TEXT_SYNTAX) -> int:
+    """
+    Return the end of a ``\\s*\\n`` run starting at pos, or -1 if there is none.
+    
+    Like the greedy regex, the run ends just after the last newline in the
+    whitespace that follows pos.
+    """
+    run_end = syntax.whitespace_run.match(content, pos).end()
+    newline = content.rfind(syntax.newline, pos, run_end)
+    return newline + 1 if newline >= 0 else -1
+
+
+def decode_slice(content: Any, start: int, end: int) -> str:
+    """Return content[start:end] as text, decoding it when content is a memory-mapped file."""
+    text = content[start:end]
+    return text if isinstance(text, str) else text.decode('utf-8')
+
+
+def _section_yaml(content: Any, key: str, line: int, start: int, end: int) -> str:
+    """Build the ``key:\\n`` + body YAML for a section, slicing it in one piece when possible."""
+    if start == line + len(key) + 2:
+        # The section is already "key:\n<body>" in the source
+        return decode_slice(content, line, end)
+    return f"{key}:\n" + decode_slice(content, start, end)
+
+
+@contextlib.contextmanager
+def read_rule_file(file_path: Path) -> Iterator[Tuple[Any, int]]:
+    """
+    Open a .mdc file for scan_mdc_sections.
+    
+    Files of MMAP_THRESHOLD bytes or more are memory-mapped: sections are
+    then found on the bytes, and only the slices passed to decode_slice()
+    are copied, instead of the whole file being decoded and sliced again.
+    Smaller files, and files with carriage returns (which reading as text
+    translates to newlines), are read as text. The file is stat'ed once.
+    
+    Args:
+        file_path: Path to the .mdc file
+        
+    Yields:
+        Tuple of (content as str or read-only mmap, size in bytes)
+    """
+    with open(file_path, 'rb') as handle:
+        size = os.fstat(handle.fileno()).st_size
+        mapped = None
+        if size >= MMAP_THRESHOLD:
+            import mmap
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            if mapped.find(b'\r') >= 0:
+                mapped.close()
+                mapped = None
+        if mapped is None:
+            yield io.TextIOWrapper(handle, encoding='utf-8').read(), size
+            return
+        try:
+            yield mapped, size
+        finally:
+            # A traceback that still references a match object keeps the buffer exported;
+            # the map is then closed when it is collected
+            with contextlib.suppress(BufferError):
+                mapped.close()
+
+
+def scan_mdc_sections(content: Any) -> Optional[Dict[str, Any]]:
+    """
+    Locate the sections of a .mdc file in a single pass over its lines.
+    
+    Produces the same boundaries as the original regex cascade (frontmatter
+    between ``---`` lines, then ``rules:``, ``enforcement:`` inside the rules
+    block, and ``references:``) without copying the content.
+    
+    Args:
+        content: Full .mdc file content, as str or as a memory-mapped file
+            from read_rule_file() (offsets are then byte offsets)
+        
+    Returns:
+        None if there is no frontmatter, otherwise a dictionary with
+        ``frontmatter`` as (start, end), ``body`` as the offset where the
+        markdown body starts, and ``rules``, ``enforcement`` and
+        ``references`` as (marker line, content start, content end) or None
+    """
+    syntax = _TEXT_SYNTAX if isinstance(content, str) else _MAPPED_SYNTAX
+    startswith = syntax.startswith
+    length = len(content)
+    frontmatter_start = _marker_end(content, 3, syntax) if startswith(content, syntax.marker, 0) else -1
+    if frontmatter_start < 0:
+        return None
+    
+    # Frontmatter ends at the first following line that is "---" plus a newline
+    frontmatter_end = body = -1
+    pos = frontmatter_start
+    while True:
+        newline = content.find(syntax.closing_marker, pos)
+        if newline < 0:
+            break
+        line = newline + 1
+        body = _marker_end(content, line + 3, syntax)
+        if body >= 0:
+            frontmatter_end = line
+            break
+        pos = line
+    if frontmatter_end < 0:
+        # Only the regex's backtracking into blank lines after the opening
+        # marker can still match here; let it decide
+        match = syntax.frontmatter.match(content)
+        if not match:
+            return None
+        frontmatter_start, frontmatter_end, body = match.start(1), match.end(1), match.end()
+    
+    rules_line = rules_start = rules_end = -1
+    enforcement_line = enforcement_start = enforcement_end = -1
+    references_line = references_start = references_end = -1
+    
+    # Every marker starts with "-" or a lowercase letter, so other lines are skipped
+    for candidate in syntax.candidate_line.finditer(content, body):
+        line = candidate.start()
+        if rules_start < 0:
+            if startswith(content, syntax.rules, line):
+                rules_start = _marker_end(content, line + 6, syntax)
+                if rules_start >= 0:
+                    rules_line = line
+        elif rules_end < 0 and line >= rules_start:
+            if startswith(content, syntax.references, line) or startswith(content, syntax.marker, line):
+                rules_end = line
+            elif enforcement_start < 0:
+                if startswith(content, syntax.enforcement, line):
+                    enforcement_start = _marker_end(content, line + 12, syntax)
+                    if enforcement_start >= 0:
+                        enforcement_line = line
+            elif enforcement_end < 0 and line >= enforcement_start:
+                if syntax.section_key.match(content, line):
+                    enforcement_end = line
+        
+        if references_start < 0:
+            if startswith(content, syntax.references, line):
+                references_start = _marker_end(content, line + 11, syntax)
+                if references_start >= 0:
+                    references_line = line
+        elif references_end < 0 and line >= references_start:
+            if startswith(content, syntax.marker, line):
+                references_end = line
+    
+    if rules_start >= 0 and rules_end < 0:
+        rules_end = length
+    if enforcement_start >= 0 and enforcement_end < 0:
+        enforcement_end = rules_end
+    if references_start >= 0 and references_end < 0:
+        references_end = length
+    
+    return {
+        'frontmatter': (frontmatter_start, frontmatter_end),
+        'body': body,
+        'rules': (rules_line, rules_start, rules_end) if rules_start >= 0 else None,
+        'enforcement': ((enforcement_line, enforcement_start, enforcement_end)
+                        if enforcement_start >= 0 else None),
+        'references': ((references_line, references_start, references_end)
+                       if references_start >= 0 else None),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def yaml_loader() -> type:
+    """PyYAML loader class: libyaml's, which is several times faster, when it is built in."""
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _yaml_loader_name() -> str:
+    """Name of the class yaml_loader() returns, found without loading PyYAML."""
+    spec = importlib.util.find_spec('yaml')
+    for location in (spec.submodule_search_locations or []) if spec else []:
+        for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+            if os.path.exists(os.path.join(location, '_yaml' + suffix)):
+                return 'CSafeLoader'
+    return 'SafeLoader'
+
+# Scalars the YAML 1.1 resolver turns into something other than a string
+_YAML_BOOLS = {
+    'yes': True, 'Yes': True, 'YES': True, 'no': False, 'No': False, 'NO': False,
+    'true': True, 'True': True, 'TRUE': True, 'false': False, 'False': False, 'FALSE': False,
+    'on': True, 'On': True, 'ON': True, 'off': False, 'Off': False, 'OFF': False,
+}
+_YAML_NULLS = {'~', 'null', 'Null', 'NULL'}
+# Tabs, carriage returns, the other YAML line breaks, BOMs and control
+# characters all have special rules, so text containing them goes to PyYAML
+_FAST_YAML_UNSAFE = re.compile(
+    '[^\n\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010ffff]'
+)
+# Document markers start a new YAML document, which only PyYAML handles
+_YAML_DOCUMENT_MARKER = re.compile(r'^(?:---|\.\.\.)', re.MULTILINE)
+# Tabs and document markers are where libyaml accepts input the pure-Python loader rejects
+_LIBYAML_DIVERGENT = re.compile(r'\t|^(?:---|\.\.\.)', re.MULTILINE)
+_FAST_YAML_KEY = re.compile(r'([A-Za-z_][A-Za-z0-9_-]*):(?: +|\Z)')
+_FAST_YAML_PLAIN = re.compile(r'[A-Za-z_]')
+_FAST_YAML_INT = re.compile(r'0|[1-9][0-9]*')
+
+
+class _FastPathUnsupported(Exception):
+    """Raised when text uses YAML outside the subset the fast path understands."""
+
+
+class _FastYAMLParser:
+    """
+    Parser for the small block-YAML subset that rule files normally use.
+    
+    Understands mappings and sequences nested by indentation, plain, simply
+    quoted and integer scalars, and ``|``/``|-`` literal blocks. That covers
+    the usual frontmatter and ``- id: / severity: / description: |`` rules.
+    Anything else (flow collections, anchors, tags, comments, folded or
+    multi-line plain scalars, escapes) raises _FastPathUnsupported so the
+    caller can hand the text to PyYAML, which parses it or reports the error.
+    """
+    
+    def __init__(self, text: str):
+        if '\t' in text or _YAML_DOCUMENT_MARKER.search(text):
+            raise _FastPathUnsupported()
+        self.lines = text.split('\n')
+        self.pos = 0
+    
+    def parse(self) -> Any:
+        """Parse the whole text; every line must be consumed by the subset."""
+        indent = self._next_indent()
+        if indent < 0:
+            return None
+        if indent != 0:
+            raise _FastPathUnsupported()
+        value = self._parse_node(0)
+        if self._next_indent() >= 0:
+            raise _FastPathUnsupported()
+        return value
+    
+    def _next_indent(self) -> int:
+        """Skip blank lines and return the indentation of the next line, or -1 at the end."""
+        lines = self.lines
+        while self.pos < len(lines):
+            line = lines[self.pos]
+            stripped = line.lstrip(' ')
+            if stripped:
+                return len(line) - len(stripped)
+            self.pos += 1
+        return -1
+    
+    def _parse_node(self, indent: int) -> Any:
+        if self.lines[self.pos].startswith('- ', indent):
+            return self._parse_sequence(indent)
+        return self._parse_mapping(indent, indent)
+    
+    def _parse_sequence(self, indent: int) -> List[Any]:
+        items = []
+        while True:
+            line = self.lines[self.pos]
+            if line.startswith('- ', indent + 2):
+                raise _FastPathUnsupported()
+            if _FAST_YAML_KEY.match(line, indent + 2):
+                items.append(self._parse_mapping(indent + 2, indent + 2))
+            else:
+                self.pos += 1
+                items.append(self._parse_scalar(line[indent + 2:].rstrip(' ')))
+            
+            next_indent = self._next_indent()
+            if next_indent > indent:
+                raise _FastPathUnsupported()
+            if next_indent < indent or not self.lines[self.pos].startswith('- ', indent):
+                # Whoever owns the next line decides whether it is valid
+                return items
+    
+    def _parse_mapping(self, indent: int, column: int) -> Dict[Any, Any]:
+        """Parse a mapping whose keys sit at indent; the first key starts at column."""
+        lines = self.lines
+        mapping = {}
+        while True:
+            line = lines[self.pos]
+            match = _FAST_YAML_KEY.match(line, column)
+            if not match:
+                raise _FastPathUnsupported()
+            key = match.group(1)
+            if key in _YAML_BOOLS or key in _YAML_NULLS:
+                raise _FastPathUnsupported()
+            self.pos += 1
+            value = line[match.end():].rstrip(' ')
+            
+            if not value:
+                next_indent = self._next_indent()
+                if next_indent > indent or (
+                        next_indent == indent and lines[self.pos].startswith('- ', indent)):
+                    mapping[key] = self._parse_node(next_indent)
+                else:
+                    mapping[key] = None
+            elif value == '|' or value == '|-':
+                mapping[key] = self._parse_literal(indent, clip=value == '|')
+            else:
+                mapping[key] = self._parse_scalar(value)
+            
+            next_indent = self._next_indent()
+            if next_indent < indent:
+                return mapping
+            if next_indent > indent or lines[self.pos].startswith('-', indent):
+                raise _FastPathUnsupported()
+            column = indent
+    
+    def _parse_literal(self, indent: int, clip: bool) -> str:
+        """Parse the lines of a ``|`` or ``|-`` block whose key sits at indent."""
+        lines = self.lines
+        if self.pos >= len(lines):
+            raise _FastPathUnsupported()
+        first = lines[self.pos]
+        block_indent = len(first) - len(first.lstrip(' '))
+        if block_indent <= indent or block_indent == len(first):
+            # Empty blocks and leading blank lines follow their own indentation rules
+            raise _FastPathUnsupported()
+        
+        content = []
+        kept = 0
+        last_line = self.pos
+        while self.pos < len(lines):
+            line = lines[self.pos]
+            stripped = line.lstrip(' ')
+            if not stripped:
+                if len(line) > block_indent:
+                    # Spaces beyond the block indentation are content
+                    raise _FastPathUnsupported()
+                content.append('')
+            elif len(line) - len(stripped) < block_indent:
+                break
+            else:
+                content.append(line[block_indent:])
+                kept = len(content)
+                last_line = self.pos
+            self.pos += 1
+        
+        # Trailing blank lines are dropped; clip keeps the final line break if there is one
+        text = '\n'.join(content[:kept])
+        if clip and last_line < len(lines) - 1:
+            text += '\n'
+        self.pos = last_line + 1
+        return text
+    
+    @staticmethod
+    def _parse_scalar(value: str) -> Any:
+        first = value[:1]
+        if first == '"' or first == "'":
+            inner = value[1:-1]
+            if len(value) < 2 or value[-1] != first or first in inner or '\\' in inner:
+                raise _FastPathUnsupported()
+            return inner
+        if _FAST_YAML_PLAIN.match(value):
+            if ': ' in value or ' #' in value or value.endswith(':'):
+                raise _FastPathUnsupported()
+            if value in _YAML_BOOLS:
+                return _YAML_BOOLS[value]
+            if value in _YAML_NULLS:
+                return None
+            return value
+        if _FAST_YAML_INT.fullmatch(value):
+            return int(value)
+        raise _FastPathUnsupported()
+
+
+def load_yaml(text: str) -> Any:
+    """
+    Load a YAML document, skipping PyYAML for the subset rule files usually use.
+    
+    Args:
+        text: YAML source
+        
+    Returns:
+        The same value yaml.safe_load would return
+        
+    Raises:
+        yaml.YAMLError: The error yaml.safe_load raises, if the text is
+            outside the fast subset and PyYAML cannot parse it either
+    """
+    if not _FAST_YAML_UNSAFE.search(text):
+        try:
+            return _FastYAMLParser(text).parse()
+        except _FastPathUnsupported:
+            pass
+    loader = yaml_loader()
+    if loader is not yaml.SafeLoader and not _LIBYAML_DIVERGENT.search(text):
+        try:
+            return yaml.load(text, Loader=loader)
+        except yaml.YAMLError:
+            # libyaml words its errors differently; report the pure-Python loader's
+            pass
+    return yaml.load(text, Loader=yaml.SafeLoader)
+
+
+def apply_to_globs(frontmatter: Dict[str, Any]) -> Optional[str]:
+    """
+    Build the applyTo value of a .instructions.md file from rule frontmatter.
+    
+    Args:
+        frontmatter: Parsed frontmatter with optional globs and alwaysApply
+        
+    Returns:
+        Comma-separated glob patterns, "**" for rules that always apply, or
+        None for rules without a scope
+    """
+    globs = frontmatter.get('globs')
+    if isinstance(globs, str):
+        # Flow lists arrive as strings once unquoted globs have been quoted by preprocessing
+        stripped = globs.strip()
+        if stripped.startswith('[') and stripped.endswith(']'):
+            stripped = stripped[1:-1]
+        globs = [pattern.strip().strip('\'"') for pattern in stripped.split(',')]
+    if isinstance(globs, list):
+        patterns = [str(pattern).strip() for pattern in globs if str(pattern).strip()]
+        if patterns:
+            return ', '.join(patterns)
+    if frontmatter.get('alwaysApply') is True:
+        return '**'
+    return None
+
+
+class Rule:
+    """
+    One rule of a .mdc file.
+    
+    Fields missing from the source hold the values the renderer shows for
+    them, and the description is stripped once here. The id and severity
+    are interned: a handful of severities, and often the same ids, repeat
+    across thousands of rules. Other keys of the rule mapping are kept in
+    extra (None when there are none).
+    """
+    
+    __slots__ = ('id', 'description', 'severity', 'extra')
+    
+    def __init__(self, rule_id: str, description: str, severity: str,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = sys.intern(rule_id)
+        self.description = description
+        self.severity = sys.intern(severity)
+        self.extra = extra
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Rule':
+        """
+        Build a rule from its parsed YAML mapping.
+        
+        Raises:
+            ValueError: If data is not a mapping
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"rule is not a mapping: {data!r}")
+        description = data.get('description', '')
+        extra = {key: value for key, value in data.items() if key not in _RULE_FIELDS}
+        return cls(str(data.get('id', 'unknown')),
+                   '' if description is None else str(description).strip(),
+                   str(data.get('severity', 'warning')),
+                   extra or None)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The rule as a plain mapping, with defaults filled in."""
+        data = {'id': self.id, 'description': self.description, 'severity': self.severity}
+        if self.extra:
+            data.update(self.extra)
+        return data
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return (self.id, self.description, self.severity, self.extra) == \
+            (other.id, other.description, other.severity, other.extra)
+    
+    def __repr__(self) -> str:
+        return f"Rule(id={self.id!r}, severity={self.severity!r}, description={self.description!r})"
+
+
+class ParsedRuleFile:
+    """
+    A parsed .mdc file, as returned by CursorRuleConverter.parse_mdc_file().
+    
+    Attributes:
+        file_path: Source file
+        frontmatter: Parsed frontmatter (normally a dict)
+        markdown_header: Markdown between the frontmatter and the rules, stripped
+        rules: Rules in source order
+        references: Entries of the references section
+        enforcement: Raw enforcement section, or None
+    """
+    
+    __slots__ = ('file_path', 'frontmatter', 'markdown_header', 'rules', 'references', 'enforcement')
+    
+    def __init__(self, file_path: Path, frontmatter: Any, markdown_header: str, rules: List[Rule],
+                 references: List[Any], enforcement: Optional[str] = None):
+        self.file_path = file_path
+        self.frontmatter = frontmatter
+        self.markdown_header = markdown_header
+        self.rules = rules
+        self.references = references
+        self.enforcement = enforcement
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ParsedRuleFile':
+        """Build from the dictionary layout parse_mdc_file() used to return."""
+        return cls(data['file_path'], data['frontmatter'], data['markdown_header'],
+                   [rule if isinstance(rule, Rule) else Rule.from_dict(rule) for rule in data['rules']],
+                   data['references'], data.get('enforcement'))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The parsed file in the plain dictionary layout, rules included as mappings."""
+        return {
+            'file_path': self.file_path,
+            'frontmatter': self.frontmatter,
+            'markdown_header': self.markdown_header,
+            'rules': [rule.to_dict() for rule in self.rules],
+            'references': self.references,
+            'enforcement': self.enforcement,
+        }
+    
+    def __repr__(self) -> str:
+        return f"ParsedRuleFile(file_path={self.file_path!r}, rules={len(self.rules)})"
+
+
+class Template:
+    """
+    Layout text with ``{field}`` placeholders, compiled once for fast filling.
+    
+    The text is turned into a printf-style pattern and an attribute getter
+    when the template is built, so filling it is a single % operation
+    instead of parsing the layout again for every rule.
+    """
+    
+    __slots__ = ('fields', '_pattern', '_getter')
+    
+    def __init__(self, text: str):
+        pattern: List[str] = []
+        fields: List[str] = []
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            pattern.append(literal.replace('%', '%%'))
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"Unsupported template field {{{field}}} in {text!r}")
+            pattern.append('%s')
+            fields.append(field)
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self._pattern = ''.join(pattern)
+        if len(fields) > 1:
+            self._getter = operator.attrgetter(*fields)
+        elif fields:
+            # attrgetter returns the bare value, not a tuple, for a single field
+            single = operator.attrgetter(fields[0])
+            self._getter = lambda record: (single(record),)
+        else:
+            self._getter = lambda record: ()
+    
+    def fill(self, record: Any) -> str:
+        """Fill the placeholders from the record's attributes of the same names."""
+        return self._pattern % self._getter(record)
+    
+    def format(self, **values: Any) -> str:
+        """Fill the placeholders from keyword arguments."""
+        return self._pattern % tuple(values[field] for field in self.fields)
+
+
+class Renderer:
+    """
+    Output format for parsed rule files, looked up by name (see register_renderer).
+    
+    render() turns one ParsedRuleFile into one section. A combined output
+    is head, then the sections joined by separator, then tail. Layouts are
+    Templates built once, when the renderer is defined.
+    """
+    
+    name = ''
+    # Suffix for one output file per source: rules.mdc -> rules<suffix>
+    suffix = '.md'
+    head = ''
+    separator = '\n\n'
+    tail = ''
+    # False for formats that only make sense as one file per source
+    combinable = True
+    
+    def render(self, parsed: ParsedRuleFile) -> str:
+        """Render one parsed file as a section of this format."""
+        raise NotImplementedError
+
+
+RENDERERS: Dict[str, Renderer] = {}
+
+
+def register_renderer(renderer: Renderer) -> Renderer:
+    """Make an output format available under its name to --format and get_renderer()."""
+    RENDERERS[renderer.name] = renderer
+    return renderer
+
+
+def get_renderer(name: str) -> Renderer:
+    """
+    Look up a registered output format.
+    
+    Raises:
+        ValueError: If no renderer has this name
+    """
+    try:
+        return RENDERERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown output format '{name}' (available: {', '.join(sorted(RENDERERS))})") from None
+
+
+def render_formats(parsed: ParsedRuleFile, names: Iterable[str]) -> Dict[str, str]:
+    """
+    Render one parsed file in several output formats.
+    
+    Args:
+        parsed: Parsed rule file, shared by every renderer
+        names: Registered format names
+        
+    Returns:
+        Rendered text keyed by format name
+    """
+    return {name: get_renderer(name).render(parsed) for name in names}
+
+
+def _title(parsed: ParsedRuleFile) -> Any:
+    """Heading of a parsed file: its description, or a title made from the file name."""
+    return parsed.frontmatter.get('description', parsed.file_path.stem.replace('_', ' ').title())
+
+
+class CopilotRenderer(Renderer):
+    """The .github/copilot-instructions.md layout, used by default."""
+    
+    name = 'copilot'
+    suffix = '-copilot.md'
+    
+    TITLE = Template("# {title}\n")
+    SOURCE = Template("- **Source:** `{source}`")
+    ALWAYS_APPLY = Template("- **Always Apply:** `{always_apply}`")
+    APPLIES_TO = Template("- **Applies To:** `{globs}`")
+    RULE = Template("### {id}\n\n**Severity:** `{severity}`\n\n{description}\n")
+    REFERENCE = Template("- {reference}")
+    
+    def render(self, parsed: ParsedRuleFile) -> str:
+        return self.render_with_rule_spans(parsed)[0]
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def rule_template(level: int) -> Template:
+        """Rule layout with a heading of the given level (3 is RULE)."""
+        return Template("#" * level + " {id}\n\n**Severity:** `{severity}`\n\n{description}\n")
+    
+    def render_with_rule_spans(self, parsed: ParsedRuleFile) -> Tuple[str, List[Tuple[int, int]]]:
+        """
+        Render a parsed file, also locating each rule.
+        
+        Returns:
+            Tuple of (markdown, (start, end) offsets of each rule's block in
+            the order of parsed.rules)
+        """
+        frontmatter = parsed.frontmatter
+        # Lines are joined with newlines; offset tracks where the next one starts
+        lines: List[str] = [
+            self.TITLE.format(title=_title(parsed)),
+            "## Metadata\n",
+            self.SOURCE.format(source=parsed.file_path.name),
+            self.ALWAYS_APPLY.format(always_apply=frontmatter.get('alwaysApply', False)),
+        ]
+        if 'globs' in frontmatter:
+            lines.append(self.APPLIES_TO.format(globs=frontmatter['globs']))
+        lines.append("")
+        
+        if parsed.markdown_header:
+            lines.append(parsed.markdown_header)
+            lines.append("")
+        
+        spans: List[Tuple[int, int]] = []
+        if parsed.rules:
+            lines.append("## Rules\n")
+            offset = sum(map(len, lines)) + len(lines)
+            fill = self.RULE.fill
+            for rule in parsed.rules:
+                block = fill(rule)
+                spans.append((offset, offset + len(block)))
+                offset += len(block) + 1
+                lines.append(block)
+        
+        if parsed.enforcement:
+            lines.append("## Enforcement\n")
+            lines.append(parsed.enforcement)
+            lines.append("")
+        
+        if parsed.references:
+            lines.append("## References\n")
+            lines.extend(self.REFERENCE.format(reference=reference) for reference in parsed.references)
+            lines.append("")
+        
+        lines.append("\n---\n")
+        return "\n".join(lines), spans
+
+
+class InstructionsRenderer(Renderer):
+    """A .instructions.md file: applyTo frontmatter from the rule's globs, then the Copilot layout."""
+    
+    name = 'instructions'
+    suffix = SHARD_SUFFIX
+    # Each file carries its own frontmatter
+    combinable = False
+    
+    DESCRIPTION = Template("description: {description}")
+    APPLY_TO = Template("applyTo: {apply_to}")
+    
+    @classmethod
+    def header(cls, description: Any, apply_to: Optional[str]) -> str:
+        """Frontmatter block for a .instructions.md file."""
+        lines = ['---']
+        if description:
+            lines.append(cls.DESCRIPTION.format(description=json.dumps(str(description), ensure_ascii=False)))
+        if apply_to:
+            lines.append(cls.APPLY_TO.format(apply_to=json.dumps(apply_to, ensure_ascii=False)))
+        lines.append('---')
+        return '\n'.join(lines)
+    
+    @staticmethod
+    def body(section: str) -> str:
+        """A Copilot section without its trailing separator."""
+        return section[:-len('\n---\n')].rstrip() if section.endswith('\n---\n') else section
+    
+    def render(self, parsed: ParsedRuleFile) -> str:
+        frontmatter = parsed.frontmatter if isinstance(parsed.frontmatter, dict) else {}
+        section = RENDERERS['copilot'].render(parsed)
+        return (self.header(frontmatter.get('description'), apply_to_globs(frontmatter))
+                + '\n\n' + self.body(section) + '\n')
+
+
+class JsonRenderer(Renderer):
+    """One JSON object per source file; a combined output is a JSON array."""
+    
+    name = 'json'
+    suffix = '.json'
+    head = '[\n'
+    separator = ',\n'
+    tail = '\n]\n'
+    
+    # Built once; values YAML produced that JSON cannot hold (dates) are written as text
+    _encode = json.JSONEncoder(indent=2, ensure_ascii=False, default=str).encode
+    
+    def render(self, parsed: ParsedRuleFile) -> str:
+        frontmatter = parsed.frontmatter if isinstance(parsed.frontmatter, dict) else {}
+        return self._encode({
+            'source': parsed.file_path.name,
+            'title': _title(parsed),
+            'applyTo': apply_to_globs(frontmatter),
+            'alwaysApply': frontmatter.get('alwaysApply', False),
+            'header': parsed.markdown_header or None,
+            'rules': [rule.to_dict() for rule in parsed.rules],
+            'enforcement': parsed.enforcement,
+            'references': parsed.references,
+        })
+
+
+class AgentsRenderer(Renderer):
+    """AGENTS.md: one section per source, with rules as a bullet list for coding agents."""
+    
+    name = 'agents'
+    suffix = '.agents.md'
+    head = '# AGENTS.md\n\n'
+    
+    TITLE = Template("## {title}\n")
+    SCOPE = Template("Applies to `{apply_to}`.\n")
+    RULE = Template("- **{id}** ({severity}): {description}")
+    REFERENCE = Template("- {reference}")
+    
+    def render(self, parsed: ParsedRuleFile) -> str:
+        frontmatter = parsed.frontmatter if isinstance(parsed.frontmatter, dict) else {}
+        lines = [self.TITLE.format(title=_title(parsed))]
+        apply_to = apply_to_globs(frontmatter)
+        if apply_to:
+            lines.append(self.SCOPE.format(apply_to=apply_to))
+        if parsed.markdown_header:
+            lines.append(parsed.markdown_header + "\n")
+        if parsed.rules:
+            for rule in parsed.rules:
+                # Continuation lines are indented to stay inside the bullet
+                lines.append(self.RULE.format(id=rule.id, severity=rule.severity,
+                                              description=rule.description.replace('\n', '\n  ')))
+            lines.append("")
+        if parsed.enforcement:
+            lines.append("Enforcement:\n")
+            lines.append(parsed.enforcement + "\n")
+        if parsed.references:
+            lines.append("References:\n")
+            lines.extend(self.REFERENCE.format(reference=reference) for reference in parsed.references)
+            lines.append("")
+        return "\n".join(lines).rstrip('\n') + "\n"
+
+
+for _renderer in (CopilotRenderer(), InstructionsRenderer(), JsonRenderer(), AgentsRenderer()):
+    register_renderer(_renderer)
+
+
+class OutputSink:
+    """
+    An extra output written from the same conversion run (--sink).
+    
+    A sink named after a combinable format (copilot, json, agents) is one
+    file holding every converted source, like OUTPUT. 'per-file' writes a
+    -copilot.md file per source, next to it or below a directory, and
+    'shard' a directory of .instructions.md files as --shard does. Every
+    sink is filled from the same parse of each source; the write results
+    and time are kept on the sink for the statistics.
+    """
+    
+    KINDS = ('per-file', 'shard')
+    
+    __slots__ = ('kind', 'path', 'written', 'unchanged', 'seconds')
+    
+    def __init__(self, kind: str, path: Optional[Path] = None):
+        self.kind = kind
+        self.path = path
+        self.written = 0
+        self.unchanged = 0
+        self.seconds = 0.0
+    
+    @classmethod
+    def parse(cls, spec: str) -> 'OutputSink':
+        """
+        Build a sink from KIND[:PATH], e.g. json:rules.json or per-file.
+        
+        Raises:
+            ValueError: For an unknown kind or a missing path
+        """
+        kind, _, path = spec.partition(':')
+        if kind not in cls.KINDS and not (kind in RENDERERS and RENDERERS[kind].combinable):
+            formats = [name for name, renderer in RENDERERS.items() if renderer.combinable]
+            raise ValueError(f"Unknown sink '{kind}' (available: {', '.join(formats + list(cls.KINDS))})")
+        if not path and kind != 'per-file':
+            raise ValueError(f"Sink '{kind}' needs a path, e.g. {kind}:{'DIR' if kind == 'shard' else 'FILE'}")
+        return cls(kind, Path(path) if path else None)
+    
+    @property
+    def format(self) -> str:
+        """Output format whose sections this sink is written from."""
+        return 'copilot' if self.kind in self.KINDS else self.kind
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'path': str(self.path) if self.path else None,
+                'written': self.written, 'unchanged': self.unchanged,
+                'seconds': round(self.seconds, 6)}
+    
+    def __repr__(self) -> str:
+        return f"OutputSink({self.kind!r}, {str(self.path) if self.path else None!r})"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting: about four characters per token."""
+    return (len(text) + 3) // 4
+
+
+def description_digest(description: Any) -> str:
+    """Hash of a rule description with case, whitespace and trailing periods normalized."""
+    normalized = ' '.join(str(description or '').split()).lower().rstrip('.')
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class OutputCompactor:
+    """
+    Shrink converted sections before they are written.
+    
+    Sections are taken as rendered by convert_to_copilot_instructions. The
+    Source and Always Apply metadata lines and the References list are
+    dropped, and a rule whose description repeats one seen earlier is
+    replaced by a pointer to the first occurrence. With max_tokens set, the
+    whole output is buffered and rules are then removed, lowest severity
+    first and later files before earlier ones, until the estimated token
+    count fits. Sections themselves are never removed, so the n-th section
+    still belongs to the n-th processed file.
+    """
+    
+    def __init__(self, max_tokens: Optional[int] = None):
+        self.max_tokens = max_tokens
+        self.chars_before = 0
+        self.chars_after = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.duplicates = 0
+        self.dropped: Dict[str, int] = {}
+        # Time spent compacting, excluding the upstream parsing and rendering
+        self.seconds = 0.0
+        # Normalized description hash -> (rule id, source) of its first occurrence
+        self._seen: Dict[str, Tuple[str, str]] = {}
+    
+    def summary(self) -> Dict[str, Any]:
+        """Sizes before and after compaction and what was removed, JSON-serializable."""
+        return {
+            'chars_before': self.chars_before,
+            'chars_after': self.chars_after,
+            'tokens_before': self.tokens_before,
+            'tokens_after': self.tokens_after,
+            'duplicate_rules': self.duplicates,
+            'dropped_rules': dict(self.dropped),
+            'max_tokens': self.max_tokens,
+        }
+    
+    def compact(self, sections: Iterable[str]) -> Iterator[str]:
+        """
+        Compact sections lazily, or all at once when a token budget is set.
+        
+        Args:
+            sections: Rendered sections in output order
+            
+        Yields:
+            Compacted sections, one per input section
+        """
+        if self.max_tokens is None:
+            for section in sections:
+                started = time.perf_counter()
+                compacted = self._render(self._compact_section(section))
+                self.seconds += time.perf_counter() - started
+                yield compacted
+            return
+        
+        parts = []
+        for section in sections:
+            started = time.perf_counter()
+            parts.append(self._compact_section(section))
+            self.seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        self._apply_budget(parts)
+        rendered = [self._render(part) for part in parts]
+        self.seconds += time.perf_counter() - started
+        yield from rendered
+    
+    def _compact_section(self, section: str) -> Dict[str, Any]:
+        """Strip a section down and split it into text around its rule blocks."""
+        self.chars_before += len(section)
+        self.tokens_before += estimate_tokens(section)
+        source_match = _COMPACT_SOURCE.search(section)
+        source = source_match.group(1) if source_match else '?'
+        
+        section = _COMPACT_METADATA_LINES.sub('', section)
+        section = _COMPACT_METADATA_HEADING.sub('', section)
+        section = _COMPACT_REFERENCES.sub('', section)
+        
+        rules_start = section.find('## Rules\n')
+        if rules_start < 0:
+            return {'head': section, 'rules': [], 'tail': ''}
+        end_match = _COMPACT_RULES_END.search(section, rules_start)
+        rules_end = end_match.start() if end_match else len(section)
+        rule_matches = list(_COMPACT_RULE_HEADING.finditer(section, rules_start, rules_end))
+        if not rule_matches:
+            return {'head': section, 'rules': [], 'tail': ''}
+        
+        rules = []
+        for index, match in enumerate(rule_matches):
+            block_end = rule_matches[index + 1].start() if index + 1 < len(rule_matches) else rules_end
+            block = section[match.start():block_end]
+            rule_id, severity = match.group(1), match.group(2)
+            description = section[match.end():block_end]
+            if description.strip():
+                key = description_digest(description)
+                first = self._seen.get(key)
+                if first is None:
+                    self._seen[key] = (rule_id, source)
+                else:
+                    self.duplicates += 1
+                    block = (f"### {rule_id}\n\n**Severity:** `{severity}`\n\n"
+                             f"Same as `{first[0]}` in `{first[1]}`.\n\n")
+            rules.append({'severity': severity, 'text': block, 'dropped': False})
+        return {'head': section[:rule_matches[0].start()], 'rules': rules, 'tail': section[rules_end:]}
+    
+    def _apply_budget(self, parts: List[Dict[str, Any]]):
+        """Drop rules, least important first, until the estimated size fits max_tokens."""
+        total = sum(estimate_tokens(self._render(part, count=False)) for part in parts)
+        candidates = [(SEVERITY_PRIORITY.get(rule['severity'], SEVERITY_PRIORITY['info']), part_index, rule_index)
+                      for part_index, part in enumerate(parts)
+                      for rule_index, rule in enumerate(part['rules'])]
+        # Highest priority number (least severe) first, later files before earlier ones
+        candidates.sort(reverse=True)
+        for _, part_index, rule_index in candidates:
+            if total <= self.max_tokens:
+                break
+            rule = parts[part_index]['rules'][rule_index]
+            rule['dropped'] = True
+            total -= estimate_tokens(rule['text'])
+            self.dropped[rule['severity']] = self.dropped.get(rule['severity'], 0) + 1
+    
+    def _render(self, part: Dict[str, Any], count: bool = True) -> str:
+        kept = [rule['text'] for rule in part['rules'] if not rule['dropped']]
+        head = part['head']
+        if part['rules'] and not kept:
+            # Every rule was dropped; drop the now empty heading too
+            head = head[:head.rfind('## Rules\n')]
+        section = head + ''.join(kept) + part['tail']
+        if count:
+            self.chars_after += len(section)
+            self.tokens_after += estimate_tokens(section)
+        return section
+
+
+class RuleIndex:
+    """
+    Index of rules seen so far, keyed by rule id, for --dedupe.
+    
+    Each id is stored as one packed integer pair (a 64-bit id hash mapping
+    to the description hash, a severity code and the number of the first
+    source), so memory stays around a hundred bytes per distinct rule even
+    for hundreds of thousands of rules. Sources are referred to by their
+    position in the converter's processed_files.
+    """
+    
+    def __init__(self):
+        self.rules = 0
+        self.duplicates = 0
+        self.conflicts = 0
+        self._index: Dict[int, int] = {}
+        self._severities: Dict[str, int] = {}
+    
+    def summary(self) -> Dict[str, int]:
+        return {
+            'rules': self.rules,
+            'unique': len(self._index),
+            'duplicates': self.duplicates,
+            'conflicts': self.conflicts,
+        }
+    
+    def add(self, rule_id: str, digest: str, severity: str, source: int) -> Tuple[str, int]:
+        """
+        Record a rule and classify it against the first rule with the same id.
+        
+        Args:
+            rule_id: Rule id
+            digest: description_digest() of the rule's description
+            severity: Rule severity
+            source: Number of the source file the rule comes from
+            
+        Returns:
+            Tuple of ('new', 'duplicate' or 'conflict', number of the source
+            that defined the id first)
+        """
+        self.rules += 1
+        key = int.from_bytes(hashlib.blake2b(rule_id.encode('utf-8'), digest_size=8).digest(), 'big')
+        severity_code = self._severities.setdefault(severity, len(self._severities))
+        # Low 32 bits: first source; then 16 bits of severity; the description hash on top
+        packed = (int(digest, 16) << 48) | (severity_code << 32) | source
+        first = self._index.get(key)
+        if first is None:
+            self._index[key] = packed
+            return 'new', source
+        first_source = first & 0xFFFFFFFF
+        if first >> 32 == packed >> 32:
+            self.duplicates += 1
+            return 'duplicate', first_source
+        self.conflicts += 1
+        return 'conflict', first_source
+
+
+def normalize_github_url(repo_url: str) -> str:
+    """Turn a GitHub URL (or github.com/user/repo shorthand) into a clonable .git URL."""
+    if not repo_url.startswith(('http://', 'https://', 'git@')):
+        repo_url = f'https://github.com/{repo_url}'
+    if repo_url.endswith('.git'):
+        repo_url = repo_url[:-4]
+    return repo_url + '.git'
+
+
+async def _run_git(args: List[str], timeout: float,
+                   stdout: Optional[List[str]] = None) -> Tuple[int, str]:
+    """
+    Run a git command without a terminal prompt; returns (exit code, error output).
+    
+    When a stdout list is given, the command's output lines are appended to it.
+    """
+    import subprocess
+    process = await asyncio.create_subprocess_exec(
+        'git', *args,
+        stdin=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL if stdout is None else subprocess.PIPE,
+        env=dict(os.environ, GIT_TERMINAL_PROMPT='0'),
+    )
+    try:
+        output, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    if stdout is not None:
+        stdout.extend(output.decode('utf-8', errors='replace').splitlines())
+    lines = stderr.decode('utf-8', errors='replace').splitlines()
+    # Keep git's fatal/error lines; hints and warnings only add noise to the report
+    errors = [line for line in lines if line.startswith(('fatal:', 'error:'))] or lines
+    return process.returncode, ' '.join(line.strip() for line in errors if line.strip())
+
+
+async def sparse_clone(url: str, destination: Path, timeout: float = GIT_TIMEOUT) -> Optional[str]:
+    """
+    Shallow-clone a repository, checking out only its .mdc files.
+    
+    Blobs are fetched lazily where the server supports partial clone, so
+    only the rule files are downloaded. Git versions without sparse-checkout
+    fall back to a full checkout of the shallow clone.
+    
+    Args:
+        url: Any URL git can clone (https, ssh, file://)
+        destination: Directory to clone into (must not exist yet)
+        timeout: Seconds allowed for each git command
+        
+    Returns:
+        None on success, otherwise an error message
+    """
+    try:
+        code, stderr = await _run_git(['clone', '--quiet', '--depth', '1', '--filter=blob:none',
+                                       '--no-checkout', url, str(destination)], timeout)
+        if code != 0:
+            return stderr or f"git clone exited with status {code}"
+        return await _checkout_rule_files(destination, timeout)
+    except asyncio.TimeoutError:
+        return f"timed out after {timeout:.0f} seconds"
+    except FileNotFoundError:
+        return "git command not found. Please install git."
+
+
+async def _checkout_rule_files(destination: Path, timeout: float) -> Optional[str]:
+    """Check out only the .mdc files of a clone made with --no-checkout."""
+    await _run_git(['-C', str(destination), 'sparse-checkout', 'set', '--no-cone', '*.mdc'], timeout)
+    code, stderr = await _run_git(['-C', str(destination), 'checkout', '--quiet'], timeout)
+    if code != 0:
+        return stderr or f"git checkout exited with status {code}"
+    return None
+
+
+def load_repo_list(text: str) -> List[str]:
+    """Parse a repository list: one URL per line, blank lines and # comments ignored."""
+    urls = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            urls.append(line)
+    return urls
+
+
+def default_cache_dir() -> Path:
+    """
+    Per-user directory for the conversion cache and repository mirrors.
+    
+    %LOCALAPPDATA% on Windows, ~/Library/Caches on macOS and
+    $XDG_CACHE_HOME (default ~/.cache) elsewhere, plus "convertmdc".
+    """
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'convertmdc'
+
+
+class ConversionCache:
+    """
+    Persistent on-disk cache of converted .mdc files.
+    
+    Entries are keyed by a hash of the source's file name, its content and
+    the converter settings (the rendered output depends on nothing else), so
+    the same file in another checkout or directory is a hit. They hold the
+    rendered markdown together with the per-file stats and errors, with the
+    source path in errors stored as a placeholder. An index of (mtime, size)
+    per path and signature lets warm runs skip reading unchanged files
+    entirely; records of paths that no longer exist are dropped on save.
+    Entries of every signature share one index and one size cap, so switching
+    settings back and forth keeps both sets warm. New entries are buffered in
+    memory and only written by save().
+    """
+    
+    def __init__(self, cache_dir: Path, signature: str,
+                 max_size_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.objects_dir = cache_dir / 'objects'
+        self.index_path = cache_dir / 'index.json'
+        self.signature = signature
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._pending_keys: Dict[str, Tuple[int, int, str]] = {}
+        self._new_entries: Dict[str, Dict[str, Any]] = {}
+        # Path records per signature; _files holds the ones of this converter's signature
+        self._signatures: Dict[str, Dict[str, List[Any]]] = {}
+        self._files: Dict[str, List[Any]] = {}
+        self._seen: Set[str] = set()
+        self._entries: Dict[str, List[float]] = {}
+        self._load_index()
+    
+    def _load_index(self):
+        """Load the path and entry index, discarding it and its objects if it is stale or corrupt."""
+        try:
+            index = json.loads(self.index_path.read_text(encoding='utf-8'))
+        except OSError:
+            return
+        except ValueError:
+            index = {}
+        if index.get('format') != _CACHE_FORMAT:
+            # Objects of an older layout are unreachable from a new index, so they go too
+            shutil.rmtree(self.objects_dir, ignore_errors=True)
+            return
+        self._signatures = index.get('signatures', {})
+        self._files = self._signatures.pop(self.signature, {})
+        self._entries = index.get('entries', {})
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.objects_dir / key[:2] / f"{key}.json"
+    
+    def _key_for(self, file_path: Path, content: bytes) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.signature.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(file_path.name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content)
+        return digest.hexdigest()
+    
+    def get(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached result for a file.
+        
+        Args:
+            file_path: Source .mdc file
+            
+        Returns:
+            Cached file result or None on a miss
+        """
+        path_key = str(file_path)
+        self._seen.add(path_key)
+        try:
+            st = file_path.stat()
+            record = self._files.get(path_key)
+            if record and record[0] == st.st_mtime_ns and record[1] == st.st_size:
+                key = record[2]
+            else:
+                key = self._key_for(file_path, file_path.read_bytes())
+        except OSError:
+            self.misses += 1
+            return None
+        
+        entry = self._new_entries.get(key)
+        if entry is None and key in self._entries:
+            try:
+                entry = json.loads(self._entry_path(key).read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                entry = None
+        
+        if entry is None:
+            self.misses += 1
+            self._pending_keys[path_key] = (st.st_mtime_ns, st.st_size, key)
+            return None
+        
+        self.hits += 1
+        self._files[path_key] = [st.st_mtime_ns, st.st_size, key]
+        if key in self._entries:
+            self._entries[key][1] = time.time()
+        errors = entry.get('errors')
+        if errors:
+            entry = dict(entry, errors=[error.replace(_CACHE_PATH_PLACEHOLDER, path_key) for error in errors])
+        return entry
+    
+    def put(self, file_path: Path, entry: Dict[str, Any]):
+        """Record the result for a file that missed in get()."""
+        pending = self._pending_keys.pop(str(file_path), None)
+        if pending is None:
+            return
+        mtime_ns, size, key = pending
+        errors = entry.get('errors')
+        if errors:
+            entry = dict(entry, errors=[error.replace(str(file_path), _CACHE_PATH_PLACEHOLDER) for error in errors])
+        self._new_entries[key] = entry
+        self._files[str(file_path)] = [mtime_ns, size, key]
+    
+    def save(self):
+        """Write new entries and the index to disk, then evict down to the size cap."""
+        try:
+            for key, entry in self._new_entries.items():
+                entry_path = self._entry_path(key)
+                entry_path.parent.mkdir(parents=True, exist_ok=True)
+                data = json.dumps(entry)
+                entry_path.write_text(data, encoding='utf-8')
+                self._entries[key] = [len(data), time.time()]
+            self._new_entries = {}
+            
+            # Forget paths that are gone, such as temporary checkouts of repositories
+            self._files = {path: record for path, record in self._files.items()
+                           if path in self._seen or os.path.exists(path)}
+            self._signatures = {
+                signature: {path: record for path, record in files.items() if os.path.exists(path)}
+                for signature, files in self._signatures.items()}
+            self._evict()
+            
+            signatures = {signature: files for signature, files in self._signatures.items() if files}
+            if self._files:
+                signatures[self.signature] = self._files
+            index = {
+                'format': _CACHE_FORMAT,
+                'signatures': signatures,
+                'entries': self._entries,
+            }
+            tmp_path = self.index_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(index), encoding='utf-8')
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Warning: Could not write conversion cache {self.cache_dir}: {e}", file=sys.stderr)
+    
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_size_bytes."""
+        total = sum(size for size, _ in self._entries.values())
+        if total <= self.max_size_bytes:
+            return
+        evicted = set()
+        for key, (size, _) in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_size_bytes:
+                break
+            try:
+                self._entry_path(key).unlink()
+            except OSError:
+                pass
+            total -= size
+            evicted.add(key)
+        for key in evicted:
+            del self._entries[key]
+        self._files = {path: record for path, record in self._files.items()
+                       if record[2] not in evicted}
+        self._signatures = {
+            signature: {path: record for path, record in files.items() if record[2] not in evicted}
+            for signature, files in self._signatures.items()}
+    
+    @staticmethod
+    def clear(cache_dir: Path) -> bool:
+        """Remove a cache directory. Returns True if anything was removed."""
+        if not cache_dir.exists():
+            return False
+        shutil.rmtree(cache_dir)
+        return True
+
+
+class RepoMirrorCache:
+    """
+    Persistent bare mirrors of fetched repositories, keyed by URL.
+    
+    The first checkout of a URL clones a bare mirror without blobs and then
+    fetches only the .mdc blobs at HEAD; later checkouts only run
+    ``git fetch`` once the mirror is older than max_age seconds, and then
+    make a sparse working copy that shares the mirror's objects, so nothing
+    is downloaded again. If a refresh fails, the stale mirror is used with a
+    warning. An index records when each mirror was fetched and last used;
+    save() evicts least recently used mirrors until the total size fits in
+    max_size_bytes. Mirrors of an older index format are deleted on load.
+    """
+    
+    def __init__(self, cache_dir: Path, max_size_bytes: int = DEFAULT_REPO_CACHE_MAX_BYTES,
+                 max_age: float = DEFAULT_REPO_MAX_AGE, verbose: bool = False):
+        self.cache_dir = cache_dir
+        self.index_path = cache_dir / 'index.json'
+        self.max_size_bytes = max_size_bytes
+        self.max_age = max_age
+        self.verbose = verbose
+        self.fetched = 0
+        self.reused = 0
+        self._mirrors: Dict[str, Dict[str, Any]] = {}
+        self._used: Set[str] = set()
+        self._locks: Dict[str, 'asyncio.Lock'] = {}
+        self._loop: Optional['asyncio.AbstractEventLoop'] = None
+        try:
+            index = json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if index.get('format') == _REPO_CACHE_FORMAT:
+            self._mirrors = index.get('mirrors', {})
+        else:
+            # Mirrors missing from the new index would never be evicted, so drop them all now
+            for path in self.cache_dir.iterdir():
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+    
+    def mirror_path(self, url: str) -> Path:
+        """Directory of the bare mirror for a URL."""
+        name = re.sub(r'[^\w.-]+', '_', url.rstrip('/').rsplit('/', 1)[-1])[:40]
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{digest}-{name}"
+    
+    def _lock_for(self, url: str) -> 'asyncio.Lock':
+        # Locks belong to an event loop; each asyncio.run() starts a new one
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._locks = {}
+        return self._locks.setdefault(url, asyncio.Lock())
+    
+    async def checkout(self, url: str, destination: Path, timeout: float = GIT_TIMEOUT) -> Optional[str]:
+        """
+        Make a working copy of a repository's .mdc files from its mirror.
+        
+        Args:
+            url: Any URL git can clone (https, ssh, file://)
+            destination: Directory to check out into (must not exist yet)
+            timeout: Seconds allowed for each git command
+            
+        Returns:
+            None on success, otherwise an error message
+        """
+        mirror = self.mirror_path(url)
+        try:
+            async with self._lock_for(url):
+                error = await self._refresh(url, mirror, timeout)
+            if error:
+                return error
+            code, stderr = await _run_git(['clone', '--quiet', '--shared', '--no-checkout',
+                                           str(mirror), str(destination)], timeout)
+            if code != 0:
+                return stderr or f"git clone exited with status {code}"
+            # The mirror has no blobs outside the rule files; as a partial clone the copy tolerates that
+            for key, value in (('promisor', 'true'), ('partialclonefilter', 'blob:none')):
+                await _run_git(['-C', str(destination), 'config', f"remote.origin.{key}", value], timeout)
+            return await _checkout_rule_files(destination, timeout)
+        except asyncio.TimeoutError:
+            return f"timed out after {timeout:.0f} seconds"
+        except FileNotFoundError:
+            return "git command not found. Please install git."
+    
+    async def _refresh(self, url: str, mirror: Path, timeout: float) -> Optional[str]:
+        """Clone the mirror if it is missing, or fetch into it if it is stale."""
+        record = self._mirrors.get(url)
+        now = time.time()
+        if record is not None and mirror.is_dir():
+            if url in self._used or now - record['fetched'] < self.max_age:
+                if self.verbose:
+                    print(f"  [DEBUG] Using cached mirror {mirror}")
+                self.reused += 1
+            else:
+                if self.verbose:
+                    print(f"  [DEBUG] Fetching {url} into {mirror}")
+                code, stderr = await _run_git(['-C', str(mirror), 'fetch', '--quiet', '--prune'], timeout)
+                if code == 0:
+                    code, stderr = await self._fetch_rule_blobs(mirror, timeout)
+                if code == 0:
+                    record['fetched'] = now
+                    record['size'] = self._directory_size(mirror)
+                    self.fetched += 1
+                else:
+                    print(f"Warning: Could not refresh {url}, using cached copy: {stderr}", file=sys.stderr)
+                    self.reused += 1
+        else:
+            if self.verbose:
+                print(f"  [DEBUG] Mirroring {url} into {mirror}")
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Clone next to the final path and rename, so a failed clone never looks like a mirror
+            tmp_mirror = mirror.with_name(f"{mirror.name}.tmp{os.getpid()}")
+            shutil.rmtree(tmp_mirror, ignore_errors=True)
+            shutil.rmtree(mirror, ignore_errors=True)
+            code, stderr = await _run_git(['clone', '--quiet', '--mirror', '--filter=blob:none',
+                                           url, str(tmp_mirror)], timeout)
+            if code == 0:
+                code, stderr = await self._fetch_rule_blobs(tmp_mirror, timeout)
+            if code != 0:
+                shutil.rmtree(tmp_mirror, ignore_errors=True)
+                return stderr or f"git clone exited with status {code}"
+            os.replace(tmp_mirror, mirror)
+            record = {'fetched': now, 'size': self._directory_size(mirror)}
+            self._mirrors[url] = record
+            self.fetched += 1
+        record['used'] = now
+        self._used.add(url)
+        return None
+    
+    @staticmethod
+    async def _fetch_rule_blobs(mirror: Path, timeout: float) -> Tuple[int, str]:
+        """Fetch the .mdc blobs at HEAD into a mirror cloned with --filter=blob:none."""
+        entries: List[str] = []
+        code, stderr = await _run_git(['-C', str(mirror), 'ls-tree', '-r', 'HEAD'], timeout, stdout=entries)
+        if code != 0:
+            # An empty repository has no HEAD, so there is nothing to fetch
+            return 0, ''
+        blobs = []
+        for entry in entries:
+            meta, _, name = entry.partition('\t')
+            fields = meta.split()
+            if len(fields) == 3 and fields[1] == 'blob' and name.strip('"').endswith('.mdc'):
+                blobs.append(fields[2])
+        if not blobs:
+            return 0, ''
+        return await _run_git(['-C', str(mirror), 'fetch', '--quiet', '--no-tags', '--no-write-fetch-head',
+                               '--filter=blob:none', 'origin', *blobs], timeout)
+    
+    @staticmethod
+    def _directory_size(path: Path) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.lstat(os.path.join(dirpath, filename)).st_size
+                except OSError:
+                    pass
+        return total
+    
+    def save(self):
+        """Write the index, then evict mirrors not used by this run down to the size cap."""
+        if not self._mirrors:
+            return
+        total = sum(record['size'] for record in self._mirrors.values())
+        for url, record in sorted(self._mirrors.items(), key=lambda item: item[1].get('used', 0)):
+            if total <= self.max_size_bytes:
+                break
+            if url in self._used:
+                continue
+            if self.verbose:
+                print(f"  [DEBUG] Evicting mirror of {url}")
+            shutil.rmtree(self.mirror_path(url), ignore_errors=True)
+            total -= record['size']
+            del self._mirrors[url]
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({'format': _REPO_CACHE_FORMAT, 'mirrors': self._mirrors}),
+                                encoding='utf-8')
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Warning: Could not write repository cache {self.cache_dir}: {e}", file=sys.stderr)
+
+
+class BackupStore:
+    """
+    Content-addressed backups in a .backups directory.
+    
+    File contents are stored once under objects/ by SHA-256 (gzip-compressed
+    objects carry a .gz suffix). Output backups are hardlinks to an object,
+    named <stem>_<timestamp><suffix>[.gz]; repository snapshots are
+    browsable directories of hardlinks plus a .snapshot.json manifest.
+    Where the filesystem has no hardlinks, files are copied instead. A
+    backup identical to the newest one of the same name is not created
+    again. Older backups beyond keep, or older than keep_days, are pruned
+    together with objects nothing refers to any more.
+    """
+    
+    MANIFEST = '.snapshot.json'
+    
+    def __init__(self, backup_dir: Path, keep: int = DEFAULT_BACKUP_KEEP,
+                 keep_days: Optional[float] = None, compress: bool = False):
+        self.backup_dir = backup_dir
+        self.objects_dir = backup_dir / 'objects'
+        self.keep = keep
+        self.keep_days = keep_days
+        self.compress = compress
+    
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """SHA-256 of a file's content; .gz files are hashed decompressed."""
+        import gzip
+        digest = hashlib.sha256()
+        with (gzip.open(path, 'rb') if path.suffix == '.gz' else open(path, 'rb')) as f:
+            for block in iter(lambda: f.read(OUTPUT_BUFFER_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _store_object(self, source: Path, digest: str, compress: bool = False) -> Path:
+        import gzip
+        object_path = self.objects_dir / digest[:2] / (digest + ('.gz' if compress else ''))
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = object_path.with_name(f"{digest}.tmp{os.getpid()}")
+            if compress:
+                with open(source, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, OUTPUT_BUFFER_SIZE)
+            else:
+                shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, object_path)
+        return object_path
+    
+    @staticmethod
+    def _link(object_path: Path, target: Path):
+        try:
+            os.link(object_path, target)
+        except OSError:
+            shutil.copy2(object_path, target)
+    
+    def _existing(self, prefix: str, suffix: str, directories: bool) -> List[Tuple[str, int, Path]]:
+        """Backups named <prefix>_<timestamp>[_<n>]<suffix>[.gz] as (timestamp, n, path), oldest first."""
+        pattern = re.compile(re.escape(prefix) + r'_(\d{8}_\d{6})(?:_(\d+))?' + re.escape(suffix)
+                             + ('' if directories else r'(?:\.gz)?'))
+        found = []
+        try:
+            entries = list(self.backup_dir.iterdir())
+        except OSError:
+            return []
+        for entry in entries:
+            match = pattern.fullmatch(entry.name)
+            if not match:
+                continue
+            if directories and not (entry / self.MANIFEST).is_file():
+                continue
+            if not directories and not entry.is_file():
+                continue
+            found.append((match.group(1), int(match.group(2) or 0), entry))
+        return sorted(found)
+    
+    @staticmethod
+    def _new_name(prefix: str, suffix: str, existing: List[Tuple[str, int, Path]]) -> str:
+        from datetime import datetime
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Several backups within one second get increasing counters so they still sort in order
+        counters = [counter for stamp, counter, _ in existing if stamp >= timestamp]
+        if not counters:
+            return f"{prefix}_{timestamp}{suffix}"
+        return f"{prefix}_{timestamp}_{max(counters) + 1}{suffix}"
+    
+    def backup_file(self, source: Path) -> Tuple[Path, bool]:
+        """
+        Back up a file as .backups/<stem>_<timestamp><suffix>, unless it matches the newest backup.
+        
+        Args:
+            source: File about to be overwritten
+            
+        Returns:
+            Tuple of (backup path, whether a new backup was created)
+        """
+        prefix, suffix = source.stem, source.suffix
+        existing = self._existing(prefix, suffix, directories=False)
+        if existing:
+            newest = existing[-1][2]
+            # Uncompressed backups of a different size cannot match; skip hashing them
+            same_size = newest.suffix == '.gz' or newest.stat().st_size == source.stat().st_size
+            digest = self.hash_file(source)
+            if same_size and self.hash_file(newest) == digest:
+                self._prune(existing)
+                return newest, False
+        else:
+            digest = self.hash_file(source)
+        
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        name = self._new_name(prefix, suffix, existing)
+        backup_path = self.backup_dir / (name + ('.gz' if self.compress else ''))
+        if self.compress:
+            self._link(self._store_object(source, digest, compress=True), backup_path)
+        else:
+            self._link(self._store_object(source, digest), backup_path)
+        self._prune(existing + [('', 0, backup_path)])
+        return backup_path, True
+    
+    def snapshot(self, name: str, root: Path, files: List[Path]) -> Tuple[Path, bool]:
+        """
+        Snapshot files under root, unless they match the newest snapshot of name.
+        
+        Args:
+            name: Snapshot name; the directory is <name>_<timestamp>
+            root: Directory the snapshot paths are relative to
+            files: Files to include
+            
+        Returns:
+            Tuple of (snapshot directory, whether a new snapshot was created)
+        """
+        digests = {path.relative_to(root).as_posix(): self.hash_file(path) for path in files}
+        existing = self._existing(name, '', directories=True)
+        if existing and self._read_manifest(existing[-1][2]).get('files') == digests:
+            self._prune(existing)
+            return existing[-1][2], False
+        
+        snapshot_dir = self.backup_dir / self._new_name(name, '', existing)
+        snapshot_dir.mkdir(parents=True)
+        for relative, digest in digests.items():
+            target = snapshot_dir / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            self._link(self._store_object(root / relative, digest), target)
+        manifest = {'created': time.time(), 'files': digests}
+        (snapshot_dir / self.MANIFEST).write_text(json.dumps(manifest), encoding='utf-8')
+        
+        self._prune(existing + [('', 0, snapshot_dir)])
+        return snapshot_dir, True
+    
+    def _read_manifest(self, snapshot: Path) -> Dict[str, Any]:
+        try:
+            return json.loads((snapshot / self.MANIFEST).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+    
+    def _prune(self, existing: List[Tuple[str, int, Path]]) -> int:
+        """Apply the retention policy to backups listed oldest first; the newest is always kept."""
+        from datetime import datetime
+        older = existing[:-1]
+        expired = older[:max(0, len(older) + 1 - self.keep)] if self.keep > 0 else []
+        if self.keep_days is not None:
+            cutoff = datetime.now().timestamp() - self.keep_days * 86400
+            expired += [entry for entry in older[len(expired):]
+                        if datetime.strptime(entry[0], '%Y%m%d_%H%M%S').timestamp() < cutoff]
+        for _, _, path in expired:
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink()
+        if expired:
+            self.collect_garbage()
+        return len(expired)
+    
+    def collect_garbage(self):
+        """Remove stored objects that no backup links to and no snapshot manifest refers to."""
+        referenced: Set[str] = set()
+        for manifest_path in self.backup_dir.glob(f"*/{self.MANIFEST}"):
+            try:
+                referenced.update(json.loads(manifest_path.read_text(encoding='utf-8'))['files'].values())
+            except (OSError, ValueError, KeyError, AttributeError):
+                # An unreadable manifest might still reference anything; keep every object
+                return
+        for object_path in self.objects_dir.glob('*/*'):
+            try:
+                if object_path.stat().st_nlink == 1 and object_path.name.split('.')[0] not in referenced:
+                    object_path.unlink()
+            except OSError:
+                pass
+
+
+class DirectoryScanner:
+    """
+    Find .mdc files with a single os.scandir walk, pruning ignored directories.
+    
+    Directories named in ignore_dirs are never entered, and neither are
+    directories excluded by .gitignore files found inside the scanned tree
+    (a subset of git's rules: globs, ``**``, anchored and directory-only
+    patterns and ``!`` negation). Like ``root.glob("**/*.mdc")``, symlinked
+    directories are not followed, and the result is sorted the same way.
+    
+    With cache_listings enabled, a listing is reused until the mtime of one
+    of the walked directories or .gitignore files changes, which is what
+    long-running modes (--serve, --watch) need to avoid re-walking the tree
+    on every request.
+    """
+    
+    def __init__(self, ignore_dirs: Iterable[str] = DEFAULT_IGNORE_DIRS,
+                 use_gitignore: bool = True, cache_listings: bool = False):
+        self.ignore_dirs = frozenset(ignore_dirs)
+        self.use_gitignore = use_gitignore
+        self.cache_listings = cache_listings
+        # (root, recursive) -> (files, {walked dir or .gitignore: mtime_ns})
+        self._listings: Dict[Tuple[str, bool], Tuple[List[Path], Dict[str, int]]] = {}
+    
+    def scan(self, root: Path, recursive: bool = True) -> List[Path]:
+        """
+        List the .mdc files under root.
+        
+        Args:
+            root: Directory to scan (never pruned itself)
+            recursive: Descend into subdirectories
+            
+        Returns:
+            Sorted list of .mdc file paths
+        """
+        key = (str(root), recursive)
+        if self.cache_listings:
+            listing = self._listings.get(key)
+            if listing is not None and self._unchanged(listing[1]):
+                return list(listing[0])
+        
+        files, mtimes = self._walk(root, recursive)
+        if self.cache_listings:
+            self._listings[key] = (files, mtimes)
+            return list(files)
+        return files
+    
+    def invalidate(self):
+        """Forget all cached listings."""
+        self._listings.clear()
+    
+    def watched_paths(self, root: Path, recursive: bool = True) -> List[str]:
+        """Directories and .gitignore files behind the cached listing of root (empty if not cached)."""
+        listing = self._listings.get((str(root), recursive))
+        return list(listing[1]) if listing else []
+    
+    @staticmethod
+    def _unchanged(mtimes: Dict[str, int]) -> bool:
+        for path, mtime_ns in mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+    
+    def _walk(self, root: Path, recursive: bool) -> Tuple[List[Path], Dict[str, int]]:
+        files: List[Path] = []
+        mtimes: Dict[str, int] = {}
+        # Each stack entry: (directory, path relative to root, .gitignore rules in effect)
+        stack: List[Tuple[str, str, List[Tuple[str, List[Tuple[Any, bool]]]]]] = [(str(root), '', [])]
+        
+        while stack:
+            dir_path, rel, rules = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+                if self.cache_listings:
+                    mtimes[dir_path] = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                continue
+            
+            if self.use_gitignore and recursive:
+                gitignore = os.path.join(dir_path, '.gitignore')
+                patterns = _read_gitignore(gitignore) if any(
+                    entry.name == '.gitignore' for entry in entries) else None
+                if patterns:
+                    if self.cache_listings:
+                        mtimes[gitignore] = os.stat(gitignore).st_mtime_ns
+                    rules = rules + [(rel, patterns)]
+            
+            for entry in entries:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not recursive or name in self.ignore_dirs:
+                            continue
+                        child_rel = f"{rel}/{name}" if rel else name
+                        if rules and _gitignore_excludes(rules, child_rel):
+                            continue
+                        stack.append((entry.path, child_rel, rules))
+                    elif os.path.normcase(name).endswith('.mdc') and not entry.is_dir():
+                        files.append(Path(entry.path))
+                except OSError:
+                    continue
+        
+        files.sort()
+        return files, mtimes
+
+
+def _gitignore_regex(pattern: str) -> str:
+    """Translate one .gitignore glob (without !, leading or trailing /) to a regex."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            close = pattern.find(']', i + 2)
+            if close < 0:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1:close]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = close
+        elif char == '\\' and i + 1 < len(pattern):
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return ''.join(parts)
+
+
+def _read_gitignore(path: str) -> List[Tuple[Any, bool]]:
+    """
+    Read a .gitignore file into (compiled regex, negated) rules.
+    
+    Only directories are tested against the rules, so a trailing ``/``
+    needs no special handling. Unreadable files and malformed patterns are
+    skipped.
+    """
+    rules = []
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return rules
+    for line in lines:
+        line = line.rstrip(' ')
+        if not line or line.startswith('#'):
+            continue
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        line = line.rstrip('/')
+        if not line:
+            continue
+        # Patterns with a slash (other than a trailing one) are relative to the .gitignore
+        anchored = '/' in line
+        regex = _gitignore_regex(line.lstrip('/'))
+        if not anchored:
+            regex = '(?:.*/)?' + regex
+        try:
+            rules.append((re.compile(regex + r'\Z'), negated))
+        except re.error:
+            continue
+    return rules
+
+
+def _gitignore_excludes(rules: List[Tuple[str, List[Tuple[Any, bool]]]], rel_dir: str) -> bool:
+    """Decide whether a directory (relative to the scan root) is ignored; the last matching rule wins."""
+    excluded = False
+    for base, patterns in rules:
+        if base:
+            if not rel_dir.startswith(base + '/'):
+                continue
+            path = rel_dir[len(base) + 1:]
+        else:
+            path = rel_dir
+        for regex, negated in patterns:
+            if regex.match(path):
+                excluded = not negated
+    return excluded
+
 
 class CursorRuleConverter:
     """Converts Cursor Rules to VS Code Copilot Instructions."""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, jobs: int = 1,
+                 cache_dir: Optional[Path] = None,
+                 cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 cache: Optional['ConversionCache'] = None,
+                 scanner: Optional[DirectoryScanner] = None,
+                 repo_cache: Optional[RepoMirrorCache] = None,
+                 output_format: str = 'copilot',
+                 sinks: Sequence[OutputSink] = (),
+                 shard_by: Optional[str] = None,
+                 compact: bool = False,
+                 max_tokens: Optional[int] = None,
+                 dedupe: bool = False,
+                 slowest_count: int = 5,
+                 backup_keep: int = DEFAULT_BACKUP_KEEP,
+                 backup_keep_days: Optional[float] = None,
+                 backup_compress: bool = False):
         self.processed_files: List[Path] = []
         self.errors: List[str] = []
+        self.scanner: DirectoryScanner = scanner or DirectoryScanner()
+        self.scanned_files: List[Path] = []
         self.scanned_folders: Dict[Path, List[Path]] = {}
         self.temp_repo_dir: Optional[Path] = None
+        # Without a mirror cache, repositories are cloned afresh on every run
+        self.repo_cache: Optional[RepoMirrorCache] = repo_cache
         self.verbose: bool = verbose
+        # Number of worker processes; 0 means one per CPU core
+        self.jobs: int = jobs if jobs > 0 else (os.cpu_count() or 1)
+        # Format of the rendered sections (--format); part of the cache signature
+        self.renderer: Renderer = get_renderer(output_format)
+        # --sink: extra outputs, and the formats they need rendered next to self.renderer's
+        self.sinks: List[OutputSink] = list(sinks)
+        self.extra_formats: Tuple[str, ...] = tuple(sorted(
+            {sink.format for sink in self.sinks} - {self.renderer.name}))
+        # --dedupe: rules seen in earlier files, to emit each rule only once; part of the
+        # cache signature because only then are the rule spans kept in file_metadata
+        self.rule_index: Optional[RuleIndex] = RuleIndex() if dedupe else None
+        # A cache passed in is shared with other converters and saved by its owner
+        self.cache: Optional[ConversionCache] = cache
+        self._owns_cache: bool = cache is None and cache_dir is not None
+        if self._owns_cache:
+            self.cache = ConversionCache(cache_dir, self.cache_signature(), cache_max_bytes)
+        self.manifest_unchanged: bool = False
+        self._manifest_records: List[Tuple[str, Dict[str, Any], Optional[int]]] = []
         self.stats: Dict[str, Any] = {
             'total_files': 0,
             'successful': 0,
@@ -48,8 +2117,51 @@ class CursorRuleConverter:
             'total_rules': 0,
             'total_size_bytes': 0,
             'start_time': None,
-            'end_time': None
+            'end_time': None,
+            'phases': {phase: 0.0 for phase in TIMING_PHASES},
+            # 'written' or 'unchanged' once an output file has been produced
+            'output_status': None,
+            # --shard: counts of shard files written, left unchanged and removed
+            'shards': None,
+            # --dedupe: rule counts from the cross-file rule index
+            'rule_index': None,
+            # --sink: per-sink results and write times
+            'sinks': None
+        }
+        # Per-file phase timings keyed by path, plus 'total' for the whole file
+        self.file_timings: Dict[str, Dict[str, float]] = {}
+        self._file_timing: Optional[Dict[str, float]] = None
+        # Per-file metadata carried next to the rendered section: description, applyTo,
+        # the sections rendered for extra_formats and, with --dedupe, the rule spans
+        self.file_metadata: Dict[str, Dict[str, Any]] = {}
+        # --shard: None for a single output file, otherwise 'file' or 'glob'
+        self.shard_by: Optional[str] = shard_by
+        # --compact/--max-tokens: shrinks sections between rendering and writing
+        self.compactor: Optional[OutputCompactor] = (
+            OutputCompactor(max_tokens) if compact or max_tokens is not None else None)
+        # Number of slowest files listed by print_statistics
+        self.slowest_count: int = slowest_count
+        # Retention for snapshots in .backups (keep 0 = unlimited, keep_days None = no age limit)
+        self.backup_keep: int = backup_keep
+        self.backup_keep_days: Optional[float] = backup_keep_days
+        self.backup_compress: bool = backup_compress
+    
+    def cache_signature(self) -> str:
+        """
+        Describe the converter version and settings that affect rendered output.
+        
+        Cached conversions are only reused when this signature matches.
+        """
+        settings = {
+            'version': __version__,
+            'format': _CACHE_FORMAT,
+            'preprocess': ['quote_globs'],
+            'yaml_loader': _yaml_loader_name(),
+            'output_format': self.renderer.name,
+            'extra_formats': list(self.extra_formats),
+            'rule_spans': self.rule_index is not None,
         }
+        return json.dumps(settings, sort_keys=True)
     
     def is_github_url(self, url: str) -> bool:
         """Check if string is a GitHub repository URL."""
@@ -63,51 +2175,118 @@ class CursorRuleConverter:
     def clone_github_repo(self, repo_url: str) -> Optional[Path]:
         """Clone a GitHub repository to a temporary directory."""
         try:
-            # Normalize URL
-            if not repo_url.startswith(('http://', 'https://', 'git@')):
-                repo_url = f'https://github.com/{repo_url}'
-            if repo_url.endswith('.git'):
-                repo_url = repo_url[:-4]
-            if not repo_url.endswith('.git'):
-                repo_url = repo_url + '.git'
+            repo_url = normalize_github_url(repo_url)
             
             # Create temp directory
-            temp_dir = Path(tempfile.mkdtemp(prefix='cursor_rules_'))
-            self.temp_repo_dir = temp_dir
+            import tempfile
+            self.temp_repo_dir = Path(tempfile.mkdtemp(prefix='cursor_rules_'))
+            temp_dir = self.temp_repo_dir / 'repo'
             
-            print(f"Cloning repository: {repo_url}")
-            print("This may take a moment...\n")
+            if self.repo_cache is None:
+                print(f"Cloning repository: {repo_url}")
+                print("This may take a moment...\n")
             
-            # Clone the repository
-            result = subprocess.run(
-                ['git', 'clone', '--depth', '1', repo_url, str(temp_dir)],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            if result.returncode != 0:
-                print(f"Error cloning repository: {result.stderr}", file=sys.stderr)
+            error = asyncio.run(self._fetch_repo(repo_url, temp_dir))
+            if error:
+                print(f"Error cloning repository: {error}", file=sys.stderr)
+                self.cleanup_temp_repo()
                 return None
             
             print(f"Repository cloned to: {temp_dir}\n")
             return temp_dir
             
-        except subprocess.TimeoutExpired:
-            print("Error: Repository cloning timed out", file=sys.stderr)
-            return None
-        except FileNotFoundError:
-            print("Error: git command not found. Please install git.", file=sys.stderr)
-            return None
         except Exception as e:
             print(f"Error cloning repository: {e}", file=sys.stderr)
             return None
     
+    async def _fetch_repo(self, url: str, destination: Path) -> Optional[str]:
+        """Check out a repository's .mdc files, through the mirror cache when there is one."""
+        if self.repo_cache is not None:
+            return await self.repo_cache.checkout(url, destination)
+        if self.verbose:
+            print(f"  [DEBUG] Cloning {url} into {destination}")
+        return await sparse_clone(url, destination)
+    
+    def convert_repositories(self, repo_urls: List[str], output_path: Optional[Path] = None,
+                             concurrency: int = DEFAULT_FETCH_CONCURRENCY, recursive: bool = True,
+                             backup_existing: bool = True, dry_run: bool = False,
+                             show_stats: bool = False) -> bool:
+        """
+        Fetch several repositories concurrently and convert all their rules into one output.
+        
+        Repositories are cloned shallowly and sparsely (only .mdc files are
+        checked out), at most concurrency at a time. Each repository is
+        converted as soon as it and the ones before it have arrived, while the
+        remaining clones continue, and output follows the order of repo_urls.
+        
+        Args:
+            repo_urls: GitHub URLs or any URL git can clone (including file://)
+            output_path: Output file path (if None, prints to stdout)
+            concurrency: Maximum number of clones running at once
+            recursive: Process repository subdirectories
+            backup_existing: Create backup of existing output file before overwriting
+            dry_run: Preview conversion without writing files
+            show_stats: Display detailed statistics after conversion
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        from datetime import datetime as dt
+        self.stats['start_time'] = dt.now()
+        
+        if not repo_urls:
+            print("Error: No repositories given", file=sys.stderr)
+            return False
+        if dry_run:
+            print("\n[DRY RUN MODE] - No files will be modified\n")
+        
+        import tempfile
+        concurrency = max(1, min(concurrency, len(repo_urls)))
+        self.temp_repo_dir = Path(tempfile.mkdtemp(prefix='cursor_rules_'))
+        print(f"Fetching {len(repo_urls)} repositories ({concurrency} at a time)...\n")
+        try:
+            sections = asyncio.run(self._fetch_and_convert(repo_urls, concurrency, recursive))
+        except BaseException:
+            self.cleanup_temp_repo()
+            raise
+        return self._write_converted(sections, output_path, backup_existing=backup_existing,
+                                     dry_run=dry_run, show_stats=show_stats)
+    
+    async def _fetch_and_convert(self, repo_urls: List[str], concurrency: int, recursive: bool) -> List[str]:
+        """Clone repositories in the background and convert them in order as they arrive."""
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        
+        async def fetch(index: int, url: str) -> Tuple[Path, Optional[str]]:
+            if self.is_github_url(url):
+                url = normalize_github_url(url)
+            destination = self.temp_repo_dir / f"repo{index:03d}"
+            async with semaphore:
+                return destination, await self._fetch_repo(url, destination)
+        
+        tasks = [asyncio.ensure_future(fetch(index, url)) for index, url in enumerate(repo_urls)]
+        sections: List[str] = []
+        # Conversion runs in one worker thread so the event loop keeps driving the clones
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for url, task in zip(repo_urls, tasks):
+                repo_path, error = await task
+                if error:
+                    print(f"  ✗ {url}", file=sys.stderr)
+                    self.errors.append(f"Could not fetch {url}: {error}")
+                    continue
+                mdc_files = self.find_mdc_files(repo_path, recursive)
+                print(f"  ✓ {url} ({len(mdc_files)} file{'s' if len(mdc_files) != 1 else ''})")
+                sections.extend(await loop.run_in_executor(executor, self.process_files, mdc_files))
+        return sections
+    
     def cleanup_temp_repo(self):
         """Clean up temporary repository directory."""
         if self.temp_repo_dir and self.temp_repo_dir.exists():
             shutil.rmtree(self.temp_repo_dir)
             self.temp_repo_dir = None
+            if self.repo_cache is not None:
+                self.repo_cache.save()
     
     def print_statistics(self):
         """Print detailed conversion statistics."""
@@ -123,10 +2302,38 @@ class CursorRuleConverter:
         
         print(f"\nRules:")
         print(f"  Total extracted: {self.stats['total_rules']}")
+        if self.stats['rule_index']:
+            print(f"  Unique ids:      {self.stats['rule_index']['unique']}")
+            print(f"  Duplicates:      {self.stats['rule_index']['duplicates']}")
+            print(f"  Conflicts:       {self.stats['rule_index']['conflicts']}")
         
         print(f"\nData:")
         size_kb = self.stats['total_size_bytes'] / 1024
         print(f"  Total size:      {size_kb:.2f} KB")
+        if self.stats['output_status']:
+            print(f"  Output file:     {self.stats['output_status']}")
+        
+        if self.compactor is not None:
+            compaction = self.compactor.summary()
+            print(f"\nCompaction:")
+            print(f"  Before:          {compaction['chars_before'] / 1024:.2f} KB (~{compaction['tokens_before']} tokens)")
+            print(f"  After:           {compaction['chars_after'] / 1024:.2f} KB (~{compaction['tokens_after']} tokens)")
+            print(f"  Duplicate rules: {compaction['duplicate_rules']}")
+            if compaction['max_tokens'] is not None:
+                dropped = ', '.join(f"{count} {severity}" for severity, count in compaction['dropped_rules'].items())
+                print(f"  Budget:          {compaction['max_tokens']} tokens")
+                print(f"  Dropped rules:   {dropped or 'none'}")
+        
+        if self.stats['sinks']:
+            print(f"\nSinks:")
+            for sink in self.stats['sinks']:
+                print(f"  {sink['kind'] + ':':<16} {sink['seconds'] * 1000:.1f} ms, {sink['written']} written, "
+                      f"{sink['unchanged']} unchanged ({sink['path'] or 'next to each source'})")
+        
+        if self.cache is not None:
+            print(f"\nCache:")
+            print(f"  Hits:            {self.cache.hits}")
+            print(f"  Misses:          {self.cache.misses}")
         
         if self.stats['start_time'] and self.stats['end_time']:
             duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
@@ -136,6 +2343,20 @@ class CursorRuleConverter:
                 avg_time = duration / self.stats['successful']
                 print(f"  Avg per file:    {avg_time:.3f} seconds")
         
+        phases = self.stats['phases']
+        phase_total = sum(phases.values())
+        if phase_total > 0:
+            print(f"\nPhases:")
+            for phase in TIMING_PHASES:
+                share = phases[phase] / phase_total * 100
+                print(f"  {phase + ':':<16} {phases[phase]:.3f} seconds ({share:.1f}%)")
+        
+        slowest = self.slowest_files(self.slowest_count)
+        if slowest:
+            print(f"\nSlowest files:")
+            for path, timing in slowest:
+                print(f"  {timing['total'] * 1000:8.1f} ms  {path}")
+        
         if self.errors:
             print(f"\nErrors ({len(self.errors)}):")
             for error in self.errors[:10]:  # Show first 10 errors
@@ -145,6 +2366,74 @@ class CursorRuleConverter:
         
         print("="*70 + "\n")
     
+    def slowest_files(self, count: int) -> List[Tuple[str, Dict[str, float]]]:
+        """Return the count files that took longest to parse and render, slowest first."""
+        if count <= 0:
+            return []
+        ranked = sorted(self.file_timings.items(), key=lambda item: item[1].get('total', 0.0), reverse=True)
+        return ranked[:count]
+    
+    def statistics_dict(self) -> Dict[str, Any]:
+        """
+        Collect the statistics shown by print_statistics in a JSON-serializable form.
+        
+        Returns:
+            Dictionary with file counters, duration, whether the output file
+            was written or left unchanged, compaction sizes, rule index
+            counts, cumulative phase timings, cache counters, the slowest
+            files and per-file phase timings
+        """
+        duration = None
+        if self.stats['start_time'] and self.stats['end_time']:
+            duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
+        return {
+            'version': __version__,
+            'files': {key: self.stats[key] for key in FILE_COUNTER_KEYS},
+            'duration_seconds': duration,
+            'output_status': self.stats['output_status'],
+            'shards': self.stats['shards'],
+            'compaction': self.compactor.summary() if self.compactor is not None else None,
+            'rule_index': self.stats['rule_index'],
+            'sinks': self.stats['sinks'],
+            'phases': dict(self.stats['phases']),
+            'cache': ({'hits': self.cache.hits, 'misses': self.cache.misses}
+                      if self.cache is not None else None),
+            'slowest': [dict(timing, file=path) for path, timing in self.slowest_files(self.slowest_count)],
+            'per_file': self.file_timings,
+            'errors': self.errors,
+        }
+    
+    def export_statistics(self, path: Path):
+        """Write statistics_dict() as JSON to path."""
+        try:
+            path.write_text(json.dumps(self.statistics_dict(), indent=2) + '\n', encoding='utf-8')
+        except OSError as e:
+            print(f"Warning: Could not write statistics to {path}: {e}", file=sys.stderr)
+    
+    def _record_phase(self, phase: str, started: float) -> float:
+        """
+        Add the time elapsed since started to a phase and to the file being processed.
+        
+        Returns:
+            The current perf_counter value, so consecutive phases can be chained
+        """
+        now = time.perf_counter()
+        elapsed = now - started
+        self.stats['phases'][phase] += elapsed
+        if self._file_timing is not None:
+            self._file_timing[phase] = self._file_timing.get(phase, 0.0) + elapsed
+        return now
+    
+    def _timed_write(self, write: Callable[[str], Any]) -> Callable[[str], None]:
+        """Wrap a write callable so the time spent in it counts towards the write phase."""
+        phases = self.stats['phases']
+        
+        def timed(text: str):
+            started = time.perf_counter()
+            write(text)
+            phases['write'] += time.perf_counter() - started
+        return timed
+    
     @staticmethod
     def load_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
         """Load configuration from .convertmdcrc file."""
@@ -172,6 +2461,7 @@ class CursorRuleConverter:
         Returns:
             New version string if available, None otherwise
         """
+        import urllib.request
         try:
             with urllib.request.urlopen(__version_url__, timeout=5) as response:
                 latest_version = response.read().decode('utf-8').strip()
@@ -197,6 +2487,7 @@ class CursorRuleConverter:
         Returns:
             True if update successful, False otherwise
         """
+        import urllib.request
         try:
             print("Checking for updates...")
             latest_version = CursorRuleConverter.check_for_updates()
@@ -336,7 +2627,7 @@ class CursorRuleConverter:
         
         return rules
     
-    def parse_mdc_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
+    def parse_mdc_file(self, file_path: Path) -> Optional[ParsedRuleFile]:
         """
         Parse a .mdc file and extract frontmatter and rules.
         
@@ -344,339 +2635,568 @@ class CursorRuleConverter:
             file_path: Path to the .mdc file
             
         Returns:
-            Dictionary containing parsed data or None if parsing fails
+            The parsed file, or None if parsing fails
         """
         if self.verbose:
             print(f"  [DEBUG] Parsing: {file_path}")
         
         try:
-            self.stats['total_size_bytes'] += file_path.stat().st_size
-            content = file_path.read_text(encoding='utf-8')
-            
-            # Extract YAML frontmatter
-            frontmatter_match = re.match(r'^---\s*\n(.*?\n)---\s*\n', content, re.DOTALL)
-            if not frontmatter_match:
-                self.errors.append(f"No frontmatter found in {file_path}")
-                return None
-            
-            frontmatter_str = frontmatter_match.group(1)
-            rest_content = content[frontmatter_match.end():]
-            
-            # Parse frontmatter as YAML
-            # Handle globs field that may not be quoted
-            try:
-                # Pre-process frontmatter to handle unquoted globs patterns
-                processed_frontmatter = self._preprocess_frontmatter(frontmatter_str)
-                frontmatter = yaml.safe_load(processed_frontmatter)
-            except yaml.YAMLError as e:
-                self.errors.append(f"YAML parsing error in {file_path}: {e}")
-                return None
-            
-            # Extract the rules section and references
-            rules_match = re.search(r'^rules:\s*\n(.*?)(?=^references:|^---|\Z)', 
-                                   rest_content, re.MULTILINE | re.DOTALL)
-            references_match = re.search(r'^references:\s*\n(.*?)(?=^---|\Z)', 
-                                        rest_content, re.MULTILINE | re.DOTALL)
-            
-            rules_data = None
-            references_data = None
-            enforcement_data = None
-            
-            if rules_match:
-                rules_content = rules_match.group(1)
-                
-                # Check if there's an enforcement section (non-standard)
-                enforcement_match = re.search(r'^enforcement:\s*\n(.*?)(\Z|^[a-z_]+:)', 
-                                             rules_content, re.MULTILINE | re.DOTALL)
-                if enforcement_match:
-                    enforcement_data = enforcement_match.group(1).strip()
-                    # Remove enforcement section from rules content
-                    rules_content = rules_content[:enforcement_match.start()]
-                
-                rules_str = "rules:\n" + rules_content
-                try:
-                    parsed = yaml.safe_load(rules_str)
-                    rules_data = parsed.get('rules', [])
-                except yaml.YAMLError as e:
-                    # Try to be more lenient - sometimes backticks cause issues
-                    # Log but continue processing
-                    self.errors.append(f"Warning: Could not fully parse rules in {file_path}: {e}")
-                    # Try to extract rules manually using regex as fallback
-                    rules_data = self._extract_rules_manually(rules_content)
-            
-            if references_match:
-                refs_str = "references:\n" + references_match.group(1)
-                try:
-                    parsed = yaml.safe_load(refs_str)
-                    references_data = parsed.get('references', [])
-                except yaml.YAMLError as e:
-                    # References might not parse as clean YAML, that's okay
-                    pass
-            
-            # Extract markdown header (between frontmatter and rules)
-            markdown_header = ""
-            if rules_match:
-                markdown_header = rest_content[:rules_match.start()].strip()
-            
-            return {
-                'file_path': file_path,
-                'frontmatter': frontmatter,
-                'markdown_header': markdown_header,
-                'rules': rules_data or [],
-                'references': references_data or [],
-                'enforcement': enforcement_data
-            }
-            
+            started = time.perf_counter()
+            with read_rule_file(file_path) as (content, size):
+                self.stats['total_size_bytes'] += size
+                started = self._record_phase('read', started)
+                return self._parse_mdc_content(file_path, content, started)
         except Exception as e:
             self.errors.append(f"Error reading {file_path}: {e}")
             return None
     
-    def format_rule_as_markdown(self, rule: Dict[str, Any], level: int = 3) -> str:
+    def _parse_mdc_content(self, file_path: Path, content: Any, started: float) -> Optional[ParsedRuleFile]:
         """
-        Format a single rule as markdown for Copilot instructions.
+        Parse the content of a .mdc file opened by read_rule_file().
         
         Args:
-            rule: Rule dictionary with id, description, severity
-            level: Heading level (default: 3 for ###)
+            file_path: Path to the .mdc file, for messages
+            content: File content as str or memory-mapped file
+            started: perf_counter() value at the end of the read phase
             
         Returns:
-            Formatted markdown string
+            The parsed file, or None if parsing fails
         """
-        rule_id = rule.get('id', 'unknown')
-        description = rule.get('description', '').strip()
-        severity = rule.get('severity', 'warning')
+        # Find the frontmatter, rules, enforcement and references boundaries
+        sections = scan_mdc_sections(content)
+        if sections is None:
+            self.errors.append(f"No frontmatter found in {file_path}")
+            return None
         
-        # Create heading
-        heading = "#" * level + f" {rule_id}"
+        frontmatter_str = decode_slice(content, *sections['frontmatter'])
         
-        # Add severity badge
-        severity_badge = f"**Severity:** `{severity}`"
+        # Parse frontmatter as YAML
+        # Handle globs field that may not be quoted
+        try:
+            # Pre-process frontmatter to handle unquoted globs patterns
+            processed_frontmatter = self._preprocess_frontmatter(frontmatter_str)
+            started = self._record_phase('preprocess', started)
+            frontmatter = load_yaml(processed_frontmatter)
+        except yaml.YAMLError as e:
+            self._record_phase('yaml', started)
+            self.errors.append(f"YAML parsing error in {file_path}: {e}")
+            return None
+        self._record_phase('yaml', started)
+        if frontmatter is None:
+            frontmatter = {}
+        elif not isinstance(frontmatter, dict):
+            self.errors.append(f"Frontmatter in {file_path} is not a mapping")
+            return None
+        
+        rules_data = None
+        references_data = None
+        enforcement_data = None
+        
+        rules = sections['rules']
+        if rules:
+            rules_line, rules_start, rules_end = rules
+            
+            # Check if there's an enforcement section (non-standard)
+            enforcement = sections['enforcement']
+            if enforcement:
+                enforcement_line, enforcement_start, enforcement_end = enforcement
+                enforcement_data = decode_slice(content, enforcement_start, enforcement_end).strip()
+                # Remove enforcement section from rules content
+                rules_end = enforcement_line
+            
+            rules_str = _section_yaml(content, 'rules', rules_line, rules_start, rules_end)
+            started = time.perf_counter()
+            try:
+                parsed = load_yaml(rules_str)
+                rules_data = parsed.get('rules', [])
+                self._record_phase('yaml', started)
+            except yaml.YAMLError as e:
+                started = self._record_phase('yaml', started)
+                # Try to be more lenient - sometimes backticks cause issues
+                # Log but continue processing
+                self.errors.append(f"Warning: Could not fully parse rules in {file_path}: {e}")
+                # Try to extract rules manually using regex as fallback
+                rules_data = self._extract_rules_manually(decode_slice(content, rules_start, rules_end))
+                self._record_phase('fallback', started)
         
-        # Format description (already contains formatting and bullets)
-        formatted_desc = description
+        references = sections['references']
+        if references:
+            refs_str = _section_yaml(content, 'references', *references)
+            started = time.perf_counter()
+            try:
+                parsed = load_yaml(refs_str)
+                references_data = parsed.get('references', [])
+            except yaml.YAMLError as e:
+                # References might not parse as clean YAML, that's okay
+                pass
+            self._record_phase('yaml', started)
         
-        output = f"{heading}\n\n{severity_badge}\n\n{formatted_desc}\n"
+        # Extract markdown header (between frontmatter and rules)
+        markdown_header = ""
+        if rules:
+            markdown_header = decode_slice(content, sections['body'], rules[0]).strip()
         
-        return output
+        return ParsedRuleFile(
+            file_path=file_path,
+            frontmatter=frontmatter,
+            markdown_header=markdown_header,
+            rules=[Rule.from_dict(rule) for rule in rules_data or []],
+            references=references_data or [],
+            enforcement=enforcement_data
+        )
+    
+    def format_rule_as_markdown(self, rule: Rule, level: int = 3) -> str:
+        """
+        Format a single rule as markdown for Copilot instructions.
+        
+        Args:
+            rule: Rule (a rule dictionary with id, description, severity is converted)
+            level: Heading level (default: 3 for ###)
+            
+        Returns:
+            Formatted markdown string
+        """
+        if not isinstance(rule, Rule):
+            rule = Rule.from_dict(rule)
+        # Heading, severity badge, then the description (already contains formatting and bullets)
+        return CopilotRenderer.rule_template(level).fill(rule)
     
-    def convert_to_copilot_instructions(self, parsed_data: Dict[str, Any]) -> str:
+    def convert_to_copilot_instructions(self, parsed_data: ParsedRuleFile) -> str:
         """
         Convert parsed Cursor Rules to Copilot Instructions format.
         
         Args:
-            parsed_data: Parsed .mdc file data
+            parsed_data: Parsed .mdc file (the dictionary layout is converted)
             
         Returns:
             Formatted Copilot Instructions markdown
         """
-        frontmatter = parsed_data['frontmatter']
-        rules = parsed_data['rules']
-        references = parsed_data['references']
-        enforcement = parsed_data.get('enforcement')
-        markdown_header = parsed_data['markdown_header']
-        file_path = parsed_data['file_path']
-        
-        # Build the output
-        output_lines: List[str] = []
-        
-        # Title
-        description = frontmatter.get('description', file_path.stem.replace('_', ' ').title())
-        output_lines.append(f"# {description}\n")
-        
-        # Metadata section
-        output_lines.append("## Metadata\n")
-        output_lines.append(f"- **Source:** `{file_path.name}`")
-        output_lines.append(f"- **Always Apply:** `{frontmatter.get('alwaysApply', False)}`")
-        
-        if 'globs' in frontmatter:
-            output_lines.append(f"- **Applies To:** `{frontmatter['globs']}`")
-        
-        output_lines.append("")  # Blank line
-        
-        # Include markdown header if present
-        if markdown_header:
-            output_lines.append(markdown_header)
-            output_lines.append("")
+        return self.render_with_rule_spans(parsed_data)[0]
+    
+    def render_with_rule_spans(self, parsed_data: ParsedRuleFile) -> Tuple[str, List[Tuple[int, int]]]:
+        """
+        Render like convert_to_copilot_instructions, also locating each rule.
         
-        # Rules section
-        if rules:
-            output_lines.append("## Rules\n")
+        Args:
+            parsed_data: Parsed .mdc file (the dictionary layout is converted)
             
-            for rule in rules:
-                rule_md = self.format_rule_as_markdown(rule)
-                output_lines.append(rule_md)
-        
-        # Enforcement section (if present)
-        if enforcement:
-            output_lines.append("## Enforcement\n")
-            output_lines.append(enforcement)
-            output_lines.append("")
-        
-        # References section
-        if references:
-            output_lines.append("## References\n")
-            for ref in references:
-                if isinstance(ref, str):
-                    output_lines.append(f"- {ref}")
-                else:
-                    output_lines.append(f"- {ref}")
-            output_lines.append("")
-        
-        # Add separator
-        output_lines.append("\n---\n")
-        
-        return "\n".join(output_lines)
+        Returns:
+            Tuple of (markdown, (start, end) offsets of each rule's block in
+            the order of parsed_data.rules)
+        """
+        if isinstance(parsed_data, dict):
+            parsed_data = ParsedRuleFile.from_dict(parsed_data)
+        return RENDERERS['copilot'].render_with_rule_spans(parsed_data)
     
     def process_file(self, file_path: Path) -> Optional[str]:
         """Process a single .mdc file."""
         if not file_path.suffix == '.mdc':
             return None
         
+        if self.cache is None:
+            return self._process_file_uncached(file_path)
+        
+        entry = self.cache.get(file_path)
+        if entry is not None:
+            if self.verbose:
+                print(f"  [DEBUG] Cache hit: {file_path}")
+            return self._apply_file_result(file_path, entry)
+        
+        stats_before = {key: self.stats[key] for key in FILE_COUNTER_KEYS}
+        errors_before = len(self.errors)
+        processed_before = len(self.processed_files)
+        output = self._process_file_uncached(file_path)
+        self.cache.put(file_path, {
+            'output': output,
+            'stats': {key: self.stats[key] - stats_before[key] for key in FILE_COUNTER_KEYS},
+            'errors': self.errors[errors_before:],
+            'processed': len(self.processed_files) > processed_before,
+            'metadata': self.file_metadata.get(str(file_path)),
+        })
+        return output
+    
+    def _process_file_uncached(self, file_path: Path) -> Optional[str]:
+        """Parse and render a single .mdc file, updating stats, errors and timings."""
         self.stats['total_files'] += 1
         if self.verbose:
             print(f"  [DEBUG] Processing: {file_path}")
         
-        parsed = self.parse_mdc_file(file_path)
-        if not parsed:
-            self.stats['failed'] += 1
-            return None
-        
-        self.processed_files.append(file_path)
-        self.stats['successful'] += 1
-        if parsed.get('rules'):
-            self.stats['total_rules'] += len(parsed['rules'])
-        
-        return self.convert_to_copilot_instructions(parsed)
-    
-    def backup_repo(self, repo_path: Path, output_path: Path) -> Optional[Path]:
-        """Backup entire repository structure before conversion."""
+        self._file_timing = timing = {}
+        started = time.perf_counter()
         try:
-            # Create backup directory
-            backup_dir = output_path.parent / '.backups'
-            backup_dir.mkdir(exist_ok=True)
-            
-            # Create timestamped repo backup folder
-            from datetime import datetime
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            repo_name = repo_path.name
-            backup_path = backup_dir / f"repo_{repo_name}_{timestamp}"
-            
-            print(f"Creating repository backup: {backup_path}")
+            parsed = self.parse_mdc_file(file_path)
+            if not parsed:
+                self.stats['failed'] += 1
+                return None
             
-            # Copy entire repo (excluding .git)
-            def ignore_patterns(directory: str, files: List[str]) -> List[str]:
-                return ['.git', '__pycache__', '*.pyc', '.DS_Store']
+            self.processed_files.append(file_path)
+            self.stats['successful'] += 1
+            self.stats['total_rules'] += len(parsed.rules)
+            frontmatter = parsed.frontmatter if isinstance(parsed.frontmatter, dict) else {}
+            self.file_metadata[str(file_path)] = {
+                'description': frontmatter.get('description'),
+                'apply_to': apply_to_globs(frontmatter),
+            }
             
-            shutil.copytree(repo_path, backup_path, ignore=ignore_patterns)
-            print(f"Repository backup created successfully\n")
+            render_started = time.perf_counter()
+            if self.extra_formats:
+                # Sections for the --sink outputs, from the same parse
+                self.file_metadata[str(file_path)]['renders'] = render_formats(parsed, self.extra_formats)
+            if self.renderer.name != 'copilot' or self.rule_index is None:
+                output = self.renderer.render(parsed)
+                self._record_phase('render', render_started)
+                return output
+            output, spans = self.render_with_rule_spans(parsed)
+            # Identity of each rule, for the cross-file index used by --dedupe
+            self.file_metadata[str(file_path)]['rules'] = [
+                [rule.id, description_digest(rule.description), rule.severity, start, end]
+                for rule, (start, end) in zip(parsed.rules, spans)
+            ]
+            self._record_phase('render', render_started)
+            return output
+        finally:
+            timing['total'] = time.perf_counter() - started
+            self.file_timings[str(file_path)] = timing
+            self._file_timing = None
+    
+    def backup_repo(self, repo_path: Path, output_path: Path, repo_name: Optional[str] = None) -> Optional[Path]:
+        """
+        Snapshot the repository's rule files before conversion.
+        
+        Snapshots go to .backups/repo_<name>_<timestamp> next to the output
+        and share identical files with earlier snapshots; nothing is written
+        when the rule files match the previous snapshot.
+        
+        Args:
+            repo_path: Cloned repository
+            output_path: Output file; backups are stored next to it
+            repo_name: Name for the snapshot (defaults to the directory name)
             
+        Returns:
+            The new or unchanged snapshot directory, or None on failure
+        """
+        try:
+            store = BackupStore(output_path.parent / '.backups', self.backup_keep, self.backup_keep_days)
+            name = re.sub(r'[^\w.-]+', '_', repo_name or repo_path.name)
+            backup_path, created = store.snapshot(f"repo_{name}", repo_path,
+                                                  self.scanner.scan(repo_path, True))
+            if created:
+                print(f"Repository backup created: {backup_path}\n")
+            else:
+                print(f"Repository backup unchanged: {backup_path}\n")
             return backup_path
         except Exception as e:
             print(f"Warning: Could not create repository backup: {e}", file=sys.stderr)
             return None
     
+    def find_mdc_files(self, dir_path: Path, recursive: bool = True) -> List[Path]:
+        """Return the sorted .mdc files under dir_path, timing the search as the glob phase."""
+        started = time.perf_counter()
+        mdc_files = self.scanner.scan(dir_path, recursive)
+        self._record_phase('glob', started)
+        return mdc_files
+    
     def scan_directory(self, dir_path: Path, recursive: bool = True) -> Dict[Path, List[Path]]:
         """Scan directory and group .mdc files by folder."""
-        pattern = "**/*.mdc" if recursive else "*.mdc"
-        mdc_files = sorted(dir_path.glob(pattern))
+        mdc_files = self.find_mdc_files(dir_path, recursive)
+        self.scanned_files = mdc_files
         
         # Group files by their parent directory
         folders: Dict[Path, List[Path]] = defaultdict(list)
         for mdc_file in mdc_files:
             folders[mdc_file.parent].append(mdc_file)
         
-        self.scanned_folders = dict(folders)
-        return self.scanned_folders
+        self.scanned_folders = dict(folders)
+        return self.scanned_folders
+    
+    def _apply_file_result(self, file_path: Path, file_result: Dict[str, Any]) -> Optional[str]:
+        """Fold the stats and errors recorded for one file (by a worker or the cache) into this converter."""
+        for key, value in file_result['stats'].items():
+            self.stats[key] += value
+        self.errors.extend(file_result['errors'])
+        if file_result['processed']:
+            self.processed_files.append(file_path)
+        if file_result.get('metadata'):
+            self.file_metadata[str(file_path)] = file_result['metadata']
+        timings = file_result.get('timings')
+        if timings:
+            self.file_timings[str(file_path)] = timings
+            for phase in TIMING_PHASES:
+                if phase in timings:
+                    self.stats['phases'][phase] += timings[phase]
+        return file_result['output']
+    
+    def iter_processed_files(self, files: List[Path]) -> Iterator[Tuple[Path, Optional[str]]]:
+        """
+        Process files and yield (file, converted markdown) pairs in input order.
+        
+        Files are spread across a process pool when more than one job is
+        configured. Results are consumed in submission order, so stats, errors
+        and output are identical to a serial run.
+        
+        Args:
+            files: .mdc files to process
+            
+        Yields:
+            Tuples of the source file and its converted markdown (None on failure)
+        """
+        if self.jobs <= 1 or len(files) <= 1:
+            for mdc_file in files:
+                yield mdc_file, self.process_file(mdc_file)
+            return
+        
+        # Cache lookups stay in the parent so only misses are sent to workers
+        cached: Dict[int, Dict[str, Any]] = {}
+        if self.cache is not None:
+            for idx, mdc_file in enumerate(files):
+                if mdc_file.suffix == '.mdc':
+                    entry = self.cache.get(mdc_file)
+                    if entry is not None:
+                        cached[idx] = entry
+        misses = [mdc_file for idx, mdc_file in enumerate(files) if idx not in cached]
+        
+        workers = max(1, min(self.jobs, len(misses)))
+        chunksize = max(1, len(misses) // (workers * 4))
+        if self.verbose:
+            print(f"  [DEBUG] Processing {len(misses)} file(s) with {workers} worker(s)")
+        
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            worker_args = [(mdc_file, self.verbose, self.renderer.name, self.extra_formats,
+                            self.rule_index is not None) for mdc_file in misses]
+            results = executor.map(_process_file_worker, worker_args, chunksize=chunksize)
+            for idx, mdc_file in enumerate(files):
+                if idx in cached:
+                    yield mdc_file, self._apply_file_result(mdc_file, cached[idx])
+                    continue
+                worker_result = next(results)
+                if self.cache is not None and mdc_file.suffix == '.mdc':
+                    # Timings describe this run only, so they are not cached
+                    self.cache.put(mdc_file, {key: value for key, value in worker_result.items()
+                                              if key != 'timings'})
+                yield mdc_file, self._apply_file_result(mdc_file, worker_result)
+    
+    def iter_converted(self, files: List[Path]) -> Iterator[str]:
+        """Lazily process files, yielding only the successful conversions in order."""
+        for _, result in self.iter_processed_files(files):
+            if result is not None:
+                yield result
+    
+    def process_files(self, files: List[Path]) -> List[str]:
+        """Process specific files and return the successful conversions in order."""
+        return list(self.iter_converted(files))
     
     def process_directory(self, dir_path: Path, recursive: bool = True) -> List[str]:
         """Process all .mdc files in a directory."""
-        pattern = "**/*.mdc" if recursive else "*.mdc"
-        mdc_files = sorted(dir_path.glob(pattern))
-        
-        results: List[str] = []
-        for mdc_file in mdc_files:
-            result: Optional[str] = self.process_file(mdc_file)
-            if result is not None:
-                results.append(result)
-        
-        return results
+        return self.process_files(self.find_mdc_files(dir_path, recursive))
     
     def process_selected_folders(self, selected_folders: List[Path]) -> List[str]:
         """Process .mdc files from selected folders only."""
-        results: List[str] = []
+        mdc_files: List[Path] = []
         for folder in selected_folders:
             if folder in self.scanned_folders:
-                for mdc_file in self.scanned_folders[folder]:
-                    result: Optional[str] = self.process_file(mdc_file)
-                    if result is not None:
-                        results.append(result)
-        return results
+                mdc_files.extend(self.scanned_folders[folder])
+        return self.process_files(mdc_files)
     
-    def process_files_with_progress(self, files: List[Path]) -> List[str]:
-        """Process specific files with progress tracking."""
-        results: List[str] = []
-        total = len(files)
+    def supports_incremental(self) -> bool:
+        """
+        Whether process_files_incremental can be used with these settings.
         
-        print("")
-        for idx, mdc_file in enumerate(files, 1):
-            print(f"[{idx}/{total}] Processing: {mdc_file.name}")
-            result: Optional[str] = self.process_file(mdc_file)
-            if result is not None:
-                results.append(result)
-                print(f"  ✓ Done")
+        The manifest maps sources to spans of the written Copilot output, so
+        it needs unsharded Copilot output that compaction, deduplication and
+        sinks do not rewrite after rendering.
+        """
+        return not (self.shard_by or self.compactor or self.rule_index or self.sinks
+                    or self.renderer.name != 'copilot')
+    
+    @staticmethod
+    def manifest_path_for(output_path: Path) -> Path:
+        """Location of the incremental-build manifest kept next to an output file."""
+        return output_path.parent / f".{output_path.name}.manifest.json"
+    
+    def _load_manifest(self, output_path: Path) -> Dict[str, Any]:
+        """
+        Load the incremental manifest for an output file.
+        
+        The manifest is only trusted when it was written by a converter with
+        the same signature and the output file has not been touched since.
+        
+        Returns:
+            Manifest dictionary, or an empty dict if it is missing or stale
+        """
+        try:
+            manifest = json.loads(self.manifest_path_for(output_path).read_text(encoding='utf-8'))
+            st = output_path.stat()
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('signature') != self.cache_signature():
+            return {}
+        if manifest.get('output') != [st.st_mtime_ns, st.st_size]:
+            return {}
+        return manifest
+    
+    def process_files_incremental(self, files: List[Path], output_path: Path) -> Iterator[str]:
+        """
+        Process files, reusing sections of the existing output for unchanged sources.
+        
+        Sources whose (mtime, size) match the manifest written by the previous
+        run are not read again; their section is sliced out of the existing
+        output and their recorded stats and errors are replayed. Only added
+        or changed files are converted. The change plan (and
+        ``manifest_unchanged``) is computed immediately; sections are produced
+        lazily. Call write_manifest() after the new output has been written.
+        
+        Args:
+            files: .mdc files to process, in output order
+            output_path: Output file written by the previous run
+            
+        Returns:
+            Iterator over converted sections in file order
+        """
+        manifest = self._load_manifest(output_path)
+        previous: Dict[str, Dict[str, Any]] = manifest.get('files', {})
+        previous_output = ""
+        if previous:
+            try:
+                previous_output = output_path.read_text(encoding='utf-8')
+            except OSError:
+                previous = {}
+        
+        plan: List[Tuple[Path, Optional[os.stat_result], Optional[Dict[str, Any]]]] = []
+        changed: List[Path] = []
+        for mdc_file in files:
+            if mdc_file.suffix != '.mdc':
+                continue
+            try:
+                st: Optional[os.stat_result] = mdc_file.stat()
+            except OSError:
+                st = None
+            record = previous.get(str(mdc_file))
+            if st and record and record['mtime_ns'] == st.st_mtime_ns and record['size'] == st.st_size:
+                plan.append((mdc_file, st, record))
             else:
-                print(f"  ✗ Failed")
+                plan.append((mdc_file, st, None))
+                changed.append(mdc_file)
         
-        return results
+        removed = len(set(previous) - {str(mdc_file) for mdc_file, _, _ in plan})
+        self.manifest_unchanged = bool(manifest) and not changed and not removed
+        print(f"Incremental: {len(plan) - len(changed)} unchanged, "
+              f"{len(changed)} to convert, {removed} removed")
+        
+        self._manifest_records = []
+        return self._iter_incremental(plan, changed, previous_output)
     
-    def process_directory_with_progress(self, dir_path: Path, recursive: bool = True) -> List[str]:
-        """Process all .mdc files in a directory with progress tracking."""
-        pattern = "**/*.mdc" if recursive else "*.mdc"
-        mdc_files = sorted(dir_path.glob(pattern))
+    def _iter_incremental(self, plan: List[Tuple[Path, Optional[os.stat_result], Optional[Dict[str, Any]]]],
+                          changed: List[Path], previous_output: str) -> Iterator[str]:
+        """Yield sections for an incremental plan, recording manifest entries as it goes."""
+        converted = self.iter_processed_files(changed)
+        for mdc_file, st, record in plan:
+            if record is not None:
+                section = None
+                if record['offset'] is not None:
+                    section = previous_output[record['offset']:record['offset'] + record['length']]
+                self._apply_file_result(mdc_file, {
+                    'output': section,
+                    'stats': record['stats'],
+                    'errors': record['errors'],
+                    'processed': record['processed'],
+                    'metadata': record.get('metadata'),
+                })
+            else:
+                stats_before = {key: self.stats[key] for key in FILE_COUNTER_KEYS}
+                errors_before = len(self.errors)
+                processed_before = len(self.processed_files)
+                _, section = next(converted)
+                record = {
+                    'mtime_ns': st.st_mtime_ns if st else None,
+                    'size': st.st_size if st else None,
+                    'stats': {key: self.stats[key] - stats_before[key] for key in FILE_COUNTER_KEYS},
+                    'errors': self.errors[errors_before:],
+                    'processed': len(self.processed_files) > processed_before,
+                    'metadata': self.file_metadata.get(str(mdc_file)),
+                }
+            length = len(section) if section is not None else None
+            self._manifest_records.append((str(mdc_file), dict(record), length))
+            if section is not None:
+                yield section
+        converted.close()
+    
+    def write_manifest(self, output_path: Path):
+        """Record where each source's section landed in a freshly written output file."""
+        files: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        for path_key, record, length in self._manifest_records:
+            if length is not None:
+                record['offset'] = offset
+                record['length'] = length
+                # Sections are joined with a blank line in the final output
+                offset += length + 2
+            else:
+                record['offset'] = None
+                record['length'] = 0
+            files[path_key] = record
         
+        try:
+            st = output_path.stat()
+            manifest = {
+                'signature': self.cache_signature(),
+                'output': [st.st_mtime_ns, st.st_size],
+                'files': files,
+            }
+            self.manifest_path_for(output_path).write_text(json.dumps(manifest), encoding='utf-8')
+        except OSError as e:
+            print(f"Warning: Could not write incremental manifest: {e}", file=sys.stderr)
+    
+    def _process_with_progress(self, files: List[Path], labels: List[Any]) -> List[str]:
+        """Process files in order, printing a [X/Y] progress line for each one."""
         results: List[str] = []
-        total = len(mdc_files)
+        total = len(files)
         
         print("")
-        for idx, mdc_file in enumerate(mdc_files, 1):
-            rel_path = mdc_file.relative_to(dir_path)
-            print(f"[{idx}/{total}] Processing: {rel_path}")
-            result: Optional[str] = self.process_file(mdc_file)
+        processed = self.iter_processed_files(files)
+        for idx, label in enumerate(labels, 1):
+            print(f"[{idx}/{total}] Processing: {label}")
+            _, result = next(processed)
             if result is not None:
                 results.append(result)
                 print(f"  ✓ Done")
             else:
                 print(f"  ✗ Failed")
+        processed.close()
         
         return results
     
-    def process_selected_folders_with_progress(self, selected_folders: List[Path]) -> List[str]:
-        """Process .mdc files from selected folders with progress tracking."""
-        results: List[str] = []
+    def process_files_with_progress(self, files: List[Path]) -> List[str]:
+        """Process specific files with progress tracking."""
+        return self._process_with_progress(files, [f.name for f in files])
+    
+    def process_directory_with_progress(self, dir_path: Path, recursive: bool = True,
+                                        mdc_files: Optional[List[Path]] = None) -> List[str]:
+        """
+        Process all .mdc files in a directory with progress tracking.
         
-        # Count total files
-        total = sum(len(self.scanned_folders.get(folder, [])) for folder in selected_folders)
-        current = 0
+        Pass the listing from scan_directory as mdc_files to avoid walking the tree again.
+        """
+        if mdc_files is None:
+            mdc_files = self.find_mdc_files(dir_path, recursive)
         
-        print("")
+        labels = [mdc_file.relative_to(dir_path) for mdc_file in mdc_files]
+        return self._process_with_progress(mdc_files, labels)
+    
+    def process_selected_folders_with_progress(self, selected_folders: List[Path]) -> List[str]:
+        """Process .mdc files from selected folders with progress tracking."""
+        mdc_files: List[Path] = []
         for folder in selected_folders:
             if folder in self.scanned_folders:
-                for mdc_file in self.scanned_folders[folder]:
-                    current += 1
-                    print(f"[{current}/{total}] Processing: {mdc_file.name}")
-                    result: Optional[str] = self.process_file(mdc_file)
-                    if result is not None:
-                        results.append(result)
-                        print(f"  ✓ Done")
-                    else:
-                        print(f"  ✗ Failed")
+                mdc_files.extend(self.scanned_folders[folder])
         
-        return results
+        return self._process_with_progress(mdc_files, [f.name for f in mdc_files])
     
     def convert(self, input_path: Path, output_path: Optional[Path] = None, 
                 recursive: bool = True, interactive: bool = False,
                 backup_existing: bool = True, dry_run: bool = False,
-                show_stats: bool = False) -> bool:
+                show_stats: bool = False, incremental: bool = False,
+                announce_overwrite: bool = True) -> bool:
         """
         Main conversion function.
         
@@ -688,6 +3208,8 @@ class CursorRuleConverter:
             backup_existing: Create backup of existing output file before overwriting
             dry_run: Preview conversion without writing files
             show_stats: Display detailed statistics after conversion
+            incremental: Reuse the previous output for unchanged files (needs output_path)
+            announce_overwrite: Say so when an existing output is replaced without a backup
             
         Returns:
             True if successful, False otherwise
@@ -716,7 +3238,8 @@ class CursorRuleConverter:
             
             # Backup the repo before converting
             if output_path and not dry_run:
-                self.backup_repo(cloned_path, output_path)
+                owner_and_repo = re.split(r'[/:]', normalize_github_url(str(input_path))[:-4])[-2:]
+                self.backup_repo(cloned_path, output_path, '_'.join(owner_and_repo))
             
             input_path = cloned_path
             # Force interactive mode for repos
@@ -726,15 +3249,30 @@ class CursorRuleConverter:
             print(f"Error: {input_path} does not exist", file=sys.stderr)
             return False
         
-        # Collect all converted content
-        converted_content: List[str] = []
+        if incremental and (output_path is None or interactive):
+            print("Warning: --incremental needs an output file and is ignored in interactive mode",
+                  file=sys.stderr)
+            incremental = False
+        if incremental and not self.supports_incremental():
+            # Unchanged outputs and shards are still never rewritten
+            print("Warning: --incremental only works with Copilot output without --shard, --compact, "
+                  "--max-tokens, --dedupe or --sink; converting every file", file=sys.stderr)
+            incremental = False
+        
+        # Converted sections; non-interactive paths produce them lazily so they
+        # can be streamed straight to the output
+        converted_content: Iterable[str] = []
         
         if input_path.is_file():
-            result = self.process_file(input_path)
-            if result:
-                converted_content.append(result)
+            if incremental:
+                converted_content = self.process_files_incremental([input_path], output_path)
+            else:
+                converted_content = self.iter_converted([input_path])
         elif input_path.is_dir():
-            if interactive:
+            if incremental:
+                converted_content = self.process_files_incremental(
+                    self.find_mdc_files(input_path, recursive), output_path)
+            elif interactive:
                 # Scan and let user choose
                 print(f"Scanning for Cursor Rules in {input_path}...\n")
                 folders = self.scan_directory(input_path, recursive)
@@ -784,7 +3322,8 @@ class CursorRuleConverter:
                     return False
                 elif choice == 'all':
                     print(f"\nConverting all {total_files} file(s)...")
-                    converted_content = self.process_directory_with_progress(input_path, recursive)
+                    converted_content = self.process_directory_with_progress(
+                        input_path, recursive, self.scanned_files)
                 elif choice == 'folders':
                     if not folder_files:
                         print("No folder files to convert.", file=sys.stderr)
@@ -816,35 +3355,87 @@ class CursorRuleConverter:
                         print(f"Invalid selection: {e}", file=sys.stderr)
                         return False
             else:
-                converted_content = self.process_directory(input_path, recursive)
+                converted_content = self.iter_converted(self.find_mdc_files(input_path, recursive))
         else:
             print(f"Error: {input_path} is not a file or directory", file=sys.stderr)
             return False
         
+        return self._write_converted(converted_content, output_path, backup_existing=backup_existing,
+                                     dry_run=dry_run, show_stats=show_stats, incremental=incremental,
+                                     announce_overwrite=announce_overwrite)
+    
+    def _write_converted(self, converted_content: Iterable[str], output_path: Optional[Path],
+                         backup_existing: bool = True, dry_run: bool = False,
+                         show_stats: bool = False, incremental: bool = False,
+                         announce_overwrite: bool = True) -> bool:
+        """
+        Stream converted sections to the output, then report, back up and replace it.
+        
+        Args:
+            converted_content: Converted sections, consumed lazily
+            output_path: Output file path (if None, prints to stdout)
+            backup_existing: Create backup of existing output file before overwriting
+            dry_run: Consume the sections without writing anything
+            show_stats: Display detailed statistics afterwards
+            incremental: Write the incremental manifest (or skip an unchanged output)
+            announce_overwrite: Say so when an existing output is replaced without a backup
+            
+        Returns:
+            True if anything was converted, False otherwise
+        """
+        # Stream sections to their destination as they are produced
+        from datetime import datetime as dt
+        tmp_path: Optional[Path] = None
+        # Sinks get the sections as rendered, before deduplication and compaction
+        sink_sections: List[str] = []
+        if self.sinks:
+            converted_content = self._tee_sections(converted_content, sink_sections)
+        if self.rule_index is not None:
+            converted_content = self.dedupe_sections(converted_content)
+        if self.compactor is not None:
+            converted_content = self.compactor.compact(converted_content)
+        layout = {'head': self.renderer.head, 'separator': self.renderer.separator, 'tail': self.renderer.tail}
+        if dry_run or (incremental and self.manifest_unchanged):
+            section_count, output_chars = self.write_sections(converted_content, lambda text: None, **layout)
+        elif output_path and self.shard_by:
+            section_count, output_chars = self.write_shards(converted_content, output_path, backup_existing)
+        elif output_path:
+            tmp_path, section_count, output_chars = self._write_sections_to_temp(
+                converted_content, output_path, **layout)
+            self.stats['output_status'] = 'written' if tmp_path is not None else 'unchanged'
+        else:
+            section_count, output_chars = self.write_sections(converted_content,
+                                                              self._timed_write(sys.stdout.write), **layout)
+            if section_count:
+                sys.stdout.write("\n")
+        self.stats['end_time'] = dt.now()
+        if self.compactor is not None:
+            self.stats['phases']['compact'] += self.compactor.seconds
+            self.compactor.seconds = 0.0
+            budget = self.compactor.max_tokens
+            dropped = sum(self.compactor.dropped.values())
+            if dropped:
+                print(f"Note: Left out {dropped} lower-severity rule(s) to fit the {budget}-token budget",
+                      file=sys.stderr)
+            if budget is not None and self.compactor.tokens_after > budget:
+                print(f"Warning: Output is still about {self.compactor.tokens_after} tokens, "
+                      f"over the {budget}-token budget", file=sys.stderr)
+        
+        if self._owns_cache and not dry_run:
+            self.cache.save()
+        
         # Report errors
         if self.errors:
             print("\nErrors encountered:", file=sys.stderr)
             for error in self.errors:
                 print(f"  - {error}", file=sys.stderr)
         
-        # Build final output
-        if not converted_content:
+        if not section_count:
+            if tmp_path is not None:
+                tmp_path.unlink()
             print("No content was converted", file=sys.stderr)
             return False
         
-        # Add header
-        header = """# VS Code Copilot Instructions
-<!-- Generated from Cursor Rules -->
-
-"""
-        
-        final_content = header + "\n".join(converted_content)
-        
-        # Write output
-        from datetime import datetime as dt
-        final_content = "\n\n".join(converted_content)
-        self.stats['end_time'] = dt.now()
-        
         if dry_run:
             print("\n" + "="*70)
             print("DRY RUN RESULTS")
@@ -852,9 +3443,11 @@ class CursorRuleConverter:
             print(f"\nWould convert {len(self.processed_files)} file(s)")
             if output_path:
                 print(f"Would write to: {output_path}")
-                print(f"Output size: {len(final_content)} characters ({len(final_content)/1024:.2f} KB)")
+                print(f"Output size: {output_chars} characters ({output_chars/1024:.2f} KB)")
             else:
                 print("Would write to: stdout")
+            for sink in self.sinks:
+                print(f"Would also write {sink.kind}: {sink.path or 'next to each source'}")
             
             if self.errors:
                 print(f"\nErrors encountered: {len(self.errors)}")
@@ -862,43 +3455,1070 @@ class CursorRuleConverter:
                     print(f"  - {error}")
                 if len(self.errors) > 5:
                     print(f"  ... and {len(self.errors) - 5} more")
-        elif output_path:
+        elif output_path and incremental and self.manifest_unchanged:
+            print(f"\nOutput is up to date: {output_path}")
+        elif output_path and self.shard_by:
+            shards = self.stats['shards']
+            print(f"\nSuccessfully converted {len(self.processed_files)} file(s)")
+            print(f"Instructions written to: {output_path} ({shards['written']} written, "
+                  f"{shards['unchanged']} unchanged, {shards['removed']} removed)")
+        elif output_path and self.stats['output_status'] == 'unchanged':
+            # Leave the file and its mtime alone so watchers and editors see no change
+            if incremental:
+                self.write_manifest(output_path)
+            print(f"\nSuccessfully converted {len(self.processed_files)} file(s)")
+            print(f"Output unchanged: {output_path}")
+        elif output_path and tmp_path is not None:
             # Handle backup if file exists
             if output_path.exists() and backup_existing:
-                # Create backup directory next to the output file
-                backup_dir = output_path.parent / '.backups'
-                backup_dir.mkdir(exist_ok=True)
-                
-                # Create backup filename with timestamp
-                timestamp = dt.now().strftime('%Y%m%d_%H%M%S')
-                backup_filename = f"{output_path.stem}_{timestamp}{output_path.suffix}"
-                backup_path = backup_dir / backup_filename
-                
-                # Copy existing file to backup location
-                shutil.copy2(output_path, backup_path)
-                print(f"Backup created: {backup_path}")
-            elif output_path.exists() and not backup_existing:
+                # Back up next to the output file, unless the newest backup already has this content
+                store = BackupStore(output_path.parent / '.backups', self.backup_keep,
+                                    self.backup_keep_days, compress=self.backup_compress)
+                backup_path, created = store.backup_file(output_path)
+                if created:
+                    print(f"Backup created: {backup_path}")
+                else:
+                    print(f"Backup unchanged: {backup_path}")
+            elif output_path.exists() and announce_overwrite:
                 print(f"Overwriting existing file: {output_path}")
             
-            output_path.write_text(final_content, encoding='utf-8')
+            started = time.perf_counter()
+            self._replace_output(tmp_path, output_path)
+            self._record_phase('write', started)
+            if incremental:
+                self.write_manifest(output_path)
             print(f"\nSuccessfully converted {len(self.processed_files)} file(s)")
             print(f"Output written to: {output_path}")
+        
+        if self.sinks and not dry_run:
+            # Keep stdout to the converted content when that is the main output
+            with contextlib.redirect_stdout(sys.stdout if output_path else sys.stderr):
+                self.write_sinks(sink_sections, backup_existing)
+        
+        # Show statistics if requested
+        if show_stats:
+            self.print_statistics()
+        
+        # Cleanup temp repo if it was cloned
+        self.cleanup_temp_repo()
+        
+        return True
+    
+    @staticmethod
+    def write_sections(sections: Iterable[str], write: Callable[[str], Any],
+                       head: str = '', separator: str = '\n\n', tail: str = '') -> Tuple[int, int]:
+        """
+        Write converted sections separated by a blank line.
+        
+        Args:
+            sections: Converted markdown sections, consumed lazily
+            write: Callable receiving each chunk of text
+            head: Text before the first section (only written if there is one)
+            separator: Text between sections
+            tail: Text after the last section (only written if there is one)
+            
+        Returns:
+            Tuple of (number of sections, number of characters written)
+        """
+        count = 0
+        chars = 0
+        for section in sections:
+            if count:
+                write(separator)
+                chars += len(separator)
+            elif head:
+                write(head)
+                chars += len(head)
+            write(section)
+            chars += len(section)
+            count += 1
+        if count and tail:
+            write(tail)
+            chars += len(tail)
+        return count, chars
+    
+    def _write_sections_to_temp(self, sections: Iterable[str], output_path: Path,
+                                **layout: str) -> Tuple[Optional[Path], int, int]:
+        """
+        Stream sections into a temporary file next to the output.
+        
+        While the stream matches the existing output it is only compared
+        against it, and the temporary file is started (with the matching
+        prefix) at the first difference. If the whole stream matches, no
+        file is written at all. layout holds the head, separator and tail
+        arguments of write_sections.
+        
+        Returns:
+            Tuple of (temporary file path, or None if the output already has
+            exactly this content, number of sections, characters written)
+        """
+        try:
+            existing = open(output_path, 'r', encoding='utf-8', newline='')
+        except OSError:
+            existing = None
+        out = None
+        tmp_name = None
+        matched = 0
+        # Newlines are translated here, so the comparison sees what the file would contain
+        linesep = os.linesep
+        
+        def diverge():
+            nonlocal out, tmp_name
+            import tempfile
+            # Next to the file a symlinked output points to, so the final rename stays on its filesystem
+            target = os.path.realpath(output_path)
+            fd, tmp_name = tempfile.mkstemp(dir=os.path.dirname(target),
+                                            prefix=f".{os.path.basename(target)}.", suffix='.tmp')
+            out = open(fd, 'w', encoding='utf-8', newline='', buffering=OUTPUT_BUFFER_SIZE)
+            if matched:
+                existing.seek(0)
+                out.write(existing.read(matched))
+        
+        def write(text: str):
+            nonlocal matched
+            if linesep != '\n':
+                text = text.replace('\n', linesep)
+            if out is None:
+                try:
+                    same = existing is not None and existing.read(len(text)) == text
+                except (OSError, UnicodeDecodeError):
+                    same = False
+                if same:
+                    matched += len(text)
+                    return
+                diverge()
+            out.write(text)
+        
+        try:
+            count, chars = self.write_sections(sections, self._timed_write(write), **layout)
+            if out is None:
+                started = time.perf_counter()
+                try:
+                    at_end = existing is not None and existing.read(1) == ''
+                except (OSError, UnicodeDecodeError):
+                    at_end = False
+                if not at_end:
+                    diverge()
+                self._record_phase('write', started)
+            if out is not None:
+                out.close()
+        except BaseException:
+            if out is not None:
+                out.close()
+                os.unlink(tmp_name)
+            raise
+        finally:
+            if existing is not None:
+                existing.close()
+        return (Path(tmp_name) if tmp_name else None), count, chars
+    
+    def dedupe_sections(self, sections: Iterable[str]) -> Iterator[str]:
+        """
+        Replace rules already emitted by an earlier file with a reference to it.
+        
+        Rules are matched by id through rule_index. An exact duplicate (same
+        normalized description and severity) is reduced to its heading and a
+        pointer to the first source; a rule that reuses an id with a
+        different definition is kept, marked as a conflict and reported in
+        errors.
+        
+        Args:
+            sections: Converted sections; the n-th one belongs to processed_files[n]
+            
+        Yields:
+            Sections with duplicates replaced, one per input section
+        """
+        index = self.rule_index
+        for number, section in enumerate(sections):
+            source = self.processed_files[number]
+            metadata = self.file_metadata.get(str(source), {})
+            if metadata.get('rules'):
+                # The spans are only needed once; drop them so memory does not grow with the output
+                self.file_metadata[str(source)] = {key: value for key, value in metadata.items() if key != 'rules'}
+            edits = []
+            for rule_id, digest, severity, start, end in metadata.get('rules') or ():
+                kind, first = index.add(rule_id, digest, severity, number)
+                if kind == 'new':
+                    continue
+                first_label = self._source_label(self.processed_files[first])
+                if first == number:
+                    first_label = 'this file'
+                heading = f"### {rule_id}\n\n**Severity:** `{severity}`\n\n"
+                if kind == 'duplicate':
+                    edits.append((start, end, f"{heading}Same rule as in {first_label}.\n"))
+                else:
+                    self.errors.append(f"Conflicting definitions of rule {rule_id}: "
+                                       f"{source} differs from {self.processed_files[first]}")
+                    note = f"> **Conflict:** {first_label} defines `{rule_id}` differently.\n\n"
+                    insert_at = start + len(heading)
+                    edits.append((insert_at, insert_at, note))
+            # Apply from the end so earlier offsets stay valid
+            for start, end, text in reversed(edits):
+                section = section[:start] + text + section[end:]
+            yield section
+        self.stats['rule_index'] = index.summary()
+    
+    @staticmethod
+    def _source_label(path: Path) -> str:
+        """Short, readable name for a source file in cross-references."""
+        try:
+            return f"`{path.relative_to(Path.cwd()).as_posix()}`"
+        except ValueError:
+            return f"`{path.name}`"
+    
+    def write_shards(self, sections: Iterable[str], output_dir: Path, backup_existing: bool = True,
+                     shard_by: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Write converted sections as .instructions.md files plus an index.
+        
+        Sections are grouped per source file, or per applyTo scope when
+        shard_by is 'glob'. Each shard starts with an applyTo header built
+        from the sources' globs. Shards whose content is unchanged are left
+        alone, and shards written by an earlier run that no longer have any
+        source are removed.
+        
+        Args:
+            sections: Converted sections; the n-th one belongs to processed_files[n]
+            output_dir: Directory for the shards (created if missing)
+            backup_existing: Back up shards before overwriting them
+            shard_by: 'file' or 'glob' (defaults to self.shard_by)
+            
+        Returns:
+            Tuple of (number of sections, characters written)
+        """
+        shard_by = shard_by or self.shard_by
+        groups: Dict[str, Dict[str, Any]] = {}
+        section_count = 0
+        for section in sections:
+            source = self.processed_files[section_count]
+            section_count += 1
+            metadata = self.file_metadata.get(str(source), {})
+            key = str(source) if shard_by == 'file' else str(metadata.get('apply_to'))
+            group = groups.setdefault(key, {'apply_to': metadata.get('apply_to'), 'sources': [], 'sections': []})
+            group['sources'].append(source)
+            group['sections'].append(InstructionsRenderer.body(section))
+            if shard_by == 'file':
+                group['description'] = metadata.get('description')
+        if not section_count:
+            return 0, 0
+        
+        # Name shards after the source path (below the sources' common directory) or the globs
+        root = Path(os.path.commonpath([str(source.parent) for source in self.processed_files]))
+        names: Set[str] = set()
+        for group in groups.values():
+            if shard_by == 'file':
+                base = group['sources'][0].relative_to(root).with_suffix('').as_posix()
+            else:
+                base = group['apply_to'] or 'general'
+            base = re.sub(r'\W+', '-', base).strip('-').lower() or 'rules'
+            name = base
+            counter = 2
+            while name in names:
+                name = f"{base}-{counter}"
+                counter += 1
+            names.add(name)
+            group['file'] = name + SHARD_SUFFIX
+        
+        output_dir.mkdir(parents=True, exist_ok=True)
+        counts = {'written': 0, 'unchanged': 0, 'removed': 0}
+        output_chars = 0
+        index_rows = []
+        for group in groups.values():
+            header = InstructionsRenderer.header(group.get('description'), group['apply_to'])
+            content = header + '\n\n' + '\n\n'.join(group['sections']) + '\n'
+            output_chars += len(content)
+            if self._write_shard(output_dir / group['file'], content, backup_existing):
+                counts['written'] += 1
+            else:
+                counts['unchanged'] += 1
+            sources = ', '.join(f"`{source.relative_to(root).as_posix()}`" for source in group['sources'])
+            index_rows.append(f"| [{group['file']}]({group['file']}) | "
+                              f"`{group['apply_to'] or '(manual)'}` | {sources} |")
+        
+        index = ("# Copilot Instructions Index\n\n"
+                 "| Instructions | Applies To | Sources |\n"
+                 "|--------------|------------|---------|\n" + '\n'.join(index_rows) + '\n')
+        self._write_shard(output_dir / SHARD_INDEX, index, backup_existing=False)
+        
+        # Remove shards this converter wrote earlier that no longer have a source
+        manifest_path = output_dir / SHARD_MANIFEST
+        current = sorted(group['file'] for group in groups.values())
+        try:
+            previous = json.loads(manifest_path.read_text(encoding='utf-8')).get('shards', [])
+        except (OSError, ValueError):
+            previous = []
+        for name in set(previous) - set(current):
+            stale = output_dir / name
+            if name.endswith(SHARD_SUFFIX) and '/' not in name and stale.is_file():
+                stale.unlink()
+                counts['removed'] += 1
+        if previous != current:
+            try:
+                manifest_path.write_text(json.dumps({'shards': current}), encoding='utf-8')
+            except OSError as e:
+                print(f"Warning: Could not write shard list {manifest_path}: {e}", file=sys.stderr)
+        
+        self.stats['shards'] = counts
+        self.stats['output_status'] = 'written' if counts['written'] or counts['removed'] else 'unchanged'
+        return section_count, output_chars
+    
+    @staticmethod
+    def _tee_sections(sections: Iterable[str], kept: List[str]) -> Iterator[str]:
+        """Yield sections unchanged, keeping each one in kept."""
+        for section in sections:
+            kept.append(section)
+            yield section
+    
+    def write_sinks(self, sections: List[str], backup_existing: bool = True):
+        """
+        Write every --sink output from sections already rendered in this run.
+        
+        Sinks in the main format reuse its sections; the others use the
+        sections rendered for extra_formats from the same parse. Files whose
+        content is unchanged are not rewritten. Each sink's write time is
+        printed and kept in stats['sinks'].
+        
+        Args:
+            sections: Sections in self.renderer's format; the n-th one belongs to processed_files[n]
+            backup_existing: Back up files before overwriting them
+        """
+        sources = self.processed_files[:len(sections)]
+        for sink in self.sinks:
+            started = time.perf_counter()
+            # Sinks are reused by every rebuild in watch mode
+            sink.written = sink.unchanged = 0
+            if sink.format == self.renderer.name:
+                texts = sections
+            else:
+                texts = [self.file_metadata[str(source)]['renders'][sink.format] for source in sources]
+            try:
+                if sink.kind == 'shard':
+                    # Keep the main output's shard counts
+                    shards, status = self.stats['shards'], self.stats['output_status']
+                    self.write_shards(texts, sink.path, backup_existing, shard_by=self.shard_by or 'file')
+                    sink.written = self.stats['shards']['written']
+                    sink.unchanged = self.stats['shards']['unchanged']
+                    self.stats['shards'], self.stats['output_status'] = shards, status
+                elif sink.kind == 'per-file':
+                    root = Path(os.path.commonpath([str(source.parent) for source in sources]))
+                    suffix = RENDERERS['copilot'].suffix
+                    for source, text in zip(sources, texts):
+                        if sink.path is None:
+                            path = source.with_name(source.stem + suffix)
+                        else:
+                            path = sink.path / source.parent.relative_to(root) / (source.stem + suffix)
+                            path.parent.mkdir(parents=True, exist_ok=True)
+                        if self._write_shard(path, text, backup_existing):
+                            sink.written += 1
+                        else:
+                            sink.unchanged += 1
+                else:
+                    renderer = RENDERERS[sink.format]
+                    sink.path.parent.mkdir(parents=True, exist_ok=True)
+                    content = renderer.head + renderer.separator.join(texts) + renderer.tail
+                    if self._write_shard(sink.path, content, backup_existing):
+                        sink.written += 1
+                    else:
+                        sink.unchanged += 1
+            except OSError as e:
+                error_msg = f"Could not write {sink.kind} output {sink.path}: {e}"
+                print(f"Error: {error_msg}", file=sys.stderr)
+                self.errors.append(error_msg)
+            sink.seconds = time.perf_counter() - started
+            print(f"Also written ({sink.kind}): {sink.path or 'next to each source'} "
+                  f"({sink.written} written, {sink.unchanged} unchanged, {sink.seconds * 1000:.1f} ms)")
+        self.stats['sinks'] = [sink.to_dict() for sink in self.sinks]
+    
+    def _write_shard(self, path: Path, content: str, backup_existing: bool) -> bool:
+        """Write one shard unless it already has this content; returns whether it was written."""
+        tmp_path, _, _ = self._write_sections_to_temp([content], path)
+        if tmp_path is None:
+            return False
+        if backup_existing and path.exists():
+            store = BackupStore(path.parent / '.backups', self.backup_keep,
+                                self.backup_keep_days, compress=self.backup_compress)
+            store.backup_file(path)
+        started = time.perf_counter()
+        self._replace_output(tmp_path, path)
+        self._record_phase('write', started)
+        return True
+    
+    @staticmethod
+    def _replace_output(tmp_path: Path, output_path: Path):
+        """Atomically move a finished temporary file over the output path (or the file it links to)."""
+        target = os.path.realpath(output_path)
+        if os.path.exists(target):
+            shutil.copymode(target, tmp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, target)
+
+
+def _process_file_worker(args: Tuple[Path, bool, str, Tuple[str, ...], bool]) -> Dict[str, Any]:
+    """
+    Convert one file in a worker process.
+    
+    Runs a fresh converter so the parent can merge the per-file stats and
+    errors back in a deterministic order.
+    
+    Args:
+        args: Tuple of (file path, verbose flag, output format, extra formats for sinks,
+            whether to keep rule spans for --dedupe)
+        
+    Returns:
+        Dictionary with the converted output, stats deltas, errors,
+        whether the file was processed successfully, its metadata and its
+        phase timings
+    """
+    file_path, verbose, output_format, extra_formats, dedupe = args
+    converter = CursorRuleConverter(verbose=verbose, output_format=output_format, dedupe=dedupe)
+    converter.extra_formats = extra_formats
+    output = converter.process_file(file_path)
+    stats = {key: converter.stats[key] for key in FILE_COUNTER_KEYS}
+    return {
+        'output': output,
+        'stats': stats,
+        'errors': converter.errors,
+        'processed': bool(converter.processed_files),
+        'metadata': converter.file_metadata.get(str(file_path)),
+        'timings': converter.file_timings.get(str(file_path)),
+    }
+
+
+def load_merged_config(preset: Optional[str] = None,
+                       config_file: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load preset and configuration file settings.
+    
+    Args:
+        preset: Preset name (dev, prod, preview) or None
+        config_file: Explicit config file path; if omitted and no preset is
+            given, .convertmdcrc in the current or home directory is used
+            
+    Returns:
+        Merged configuration (config file overrides preset)
+    """
+    # Load preset configuration if specified
+    preset_config = {}
+    if preset:
+        preset_file = Path(__file__).parent / f".convertmdcrc.{preset}"
+        if preset_file.exists():
+            print(f"Loading preset: {preset}")
+            preset_config = CursorRuleConverter.load_config(preset_file)
+        else:
+            print(f"Warning: Preset '{preset}' not found, using defaults", file=sys.stderr)
+    
+    # Load configuration file if specified
+    # If preset is used, only load user config if --config is explicitly specified
+    config = {}
+    if config_file:
+        config = CursorRuleConverter.load_config(Path(config_file))
+    elif not preset:
+        # Only auto-load .convertmdcrc if no preset is specified
+        config = CursorRuleConverter.load_config(None)
+    
+    return {**preset_config, **config}
+
+
+def converter_options(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate output, retention and statistics settings for a converter.
+    
+    The command line, --serve requests and --batch all go through here, so
+    the same settings are accepted (or rejected) everywhere.
+    
+    Args:
+        settings: Merged settings using the config file keys (format, shard,
+            compact, max_tokens, dedupe, sinks, backup_keep, backup_keep_days,
+            backup_compress, slowest); other keys are ignored
+    
+    Returns:
+        CursorRuleConverter keyword arguments
+    
+    Raises:
+        ValueError: For an unknown format, shard mode or sink, or settings
+            that cannot be combined
+    """
+    output_format = settings.get('format') or 'copilot'
+    shard_by = settings.get('shard')
+    max_tokens = settings.get('max_tokens')
+    compact = bool(settings.get('compact', False)) or max_tokens is not None
+    dedupe = bool(settings.get('dedupe', False))
+    backup_keep = settings.get('backup_keep', DEFAULT_BACKUP_KEEP)
+    backup_keep_days = settings.get('backup_keep_days')
+    if max_tokens is not None and max_tokens < 1:
+        raise ValueError("--max-tokens must be a positive integer")
+    if output_format not in RENDERERS:
+        raise ValueError(f"format must be one of: {', '.join(RENDERERS)}")
+    specs = settings.get('sinks') or []
+    if not isinstance(specs, list):
+        raise ValueError("sinks must be a list")
+    sinks = [OutputSink.parse(str(spec)) for spec in specs]
+    if shard_by not in (None, 'file', 'glob'):
+        raise ValueError("shard must be 'file' or 'glob'")
+    if output_format != 'copilot' and (compact or dedupe):
+        raise ValueError("--compact, --max-tokens and --dedupe only work with --format copilot")
+    if shard_by and output_format not in ('copilot', 'instructions'):
+        raise ValueError(f"--shard writes .instructions.md files and cannot be used with --format {output_format}")
+    if shard_by:
+        # Shards are already .instructions.md files built from the Copilot layout
+        output_format = 'copilot'
+    if backup_keep < 0 or (backup_keep_days is not None and backup_keep_days < 0):
+        raise ValueError("--backup-keep and --backup-keep-days must be 0 or more")
+    return {
+        'output_format': output_format,
+        'sinks': sinks,
+        'shard_by': shard_by,
+        'compact': compact,
+        'max_tokens': max_tokens,
+        'dedupe': dedupe,
+        'slowest_count': settings.get('slowest', 5),
+        'backup_keep': backup_keep,
+        'backup_keep_days': backup_keep_days,
+        'backup_compress': bool(settings.get('backup_compress', False)),
+    }
+
+
+def check_output_target(options: Dict[str, Any], single_file: bool, has_output: bool):
+    """
+    Check that converter_options() fit the input and output of one conversion.
+    
+    Args:
+        options: Result of converter_options()
+        single_file: Whether the input is a single .mdc file
+        has_output: Whether an OUTPUT path was given
+    
+    Raises:
+        ValueError: If the format needs a single input file, or --shard an OUTPUT directory
+    """
+    if options['shard_by']:
+        if not has_output:
+            raise ValueError("--shard needs an OUTPUT directory, e.g. .github/instructions")
+    elif not RENDERERS[options['output_format']].combinable and not single_file:
+        raise ValueError(f"--format {options['output_format']} writes one file per source; add --shard to "
+                         "write an OUTPUT directory of them")
+
+
+def normalize_batch_entries(entries: List[Any]) -> List[Dict[str, Optional[str]]]:
+    """
+    Normalize batch entries to {'input': ..., 'output': ...} dictionaries.
+    
+    Accepts objects with input/output keys, [input, output] pairs, or bare
+    input strings (converted output goes to the entry's log).
+    
+    Raises:
+        ValueError: If an entry has no usable input
+    """
+    normalized: List[Dict[str, Optional[str]]] = []
+    for idx, entry in enumerate(entries, 1):
+        if isinstance(entry, str):
+            input_value, output_value = entry, None
+        elif isinstance(entry, (list, tuple)) and 1 <= len(entry) <= 2:
+            input_value = entry[0]
+            output_value = entry[1] if len(entry) == 2 else None
+        elif isinstance(entry, dict):
+            input_value, output_value = entry.get('input'), entry.get('output')
+        else:
+            raise ValueError(f"Batch entry {idx} must be an object, a pair or a string")
+        if not isinstance(input_value, str) or not input_value:
+            raise ValueError(f"Batch entry {idx} has no input path")
+        normalized.append({'input': input_value, 'output': output_value or None})
+    return normalized
+
+
+def load_batch_manifest(text: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Parse a batch manifest.
+    
+    The manifest is either JSON (a list of entries, or an object with an
+    ``entries`` list) or plain text with one ``INPUT<TAB>OUTPUT`` pair per
+    line. Blank lines and lines starting with # are ignored.
+    
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+        entries: List[Any] = []
+        for line in text.splitlines():
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            entries.append(line.rstrip('\r\n').split('\t', 1))
+    if data is not None:
+        entries = data.get('entries') if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise ValueError("JSON manifest must be a list of entries or contain an 'entries' list")
+    return normalize_batch_entries(entries)
+
+
+class RPCError(Exception):
+    """Error returned to a JSON-RPC client."""
+    
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class ConverterServer:
+    """
+    Resident converter speaking JSON-RPC 2.0 over stdin/stdout.
+    
+    Each request is one JSON object per line and each response is written as
+    one line. Anything the converter prints while handling a request is
+    captured and returned in the result's ``log`` field, and file descriptor
+    1 is pointed at stderr so stray output (including from --jobs workers)
+    can never corrupt the protocol stream.
+    """
+    
+    PARSE_ERROR = -32700
+    INVALID_REQUEST = -32600
+    METHOD_NOT_FOUND = -32601
+    INVALID_PARAMS = -32602
+    INTERNAL_ERROR = -32603
+    
+    def __init__(self, jobs: int = 1, cache_dir: Optional[Path] = None,
+                 cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 scanner: Optional[DirectoryScanner] = None,
+                 settings: Optional[Dict[str, Any]] = None):
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        # Command-line settings (format, shard, ...); a request's own params override them,
+        # and they override the request's preset and config file
+        self.settings: Dict[str, Any] = dict(settings or {})
+        # Shared by every request so unchanged trees are not walked again
+        self.scanner = scanner or DirectoryScanner(cache_listings=True)
+        self.running = False
+        self.methods = {
+            'convert': self.rpc_convert,
+            'preview': self.rpc_preview,
+            'validate': self.rpc_validate,
+            'batch': self.rpc_batch,
+            'version': self.rpc_version,
+            'shutdown': self.rpc_shutdown,
+        }
+    
+    def _new_converter(self, verbose: bool = False, use_cache: bool = True,
+                       **options: Any) -> CursorRuleConverter:
+        return CursorRuleConverter(verbose=verbose, jobs=self.jobs,
+                                   cache_dir=self.cache_dir if use_cache else None,
+                                   cache_max_bytes=self.cache_max_bytes,
+                                   scanner=self.scanner, **options)
+    
+    def _options(self, params: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """Converter options from the request params, the command line and the config, in that order."""
+        try:
+            return converter_options({**config, **self.settings, **params})
+        except (TypeError, ValueError) as e:
+            raise RPCError(self.INVALID_PARAMS, str(e))
+    
+    @staticmethod
+    def _input_path(params: Dict[str, Any]) -> Path:
+        value = params.get('input')
+        if not isinstance(value, str) or not value:
+            raise RPCError(ConverterServer.INVALID_PARAMS, "'input' must be a non-empty string")
+        return Path(value)
+    
+    @staticmethod
+    def _summary(converter: CursorRuleConverter) -> Dict[str, Any]:
+        return {
+            'stats': {key: converter.stats[key] for key in FILE_COUNTER_KEYS},
+            'phases': dict(converter.stats['phases']),
+            'output_status': converter.stats['output_status'],
+            'sinks': converter.stats['sinks'],
+            'errors': converter.errors,
+            'processed_files': [str(f) for f in converter.processed_files],
+        }
+    
+    def rpc_convert(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a full conversion, equivalent to the command line."""
+        input_value = params.get('input')
+        if isinstance(input_value, str) and CursorRuleConverter().is_github_url(input_value):
+            raise RPCError(self.INVALID_PARAMS, "GitHub repositories need interactive mode and are not supported by --serve")
+        input_path = self._input_path(params)
+        
+        config = load_merged_config(params.get('preset'), params.get('config'))
+        options = self._options(params, config)
+        output = params.get('output')
+        try:
+            check_output_target(options, input_path.is_file(), bool(output))
+        except ValueError as e:
+            raise RPCError(self.INVALID_PARAMS, str(e))
+        converter = self._new_converter(
+            verbose=params.get('verbose', config.get('verbose', False)),
+            use_cache=params.get('cache', config.get('cache', True)),
+            **options)
+        success = converter.convert(
+            input_path,
+            Path(output) if output else None,
+            recursive=params.get('recursive', True),
+            backup_existing=params.get('backup', True),
+            dry_run=params.get('dry_run', config.get('dry_run', False)),
+            show_stats=params.get('show_stats', config.get('show_stats', False)),
+            incremental=params.get('incremental', config.get('incremental', False)),
+        )
+        return {'success': success, **self._summary(converter)}
+    
+    def rpc_batch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert many input/output pairs in this process.
+        
+        Params are the same as for convert, except that ``entries`` replaces
+        ``input``/``output`` and ``sinks`` is rejected, since every entry would
+        overwrite the same sink outputs. Entries share one cache that is saved
+        once at the end. Each entry's output is captured separately.
+        
+        Returns:
+            Per-entry status plus succeeded/failed counts
+        """
+        entries = params.get('entries')
+        if not isinstance(entries, list):
+            raise RPCError(self.INVALID_PARAMS, "'entries' must be a list")
+        try:
+            entries = normalize_batch_entries(entries)
+        except ValueError as e:
+            raise RPCError(self.INVALID_PARAMS, str(e))
+        
+        config = load_merged_config(params.get('preset'), params.get('config'))
+        options = self._options(params, config)
+        if options['sinks']:
+            raise RPCError(self.INVALID_PARAMS, "sinks cannot be used in batch mode; give each entry its own output")
+        for entry in entries:
+            try:
+                check_output_target(options, Path(entry['input']).is_file(), bool(entry['output']))
+            except ValueError as e:
+                raise RPCError(self.INVALID_PARAMS, f"{entry['input']}: {e}")
+        verbose = params.get('verbose', config.get('verbose', False))
+        dry_run = params.get('dry_run', config.get('dry_run', False))
+        shared = self._new_converter(use_cache=params.get('cache', config.get('cache', True)), **options)
+        
+        results: List[Dict[str, Any]] = []
+        for entry in entries:
+            log = io.StringIO()
+            converter = CursorRuleConverter(verbose=verbose, jobs=self.jobs, cache=shared.cache,
+                                            scanner=self.scanner, **options)
+            with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                if converter.is_github_url(entry['input']):
+                    converter.errors.append("GitHub repositories are not supported in batch mode")
+                    success = False
+                else:
+                    try:
+                        success = converter.convert(
+                            Path(entry['input']),
+                            Path(entry['output']) if entry['output'] else None,
+                            recursive=params.get('recursive', True),
+                            backup_existing=params.get('backup', True),
+                            dry_run=dry_run,
+                            show_stats=params.get('show_stats', config.get('show_stats', False)),
+                            incremental=params.get('incremental', config.get('incremental', False)),
+                        )
+                    except Exception as e:
+                        converter.errors.append(f"Error converting {entry['input']}: {e}")
+                        success = False
+            results.append({
+                'input': entry['input'],
+                'output': entry['output'],
+                'success': success,
+                **self._summary(converter),
+                'log': log.getvalue(),
+            })
+        
+        if shared.cache is not None and not dry_run:
+            shared.cache.save()
+        
+        succeeded = sum(1 for result in results if result['success'])
+        return {
+            'success': succeeded == len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'results': results,
+        }
+    
+    def rpc_preview(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert without writing anything and return the generated markdown."""
+        input_path = self._input_path(params)
+        converter = self._new_converter(use_cache=params.get('cache', True))
+        if input_path.is_file():
+            results = converter.process_files([input_path])
+        elif input_path.is_dir():
+            results = converter.process_directory(input_path, params.get('recursive', True))
         else:
-            print(final_content)
+            raise RPCError(self.INVALID_PARAMS, f"{input_path} does not exist")
+        if converter.cache is not None:
+            converter.cache.save()
+        return {'content': "\n\n".join(results), **self._summary(converter)}
+    
+    def rpc_validate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a single .mdc file and report whether it converts cleanly."""
+        input_path = self._input_path(params)
+        converter = self._new_converter(use_cache=False)
+        parsed = converter.parse_mdc_file(input_path)
+        return {
+            'valid': parsed is not None,
+            'rule_count': len(parsed.rules) if parsed else 0,
+            'errors': converter.errors,
+        }
+    
+    def rpc_version(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {'version': __version__}
+    
+    def rpc_shutdown(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.running = False
+        return {}
+    
+    def handle_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """
+        Handle one request line.
         
-        # Show statistics if requested
-        if show_stats:
-            self.print_statistics()
+        Returns:
+            Response object, or None for notifications (requests without an id)
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {'jsonrpc': '2.0', 'id': None,
+                    'error': {'code': self.PARSE_ERROR, 'message': f"Parse error: {e}"}}
         
-        # Cleanup temp repo if it was cloned
-        self.cleanup_temp_repo()
+        request_id = request.get('id') if isinstance(request, dict) else None
+        log = io.StringIO()
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+                raise RPCError(self.INVALID_REQUEST, "Invalid request")
+            method = self.methods.get(request['method'])
+            if method is None:
+                raise RPCError(self.METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            params = request.get('params') or {}
+            if not isinstance(params, dict):
+                raise RPCError(self.INVALID_PARAMS, "params must be an object")
+            
+            # Capture converter output and make sure nothing can prompt on stdin
+            stdin = sys.stdin
+            sys.stdin = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                    result = method(params)
+            finally:
+                sys.stdin = stdin
+            result['log'] = log.getvalue()
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        except RPCError as e:
+            response = {'jsonrpc': '2.0', 'id': request_id,
+                        'error': {'code': e.code, 'message': e.message}}
+        except Exception as e:
+            response = {'jsonrpc': '2.0', 'id': request_id,
+                        'error': {'code': self.INTERNAL_ERROR, 'message': str(e),
+                                  'data': {'log': log.getvalue()}}}
+        
+        if isinstance(request, dict) and 'id' not in request:
+            return None
+        return response
+    
+    def serve_forever(self):
+        """Read requests from stdin until EOF or a shutdown request."""
+        sys.stdout.flush()
+        protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
         
+        self.running = True
+        try:
+            for line in sys.stdin:
+                if not line.strip():
+                    continue
+                response = self.handle_line(line)
+                if response is not None:
+                    protocol_out.write(json.dumps(response) + "\n")
+                    protocol_out.flush()
+                if not self.running:
+                    break
+        finally:
+            protocol_out.close()
+
+
+class _Inotify:
+    """Minimal inotify binding through ctypes; raises OSError or AttributeError where unavailable."""
+    
+    # IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+    # IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    EVENTS = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400 | 0x800
+    
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._ctypes = ctypes
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    
+    def watch(self, path: str):
+        """Watch a directory or file; adding an existing watch again is a no-op."""
+        if self._add_watch(self.fd, os.fsencode(path), self.EVENTS) < 0:
+            error = self._ctypes.get_errno()
+            # The path may have disappeared since it was scanned
+            if error not in (errno.ENOENT, errno.ENOTDIR):
+                raise OSError(error, f"inotify_add_watch failed for {path}: {os.strerror(error)}")
+    
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Block until events arrive or timeout passes, then drain them. Returns True on events."""
+        import select
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    break
+            except BlockingIOError:
+                break
         return True
+    
+    def close(self):
+        os.close(self.fd)
+
+
+class DirectoryWatcher:
+    """
+    Detect changes to the .mdc files under a directory (or to a single file).
+    
+    Changes are found by comparing (mtime, size) snapshots of the scanner's
+    listing. On Linux, inotify wakes the watcher as soon as anything in the
+    tree changes; elsewhere, or when inotify is unavailable or disabled, the
+    tree is polled.
+    """
+    
+    def __init__(self, root: Path, scanner: DirectoryScanner, recursive: bool = True,
+                 use_inotify: bool = True):
+        self.root = root
+        self.scanner = scanner
+        self.recursive = recursive
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify and sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+    
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self._inotify is not None else 'polling'
+    
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Return {path: (mtime_ns, size)} for every watched .mdc file."""
+        if self.root.is_file():
+            files = [self.root]
+            watch_paths = [str(self.root.parent)]
+        else:
+            files = self.scanner.scan(self.root, self.recursive)
+            watch_paths = self.scanner.watched_paths(self.root, self.recursive)
         
-        # Cleanup temp repo if it was cloned
-        self.cleanup_temp_repo()
+        if self._inotify is not None:
+            try:
+                for path in watch_paths:
+                    self._inotify.watch(path)
+            except OSError as e:
+                print(f"Warning: {e}; falling back to polling", file=sys.stderr)
+                self._inotify.close()
+                self._inotify = None
         
-        return True
+        result: Dict[str, Tuple[int, int]] = {}
+        for mdc_file in files:
+            try:
+                st = os.stat(mdc_file)
+            except OSError:
+                continue
+            result[str(mdc_file)] = (st.st_mtime_ns, st.st_size)
+        return result
+    
+    def wait(self, timeout: float):
+        """Sleep until the tree may have changed: an inotify event or the timeout."""
+        if self._inotify is not None:
+            self._inotify.wait(timeout)
+        else:
+            time.sleep(timeout)
+    
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+def watch_directory(input_path: Path, output_path: Path,
+                    new_converter: Callable[[], CursorRuleConverter],
+                    scanner: DirectoryScanner, recursive: bool = True,
+                    debounce: float = DEFAULT_WATCH_DEBOUNCE_MS / 1000,
+                    poll_interval: float = DEFAULT_POLL_INTERVAL,
+                    use_inotify: bool = True, backup_existing: bool = True,
+                    show_stats: bool = False):
+    """
+    Keep output_path up to date with the .mdc files under input_path until interrupted.
+    
+    A rebuild starts once the tree has been quiet for the debounce window,
+    so bursts of saves are coalesced. Only changed files are converted again
+    where the converter supports --incremental; otherwise the conversion
+    cache skips the unchanged ones.
+    
+    Args:
+        input_path: Directory (or single .mdc file) to watch
+        output_path: Combined output file
+        new_converter: Factory returning a fresh converter for each rebuild
+        scanner: Scanner with cached listings, shared by every rebuild
+        recursive: Watch subdirectories too
+        debounce: Seconds without further changes before rebuilding
+        poll_interval: Seconds between polls when inotify is not used
+        use_inotify: Use inotify where available instead of polling
+        backup_existing: Back up an existing output before the first build
+            (rebuilds never create backups)
+        show_stats: Print statistics after each build
+    """
+    watcher = DirectoryWatcher(input_path, scanner, recursive, use_inotify)
+    # inotify wakes us on changes; the timeout only guards against missed events
+    idle_timeout = poll_interval if watcher.backend == 'polling' else poll_interval * 10
+    
+    def rebuild(first: bool):
+        # Only the first build backs up the output; later ones replace it quietly, and not
+        # at all when the rebuilt content is unchanged
+        converter = new_converter()
+        converter.convert(input_path, output_path, recursive=recursive,
+                          backup_existing=backup_existing and first, show_stats=show_stats,
+                          incremental=converter.supports_incremental(), announce_overwrite=first)
+    
+    print(f"Watching {input_path} for .mdc changes ({watcher.backend}, "
+          f"{debounce * 1000:.0f} ms debounce). Press Ctrl+C to stop.")
+    try:
+        snapshot = watcher.snapshot()
+        rebuild(True)
+        while True:
+            watcher.wait(idle_timeout)
+            current = watcher.snapshot()
+            if current == snapshot:
+                continue
+            
+            # Wait until the tree has stopped changing for a whole debounce window
+            while True:
+                time.sleep(debounce)
+                latest = watcher.snapshot()
+                if latest == current:
+                    break
+                current = latest
+            
+            added = current.keys() - snapshot.keys()
+            removed = snapshot.keys() - current.keys()
+            changed = [path for path in current.keys() & snapshot.keys() if current[path] != snapshot[path]]
+            print(f"\n[{time.strftime('%H:%M:%S')}] {len(changed)} changed, {len(added)} added, "
+                  f"{len(removed)} removed - rebuilding {output_path}")
+            snapshot = current
+            rebuild(False)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
 
 
 def main():
@@ -964,6 +4584,18 @@ properly formatted VS Code Copilot Instructions. It handles:
 │                                                                               │
 │ Note: GitHub repos automatically enable interactive mode and create backups  │
 │                                                                               │
+│ Fetch several repositories concurrently into one output:                     │
+│   python convertmdc.py --repo https://github.com/org/a \\                     │
+│       --repo https://github.com/org/b output.md                              │
+│   python convertmdc.py --repos repos.txt --fetch-jobs 8 output.md            │
+│                                                                               │
+│ repos.txt lists one URL per line (# comments allowed). Any URL git can       │
+│ clone works, including file:// paths; only .mdc files are checked out.      │
+│                                                                               │
+│ Repositories are mirrored under <cache-dir>/repos and only re-fetched         │
+│ when the mirror is older than --repo-max-age (default: 1 hour):               │
+│   python convertmdc.py --repo-max-age 0 https://github.com/user/repo out.md   │
+│                                                                               │
 └───────────────────────────────────────────────────────────────────────────────┘
 
 ┌─ Backup & Overwrite ──────────────────────────────────────────────────────────┐
@@ -975,6 +4607,72 @@ properly formatted VS Code Copilot Instructions. It handles:
 │ Overwrite without backup:                                                    │
 │   python convertmdc.py examples/ output.md --no-backup                       │
 │                                                                               │
+│ A backup is skipped when the output is unchanged since the newest one, and   │
+│ identical contents are stored once. Repository backups keep only .mdc files. │
+│ All backups are kept unless you keep only the newest N, drop those older     │
+│ than D days, or gzip them:                                                   │
+│   python convertmdc.py --backup-keep 5 --backup-keep-days 30 \\               │
+│       --backup-compress examples/ output.md                                  │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Sharded Output ──────────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Write one .instructions.md file per source file, each with an applyTo         │
+│ header from its globs, plus an index.md:                                      │
+│   python convertmdc.py --shard examples/ .github/instructions                 │
+│                                                                               │
+│ Group rule files that share the same globs into one file instead:             │
+│   python convertmdc.py --shard-by glob examples/ .github/instructions         │
+│                                                                               │
+│ Unchanged shards are not rewritten; shards whose source is gone are removed.  │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Compaction ──────────────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Drop source metadata and references and collapse repeated rule text:          │
+│   python convertmdc.py --compact examples/ output.md                          │
+│                                                                               │
+│ Also fit the output into a token budget (about 4 characters per token);       │
+│ info rules are left out before warnings, warnings before errors:              │
+│   python convertmdc.py --max-tokens 8000 --stats examples/ output.md          │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Rule Deduplication ──────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Emit a rule id that several files define identically only once; later         │
+│ copies point back to the first file:                                          │
+│   python convertmdc.py --dedupe --stats examples/ output.md                   │
+│                                                                               │
+│ Rules that reuse an id with a different description or severity are kept,     │
+│ marked as conflicts and listed in the statistics errors.                      │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Output Formats ──────────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Render the same parsed rules in another layout:                               │
+│   python convertmdc.py --format json examples/ rules.json                     │
+│   python convertmdc.py --format agents examples/ AGENTS.md                    │
+│   python convertmdc.py --format instructions rule.mdc rule.instructions.md    │
+│                                                                               │
+│ copilot (default), instructions (applyTo frontmatter from globs; one file per │
+│ source, so folders need --shard), json (an array of rule files) and agents.   │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Multiple Outputs ────────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Parse every source once and write several outputs from it:                    │
+│   python convertmdc.py --sink per-file --sink json:rules.json \\               │
+│       --sink shard:.github/instructions examples/ copilot-instructions.md     │
+│                                                                               │
+│ per-file writes NAME-copilot.md next to each source (or below per-file:DIR).  │
+│ The write time of every sink is printed; --dedupe and --compact only apply    │
+│ to OUTPUT.                                                                    │
+│                                                                               │
 └───────────────────────────────────────────────────────────────────────────────┘
 
 ┌─ Non-Recursive Mode ──────────────────────────────────────────────────────────┐
@@ -984,6 +4682,17 @@ properly formatted VS Code Copilot Instructions. It handles:
 │                                                                               │
 └───────────────────────────────────────────────────────────────────────────────┘
 
+┌─ Ignored Directories ─────────────────────────────────────────────────────────┐
+│                                                                               │
+│ .git, node_modules, virtualenvs and caches are skipped, as are directories   │
+│ excluded by .gitignore files inside the input tree. Skip more by name:       │
+│   python convertmdc.py --ignore-dir vendor --ignore-dir out repo/ output.md  │
+│                                                                               │
+│ Scan everything, like a plain **/*.mdc glob:                                 │
+│   python convertmdc.py --no-ignore repo/ output.md                           │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
 ┌─ Dry Run & Debugging ─────────────────────────────────────────────────────────┐
 │                                                                               │
 │ Preview conversion without writing files:                                    │
@@ -998,6 +4707,53 @@ properly formatted VS Code Copilot Instructions. It handles:
 │ Combine options:                                                             │
 │   python convertmdc.py --dry-run --stats -v examples/ output.md              │
 │                                                                               │
+│ Export per-phase and per-file timings, listing the 10 slowest files:         │
+│   python convertmdc.py --stats --slowest 10 --stats-json stats.json \\        │
+│       examples/ output.md                                                    │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Parallel Conversion ─────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Spread files across 8 worker processes:                                      │
+│   python convertmdc.py --jobs 8 examples/ output.md                          │
+│                                                                               │
+│ Use one worker per CPU core:                                                 │
+│   python convertmdc.py -j 0 examples/ output.md                              │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Incremental Rebuilds ────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Re-convert only added/changed files; unchanged files' sections are copied    │
+│ from the existing output, which is then rewritten as a whole:                │
+│   python convertmdc.py --incremental examples/ output.md                     │
+│   → Records sources in .output.md.manifest.json next to the output           │
+│ Copilot output only: ignored, with a warning, for other --format values and  │
+│ with --shard, --compact, --max-tokens, --dedupe or --sink.                   │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Watch Mode ──────────────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Rebuild the output whenever .mdc files change (Ctrl+C to stop):              │
+│   python convertmdc.py --watch examples/ output.md                           │
+│                                                                               │
+│ Wait 1 s of quiet before rebuilding, and poll instead of using inotify:      │
+│   python convertmdc.py --watch --debounce 1000 --poll examples/ output.md    │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Conversion Cache ────────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Unchanged files are served from the user cache directory (on by default),     │
+│ e.g. ~/.cache/convertmdc; the same file in another checkout is a hit:         │
+│   python convertmdc.py examples/ output.md                                   │
+│                                                                               │
+│ Bypass or reset the cache:                                                   │
+│   python convertmdc.py --no-cache examples/ output.md                        │
+│   python convertmdc.py --clear-cache                                         │
+│                                                                               │
 └───────────────────────────────────────────────────────────────────────────────┘
 
 ┌─ Configuration File ──────────────────────────────────────────────────────────┐
@@ -1024,6 +4780,27 @@ properly formatted VS Code Copilot Instructions. It handles:
 │                                                                               │
 └───────────────────────────────────────────────────────────────────────────────┘
 
+┌─ Batch Conversion ────────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Convert many input/output pairs in one process (JSON status on stdout):      │
+│   python convertmdc.py --batch manifest.json                                 │
+│   printf 'a.mdc\ta.md\nb.mdc\tb.md\n' | python convertmdc.py --batch -       │
+│                                                                               │
+│ manifest.json: [{"input": "a.mdc", "output": "a.md"}, ["b.mdc", "b.md"]]     │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
+┌─ Resident Server ─────────────────────────────────────────────────────────────┐
+│                                                                               │
+│ Keep one converter process running and send it JSON-RPC requests:            │
+│   python convertmdc.py --serve                                               │
+│   {"jsonrpc": "2.0", "id": 1, "method": "convert",                           │
+│    "params": {"input": "examples/", "output": "output.md"}}                  │
+│                                                                               │
+│ Methods: convert, preview, validate, batch, version, shutdown                │
+│                                                                               │
+└───────────────────────────────────────────────────────────────────────────────┘
+
 ┌─ Version Management ──────────────────────────────────────────────────────────┐
 │                                                                               │
 │ Check current version:                                                       │
@@ -1043,15 +4820,30 @@ properly formatted VS Code Copilot Instructions. It handles:
 ║ NOTES                                                                        ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
 
-• Backups are stored in .backups/ directory with timestamps
-• GitHub repos are cloned to temporary directories and cleaned up after use
+• Backups are stored in .backups/ directory with timestamps; all of them are
+  kept unless --backup-keep or --backup-keep-days is set
+• GitHub repos are checked out to temporary directories and cleaned up after
+  use; the bare mirrors they come from are capped at 1 GB (least recently used
+  mirrors are evicted)
 • Progress indicators show [X/Y] for file processing status
 • Interactive mode shows detailed folder breakdown before conversion
 • Empty or failed conversions are marked with ✗ in progress output
 • Dry-run mode shows preview without modifying any files
 • Verbose mode displays debug information during processing
 • Statistics include timing, file counts, rule counts, and error details
-• Config file supports: verbose, dry_run, show_stats options
+• Config file supports: verbose, dry_run, show_stats, jobs, incremental, cache,
+  cache_dir, cache_max_mb, stats_json, slowest, ignore_dirs, gitignore,
+  watch_debounce_ms, poll_interval, fetch_jobs, repo_max_age,
+  repo_cache_max_mb, backup_keep, backup_keep_days, backup_compress, shard,
+  dedupe, compact, max_tokens, format, sinks options
+• Watch mode rebuilds incrementally and only backs up the output before the
+  first build; inotify is used on Linux, polling everywhere else
+• Timed phases: glob, read, preprocess, yaml, fallback, render, compact, write
+• The cache is keyed by file content and converter version, and is capped at
+  64 MB by default (least recently used entries are evicted)
+• Parallel output is byte-identical to a serial run
+• An output whose content would not change is left untouched (no backup, same
+  mtime), so watchers and editors see no change
 • Auto-update creates backup before updating (script.backup.py)
 • Version checking requires internet connection
 
@@ -1075,6 +4867,41 @@ For more information, visit: https://github.com/thynaptic/cursorvertext
         help='Output file path (optional, prints to stdout if omitted)'
     )
     
+    parser.add_argument(
+        '--repo',
+        action='append',
+        metavar='URL',
+        dest='repos',
+        default=[],
+        help='Fetch and convert this repository (repeatable); the only positional argument is then OUTPUT'
+    )
+    
+    parser.add_argument(
+        '--repos',
+        type=str,
+        metavar='FILE',
+        dest='repo_list',
+        help='Fetch and convert every repository URL listed in FILE (one per line, - for stdin)'
+    )
+    
+    parser.add_argument(
+        '--fetch-jobs',
+        type=int,
+        metavar='N',
+        dest='fetch_jobs',
+        default=None,
+        help=f'Number of repositories cloned at once with --repo/--repos (default: {DEFAULT_FETCH_CONCURRENCY})'
+    )
+    
+    parser.add_argument(
+        '--repo-max-age',
+        type=float,
+        metavar='SECONDS',
+        dest='repo_max_age',
+        default=None,
+        help=f'Re-fetch cached repository mirrors older than this (default: {DEFAULT_REPO_MAX_AGE}, 0 = always)'
+    )
+    
     parser.add_argument(
         '--no-recursive',
         action='store_true',
@@ -1082,6 +4909,22 @@ For more information, visit: https://github.com/thynaptic/cursorvertext
         help='Only process files in the specified directory, skip subdirectories'
     )
     
+    parser.add_argument(
+        '--ignore-dir',
+        action='append',
+        metavar='NAME',
+        dest='ignore_dirs',
+        default=[],
+        help='Skip directories with this name when scanning (repeatable; adds to the defaults)'
+    )
+    
+    parser.add_argument(
+        '--no-ignore',
+        action='store_true',
+        dest='no_ignore',
+        help='Scan every directory, including .git, node_modules and .gitignore\'d paths'
+    )
+    
     parser.add_argument(
         '-i', '--interactive',
         action='store_true',
@@ -1096,6 +4939,31 @@ For more information, visit: https://github.com/thynaptic/cursorvertext
         help='Overwrite existing output file without creating a timestamped backup'
     )
     
+    parser.add_argument(
+        '--backup-keep',
+        type=int,
+        metavar='N',
+        dest='backup_keep',
+        default=None,
+        help='Backups kept per output or repository in .backups (default: 0 = all)'
+    )
+    
+    parser.add_argument(
+        '--backup-keep-days',
+        type=float,
+        metavar='DAYS',
+        dest='backup_keep_days',
+        default=None,
+        help='Also remove backups older than DAYS (the newest one is always kept)'
+    )
+    
+    parser.add_argument(
+        '--backup-compress',
+        action='store_true',
+        dest='backup_compress',
+        help='Store new backups gzip-compressed'
+    )
+    
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -1117,6 +4985,149 @@ For more information, visit: https://github.com/thynaptic/cursorvertext
         help='Display detailed conversion statistics after processing'
     )
     
+    parser.add_argument(
+        '--stats-json',
+        type=str,
+        metavar='FILE',
+        dest='stats_json',
+        help='Write statistics, per-phase timings and per-file timings to FILE as JSON'
+    )
+    
+    parser.add_argument(
+        '--slowest',
+        type=int,
+        metavar='N',
+        default=None,
+        help='Number of slowest files to list in statistics (default: 5)'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        metavar='N',
+        default=None,
+        help='Convert files in parallel using N worker processes (0 = one per CPU core)'
+    )
+    
+    parser.add_argument(
+        '--shard',
+        action='store_const',
+        const='file',
+        dest='shard',
+        help=f'Write OUTPUT as a directory of *{SHARD_SUFFIX} files with applyTo headers, '
+             f'one per source file, plus {SHARD_INDEX}'
+    )
+    
+    parser.add_argument(
+        '--shard-by',
+        choices=['file', 'glob'],
+        dest='shard',
+        help='Like --shard, grouping rules per source file or per glob scope'
+    )
+    
+    parser.add_argument(
+        '--dedupe',
+        action='store_true',
+        dest='dedupe',
+        help='Emit a rule id defined identically in several files once, and flag conflicting definitions'
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=list(RENDERERS),
+        dest='format',
+        default=None,
+        help='Output format: copilot (default), instructions (.instructions.md with applyTo), '
+             'json or agents (AGENTS.md)'
+    )
+    
+    parser.add_argument(
+        '--sink',
+        action='append',
+        metavar='KIND[:PATH]',
+        dest='sinks',
+        default=None,
+        help='Also write this output from the same parse (repeatable): copilot:FILE, json:FILE, '
+             'agents:FILE, shard:DIR, or per-file[:DIR] for a -copilot.md file per source'
+    )
+    
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        dest='compact',
+        help='Drop source metadata and reference lists, and replace repeated rule text with a pointer'
+    )
+    
+    parser.add_argument(
+        '--max-tokens',
+        type=int,
+        metavar='N',
+        dest='max_tokens',
+        default=None,
+        help='Compact, then leave out the least severe rules until the output is about N tokens'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        dest='incremental',
+        help='Only re-convert added or changed files, reusing the rest of the existing output'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        dest='watch',
+        help='Keep running and rebuild OUTPUT incrementally whenever .mdc files under INPUT change'
+    )
+    
+    parser.add_argument(
+        '--debounce',
+        type=int,
+        metavar='MS',
+        default=None,
+        help=f'With --watch, wait this long without further changes before rebuilding '
+             f'(default: {DEFAULT_WATCH_DEBOUNCE_MS})'
+    )
+    
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        dest='poll',
+        help='With --watch, poll for changes instead of using inotify'
+    )
+    
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        metavar='SECONDS',
+        dest='poll_interval',
+        default=None,
+        help=f'With --watch, seconds between polls (default: {DEFAULT_POLL_INTERVAL})'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        dest='no_cache',
+        help='Do not read or write the conversion cache'
+    )
+    
+    parser.add_argument(
+        '--clear-cache',
+        action='store_true',
+        dest='clear_cache',
+        help='Delete the conversion cache before converting (exits if no INPUT is given)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        metavar='DIR',
+        dest='cache_dir',
+        help='Directory for the conversion cache (default: the user cache directory, e.g. ~/.cache/convertmdc)'
+    )
+    
     parser.add_argument(
         '--config',
         type=str,
@@ -1132,6 +5143,22 @@ For more information, visit: https://github.com/thynaptic/cursorvertext
         help='Load a preset configuration: dev (verbose+stats), prod (quiet), preview (dry-run+stats)'
     )
     
+    parser.add_argument(
+        '--batch',
+        type=str,
+        metavar='MANIFEST',
+        dest='batch',
+        help='Convert every INPUT/OUTPUT pair listed in MANIFEST (JSON or tab-separated, - for stdin) '
+             'in one process and print per-file status as JSON'
+    )
+    
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        dest='serve',
+        help='Run as a resident converter answering JSON-RPC requests on stdin/stdout'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -1172,30 +5199,12 @@ For more information, visit: https://github.com/thynaptic/cursorvertext
         sys.exit(0 if success else 1)
     
     # Validate required arguments for conversion
-    if not args.input:
+    fetching = bool(args.repos or args.repo_list)
+    if not args.input and not args.clear_cache and not args.serve and not args.batch and not fetching:
         parser.error("the following arguments are required: INPUT")
     
-    # Load preset configuration if specified
-    preset_config = {}
-    if hasattr(args, 'preset') and args.preset:
-        preset_file = Path(__file__).parent / f".convertmdcrc.{args.preset}"
-        if preset_file.exists():
-            print(f"Loading preset: {args.preset}")
-            preset_config = CursorRuleConverter.load_config(preset_file)
-        else:
-            print(f"Warning: Preset '{args.preset}' not found, using defaults", file=sys.stderr)
-    
-    # Load configuration file if specified
-    # If preset is used, only load user config if --config is explicitly specified
-    config = {}
-    if hasattr(args, 'config') and args.config:
-        config = CursorRuleConverter.load_config(Path(args.config))
-    elif not args.preset:
-        # Only auto-load .convertmdcrc if no preset is specified
-        config = CursorRuleConverter.load_config(None)
-    
     # Merge configs: preset < config file < CLI args (CLI has highest precedence)
-    merged_config = {**preset_config, **config}
+    merged_config = load_merged_config(args.preset, args.config)
     
     # Merge CLI args with config - only use CLI if explicitly set
     # For boolean flags, if they weren't explicitly set, use config value
@@ -1210,9 +5219,147 @@ For more information, visit: https://github.com/thynaptic/cursorvertext
         dry_run = True
     if args.show_stats:
         show_stats = True
+    jobs = args.jobs if args.jobs is not None else merged_config.get('jobs', 1)
+    if jobs < 0:
+        parser.error("--jobs must be 0 or a positive integer")
+    stats_json = args.stats_json or merged_config.get('stats_json')
+    # Settings given on the command line override the config file, here and in
+    # every --serve or --batch request
+    cli_settings = {key: value for key, value in (
+        ('format', args.format), ('shard', args.shard), ('compact', args.compact or None),
+        ('max_tokens', args.max_tokens), ('dedupe', args.dedupe or None), ('sinks', args.sinks),
+        ('slowest', args.slowest), ('backup_keep', args.backup_keep),
+        ('backup_keep_days', args.backup_keep_days), ('backup_compress', args.backup_compress or None),
+    ) if value is not None}
+    try:
+        options = converter_options({**merged_config, **cli_settings})
+        if fetching or (args.input and not (args.serve or args.batch)):
+            check_output_target(options,
+                                single_file=not (fetching or args.watch) and Path(args.input).is_file(),
+                                has_output=bool(args.input if fetching else args.output))
+    except ValueError as e:
+        parser.error(str(e))
+    
+    cache_dir: Optional[Path] = Path(args.cache_dir or merged_config.get('cache_dir') or default_cache_dir())
+    if args.clear_cache:
+        if ConversionCache.clear(cache_dir):
+            print(f"Cleared conversion cache: {cache_dir}")
+        if not args.input:
+            sys.exit(0)
+    if args.no_cache or not merged_config.get('cache', True):
+        cache_dir = None
+    cache_max_bytes = int(merged_config.get('cache_max_mb', DEFAULT_CACHE_MAX_BYTES // (1024 * 1024)) * 1024 * 1024)
+    repo_cache: Optional[RepoMirrorCache] = None
+    if cache_dir is not None:
+        repo_max_age = args.repo_max_age if args.repo_max_age is not None else merged_config.get(
+            'repo_max_age', DEFAULT_REPO_MAX_AGE)
+        if repo_max_age < 0:
+            parser.error("--repo-max-age must be 0 or more")
+        repo_cache_max_bytes = int(merged_config.get(
+            'repo_cache_max_mb', DEFAULT_REPO_CACHE_MAX_BYTES // (1024 * 1024)) * 1024 * 1024)
+        repo_cache = RepoMirrorCache(cache_dir / 'repos', repo_cache_max_bytes, repo_max_age, verbose=verbose)
+    
+    # Long-running modes keep listings between scans
+    cache_listings = args.serve or args.watch
+    if args.no_ignore:
+        scanner = DirectoryScanner(ignore_dirs=(), use_gitignore=False, cache_listings=cache_listings)
+    else:
+        ignore_dirs = DEFAULT_IGNORE_DIRS + tuple(merged_config.get('ignore_dirs', [])) + tuple(args.ignore_dirs)
+        scanner = DirectoryScanner(ignore_dirs=ignore_dirs, use_gitignore=merged_config.get('gitignore', True),
+                                   cache_listings=cache_listings)
+    
+    def new_converter() -> CursorRuleConverter:
+        """Build a converter with the output, retention and statistics options of this run."""
+        return CursorRuleConverter(verbose=verbose, jobs=jobs, cache_dir=cache_dir,
+                                   cache_max_bytes=cache_max_bytes, scanner=scanner,
+                                   repo_cache=repo_cache, **options)
+    
+    if args.serve:
+        ConverterServer(jobs=jobs, cache_dir=cache_dir, cache_max_bytes=cache_max_bytes,
+                        scanner=scanner, settings=cli_settings).serve_forever()
+        sys.exit(0)
+    
+    if args.batch:
+        try:
+            if args.batch == '-':
+                manifest_text = sys.stdin.read()
+            else:
+                manifest_text = Path(args.batch).read_text(encoding='utf-8')
+            entries = load_batch_manifest(manifest_text)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read batch manifest {args.batch}: {e}", file=sys.stderr)
+            sys.exit(1)
+        server = ConverterServer(jobs=jobs, cache_dir=cache_dir, cache_max_bytes=cache_max_bytes,
+                                 scanner=scanner, settings=cli_settings)
+        try:
+            summary = server.rpc_batch({
+                'entries': entries,
+                'preset': args.preset,
+                'config': args.config,
+                'recursive': not args.no_recursive,
+                'backup': not args.no_backup,
+                'verbose': verbose,
+                'dry_run': dry_run,
+                'show_stats': show_stats,
+                'incremental': args.incremental or merged_config.get('incremental', False),
+            })
+        except RPCError as e:
+            parser.error(e.message)
+        print(json.dumps(summary, indent=2))
+        sys.exit(0 if summary['success'] else 1)
+    
+    if args.watch:
+        if not args.output:
+            parser.error("--watch needs an OUTPUT file")
+        if args.interactive or dry_run or CursorRuleConverter().is_github_url(args.input):
+            parser.error("--watch cannot be combined with --interactive, --dry-run or a GitHub URL")
+        debounce_ms = args.debounce if args.debounce is not None else merged_config.get(
+            'watch_debounce_ms', DEFAULT_WATCH_DEBOUNCE_MS)
+        poll_interval = args.poll_interval if args.poll_interval is not None else merged_config.get(
+            'poll_interval', DEFAULT_POLL_INTERVAL)
+        if debounce_ms < 0 or poll_interval <= 0:
+            parser.error("--debounce must be 0 or more and --poll-interval greater than 0")
+        
+        watch_directory(Path(args.input), Path(args.output), new_converter, scanner,
+                        recursive=not args.no_recursive, debounce=debounce_ms / 1000,
+                        poll_interval=poll_interval, use_inotify=not args.poll,
+                        backup_existing=not args.no_backup, show_stats=show_stats)
+        sys.exit(0)
+    
+    if fetching:
+        if args.output:
+            parser.error("--repo/--repos take a single positional argument, the OUTPUT file")
+        repo_urls = list(args.repos)
+        if args.repo_list:
+            try:
+                if args.repo_list == '-':
+                    repo_urls.extend(load_repo_list(sys.stdin.read()))
+                else:
+                    repo_urls.extend(load_repo_list(Path(args.repo_list).read_text(encoding='utf-8')))
+            except OSError as e:
+                print(f"Error: Could not read repository list {args.repo_list}: {e}", file=sys.stderr)
+                sys.exit(1)
+        fetch_jobs = args.fetch_jobs if args.fetch_jobs is not None else merged_config.get(
+            'fetch_jobs', DEFAULT_FETCH_CONCURRENCY)
+        if fetch_jobs < 1:
+            parser.error("--fetch-jobs must be a positive integer")
+        
+        converter = new_converter()
+        success = converter.convert_repositories(
+            repo_urls,
+            Path(args.input) if args.input else None,
+            concurrency=fetch_jobs,
+            recursive=not args.no_recursive,
+            backup_existing=not args.no_backup,
+            dry_run=dry_run,
+            show_stats=show_stats
+        )
+        if stats_json:
+            converter.export_statistics(Path(stats_json))
+        sys.exit(0 if success else 1)
     
     # Convert paths (or keep as string for GitHub URL)
-    converter = CursorRuleConverter(verbose=verbose)
+    converter = new_converter()
     if converter.is_github_url(args.input):
         input_path = args.input  # Keep as string for GitHub URLs
     else:
@@ -1227,8 +5374,11 @@ For more information, visit: https://github.com/thynaptic/cursorvertext
         interactive=args.interactive,
         backup_existing=not args.no_backup,
         dry_run=dry_run,
-        show_stats=show_stats
+        show_stats=show_stats,
+        incremental=args.incremental or merged_config.get('incremental', False)
     )
+    if stats_json:
+        converter.export_statistics(Path(stats_json))
     
     sys.exit(0 if success else 1)
 
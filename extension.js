@@ -123,8 +123,8 @@ function openConverterUI(context) {
                         return;
                     }
                     const fileArgs = message.preset ? 
-                        ['--preset', message.preset, message.inputPath, message.outputPath] :
-                        [message.inputPath, message.outputPath];
+                        ['--preset', message.preset, workspacePath(message.inputPath), workspacePath(message.outputPath)] :
+                        [workspacePath(message.inputPath), workspacePath(message.outputPath)];
                     await runConverter(fileArgs);
                     panel.webview.postMessage({ command: 'conversionComplete' });
                     break;
@@ -135,8 +135,8 @@ function openConverterUI(context) {
                         return;
                     }
                     const folderArgs = message.preset ?
-                        ['--preset', message.preset, '-i', message.inputPath, message.outputPath] :
-                        ['-i', message.inputPath, message.outputPath];
+                        ['--preset', message.preset, '-i', workspacePath(message.inputPath), workspacePath(message.outputPath)] :
+                        ['-i', workspacePath(message.inputPath), workspacePath(message.outputPath)];
                     await runConverter(folderArgs);
                     panel.webview.postMessage({ command: 'conversionComplete' });
                     break;
@@ -147,8 +147,8 @@ function openConverterUI(context) {
                         return;
                     }
                     const githubArgs = message.preset ?
-                        ['--preset', message.preset, message.repoUrl, message.outputPath] :
-                        [message.repoUrl, message.outputPath];
+                        ['--preset', message.preset, message.repoUrl, workspacePath(message.outputPath)] :
+                        [message.repoUrl, workspacePath(message.outputPath)];
                     await runConverter(githubArgs);
                     panel.webview.postMessage({ command: 'conversionComplete' });
                     break;
@@ -675,6 +675,28 @@ async function checkUpdate() {
     await runConverter(['--check-update']);
 }
 
+/**
+ * Arguments and spawn options for running the converter.
+ * One-shot runs and the resident worker both run it as a module, so Python
+ * reuses the cached bytecode, from the extension folder: sys.path[0] is that
+ * folder, so nothing in the opened workspace can shadow the converter or the
+ * standard library. Input and output paths must therefore be absolute.
+ */
+function converterCommand(args) {
+    return {
+        args: ['-m', 'convertmdc', ...args],
+        options: { cwd: __dirname }
+    };
+}
+
+/**
+ * Resolve a path typed into the converter panel against the workspace folder
+ */
+function workspacePath(filePath) {
+    const workspaceFolder = vscode.workspace.workspaceFolders?.[0]?.uri.fsPath;
+    return path.resolve(workspaceFolder || '', filePath);
+}
+
 /**
  * Run the Python converter script
  */
@@ -699,7 +721,8 @@ async function runConverter(args, silent = false) {
     }
 
     const pythonPath = config.get('pythonPath') || 'python3';
-    const fullArgs = [scriptPath, ...flags, ...args];
+    const command = converterCommand([...flags, ...args]);
+    const fullArgs = command.args;
 
     // Create output channel
     const output = vscode.window.createOutputChannel('Cursor Rules Converter');
@@ -709,9 +732,7 @@ async function runConverter(args, silent = false) {
     output.appendLine(`Running: ${pythonPath} ${fullArgs.join(' ')}\n`);
 
     return new Promise((resolve, reject) => {
-        const python = spawn(pythonPath, fullArgs, {
-            cwd: __dirname
-        });
+        const python = spawn(pythonPath, fullArgs, command.options);
 
         let hasError = false;
 
@@ -757,6 +778,210 @@ async function runConverter(args, silent = false) {
     });
 }
 
+// ============================================================================
+// RESIDENT CONVERTER (convertmdc.py --serve)
+// ============================================================================
+
+let converterWorker = null;
+let converterOutput = null;
+
+/**
+ * Shared output channel for requests handled by the resident converter
+ */
+function getConverterOutput() {
+    if (!converterOutput) {
+        converterOutput = vscode.window.createOutputChannel('Cursor Rules Converter');
+    }
+    return converterOutput;
+}
+
+/**
+ * Start (or reuse) the resident converter process.
+ * One Python process answers JSON-RPC requests for the lifetime of the
+ * extension, so bulk operations pay interpreter startup only once.
+ */
+function getConverterWorker() {
+    const config = vscode.workspace.getConfiguration('cursorvertext');
+    const pythonPath = config.get('pythonPath') || 'python3';
+
+    if (converterWorker && converterWorker.pythonPath === pythonPath) {
+        return converterWorker;
+    }
+    stopConverterWorker();
+
+    const scriptPath = path.join(__dirname, 'convertmdc.py');
+    if (!fs.existsSync(scriptPath)) {
+        throw new Error('Converter script not found. Please reinstall the extension.');
+    }
+
+    const command = converterCommand(['--serve']);
+    const proc = spawn(pythonPath, command.args, command.options);
+    const worker = {
+        pythonPath,
+        process: proc,
+        nextId: 1,
+        pending: new Map(),
+        buffer: ''
+    };
+
+    const failPending = (error) => {
+        for (const { reject } of worker.pending.values()) {
+            reject(error);
+        }
+        worker.pending.clear();
+        if (converterWorker === worker) {
+            converterWorker = null;
+        }
+    };
+
+    proc.stdout.setEncoding('utf8');
+    proc.stdout.on('data', (data) => {
+        worker.buffer += data;
+        let newline;
+        while ((newline = worker.buffer.indexOf('\n')) >= 0) {
+            const line = worker.buffer.slice(0, newline);
+            worker.buffer = worker.buffer.slice(newline + 1);
+            if (!line.trim()) continue;
+
+            let message;
+            try {
+                message = JSON.parse(line);
+            } catch (error) {
+                getConverterOutput().appendLine(`Ignoring malformed converter response: ${line}`);
+                continue;
+            }
+
+            const request = worker.pending.get(message.id);
+            if (!request) continue;
+            worker.pending.delete(message.id);
+
+            if (message.error) {
+                request.reject(new Error(message.error.message));
+            } else {
+                request.resolve(message.result);
+            }
+        }
+    });
+
+    proc.stderr.on('data', (data) => {
+        getConverterOutput().append(data.toString());
+    });
+
+    proc.on('error', (error) => {
+        getConverterOutput().appendLine(`\nFailed to start Python: ${error.message}`);
+        getConverterOutput().appendLine('You can configure the Python path in settings: cursorvertext.pythonPath');
+        failPending(error);
+    });
+
+    proc.on('exit', (code) => {
+        failPending(new Error(`Converter process exited with code ${code}`));
+    });
+
+    // Writing to a worker that has exited fails with EPIPE; without a handler that would throw
+    proc.stdin.on('error', (error) => {
+        getConverterOutput().appendLine(`\nConverter process is no longer reachable: ${error.message}`);
+        failPending(error);
+    });
+
+    converterWorker = worker;
+    return worker;
+}
+
+/**
+ * Send a JSON-RPC request to the resident converter
+ */
+function callConverter(method, params = {}) {
+    return new Promise((resolve, reject) => {
+        let worker;
+        try {
+            worker = getConverterWorker();
+        } catch (error) {
+            reject(error);
+            return;
+        }
+
+        const id = worker.nextId++;
+        worker.pending.set(id, { resolve, reject });
+        worker.process.stdin.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n');
+    });
+}
+
+/**
+ * Stop the resident converter process
+ */
+function stopConverterWorker() {
+    if (!converterWorker) return;
+
+    const worker = converterWorker;
+    converterWorker = null;
+    worker.process.stdin.end();
+    worker.process.kill();
+}
+
+/**
+ * Converter options taken from the extension settings (mirrors runConverter flags)
+ */
+function getConverterOptions(preset) {
+    if (preset) {
+        return { preset };
+    }
+
+    const config = vscode.workspace.getConfiguration('cursorvertext');
+    return {
+        verbose: !!config.get('verbose'),
+        show_stats: !!config.get('showStats'),
+        backup: !!config.get('autoBackup')
+    };
+}
+
+/**
+ * Convert one input through the resident converter.
+ * Resolves to true on success; failures are logged to the output channel.
+ */
+async function convertWithWorker(inputPath, outputPath, preset) {
+    const output = getConverterOutput();
+    try {
+        const result = await callConverter('convert', {
+            input: inputPath,
+            output: outputPath,
+            ...getConverterOptions(preset)
+        });
+        if (result.log) {
+            output.append(result.log);
+        }
+        return result.success;
+    } catch (error) {
+        output.appendLine(`Failed to convert ${inputPath}: ${error.message}`);
+        return false;
+    }
+}
+
+/**
+ * Convert many input/output pairs with a single batch request.
+ * Resolves to the per-file status summary reported by the converter.
+ */
+async function batchConvertWithWorker(entries, preset) {
+    const output = getConverterOutput();
+    try {
+        const summary = await callConverter('batch', {
+            entries,
+            ...getConverterOptions(preset)
+        });
+        for (const result of summary.results) {
+            if (result.log) {
+                output.append(result.log);
+            }
+            if (!result.success) {
+                output.appendLine(`Failed to convert ${result.input}`);
+            }
+        }
+        return summary;
+    } catch (error) {
+        output.appendLine(`Batch conversion failed: ${error.message}`);
+        return { success: false, succeeded: 0, failed: entries.length, results: [] };
+    }
+}
+
 /**
  * Select a folder using file picker
  */
@@ -775,6 +1000,7 @@ async function selectFolder() {
  * Deactivate the extension
  */
 function deactivate() {
+    stopConverterWorker();
     if (mdcFileWatcher) {
         mdcFileWatcher.dispose();
     }
@@ -824,22 +1050,13 @@ async function previewConversion(uri) {
     // Show loading message
     previewPanel.webview.html = getLoadingHTML();
 
-    // Run converter to generate preview output
-    const tempOutput = path.join(require('os').tmpdir(), 'preview-' + Date.now() + '.md');
-    
     try {
-        await runConverter([filePath, tempOutput], true);
-        
-        // Read the generated file
-        if (fs.existsSync(tempOutput)) {
-            const previewContent = fs.readFileSync(tempOutput, 'utf8');
-            previewPanel.webview.html = getPreviewHTML(filePath, previewContent);
-            
-            // Clean up temp file
-            fs.unlinkSync(tempOutput);
-        } else {
-            throw new Error('Preview file not generated');
+        // Ask the resident converter for the markdown directly (no temp file)
+        const result = await callConverter('preview', { input: filePath });
+        if (!result.content) {
+            throw new Error(result.errors.join('\n') || 'Preview not generated');
         }
+        previewPanel.webview.html = getPreviewHTML(filePath, result.content);
     } catch (error) {
         previewPanel.webview.html = getErrorHTML(error.message);
     }
@@ -1124,25 +1341,22 @@ async function convertAllMdcFiles() {
         title: "Converting all .mdc files",
         cancellable: false
     }, async (progress) => {
-        for (let i = 0; i < mdcFiles.length; i++) {
-            progress.report({ 
-                increment: (100 / mdcFiles.length),
-                message: `Converting ${i + 1}/${mdcFiles.length}` 
-            });
+        progress.report({ message: `Converting ${mdcFiles.length} file(s)` });
 
-            const file = mdcFiles[i];
+        const entries = mdcFiles.map(file => {
             const outputName = path.basename(file.fsPath, '.mdc') + '-copilot.md';
-            const output = path.join(path.dirname(file.fsPath), outputName);
-            
-            try {
-                await runConverter([file.fsPath, output], true);
-            } catch (error) {
-                console.error(`Failed to convert ${file.fsPath}:`, error);
-            }
+            return { input: file.fsPath, output: path.join(path.dirname(file.fsPath), outputName) };
+        });
+
+        const summary = await batchConvertWithWorker(entries);
+        if (summary.failed > 0) {
+            vscode.window.showWarningMessage(
+                `Converted ${summary.succeeded} file(s), ${summary.failed} failed. See output for details.`
+            );
+        } else {
+            vscode.window.showInformationMessage(`Successfully converted ${summary.succeeded} file(s)!`);
         }
     });
-
-    vscode.window.showInformationMessage(`Successfully converted ${mdcFiles.length} file(s)!`);
 }
 
 /**
@@ -1163,10 +1377,8 @@ async function toggleWatchMode() {
             if (config.get('watchModeEnabled')) {
                 vscode.window.showInformationMessage(`Auto-converting ${path.basename(uri.fsPath)}...`);
                 const outputPath = uri.fsPath.replace('.mdc', '-copilot.md');
-                try {
-                    await runConverter([uri.fsPath, outputPath], true);
-                } catch (error) {
-                    console.error('Watch mode conversion failed:', error);
+                if (!await convertWithWorker(uri.fsPath, outputPath)) {
+                    console.error(`Watch mode conversion failed: ${uri.fsPath}`);
                 }
             }
         });
@@ -1255,16 +1467,10 @@ async function batchConvert() {
         cancellable: false
     }, async (progress) => {
         const total = selected.length;
-        let success = 0;
-        let failed = 0;
-
-        for (let i = 0; i < total; i++) {
-            const file = selected[i].uri;
-            progress.report({ 
-                increment: (100 / total),
-                message: `Converting ${i + 1}/${total}: ${path.basename(file.fsPath)}` 
-            });
+        progress.report({ message: `Converting ${total} file(s)` });
 
+        const entries = selected.map((item, i) => {
+            const file = item.uri;
             let outputPath;
             if (outputStrategy.value === 'same') {
                 outputPath = file.fsPath.replace('.mdc', '-copilot.md');
@@ -1273,19 +1479,13 @@ async function batchConvert() {
             } else {
                 outputPath = path.join(outputDir, `combined-${i}.md`);
             }
+            return { input: file.fsPath, output: outputPath };
+        });
 
-            try {
-                const args = preset.value ? ['--preset', preset.value, file.fsPath, outputPath] : [file.fsPath, outputPath];
-                await runConverter(args, true);
-                success++;
-            } catch (error) {
-                console.error(`Failed to convert ${file.fsPath}:`, error);
-                failed++;
-            }
-        }
+        const summary = await batchConvertWithWorker(entries, preset.value);
 
         vscode.window.showInformationMessage(
-            `Batch conversion complete! ✅ ${success} succeeded, ❌ ${failed} failed`
+            `Batch conversion complete! ✅ ${summary.succeeded} succeeded, ❌ ${summary.failed} failed`
         );
     });
 }
@@ -1364,6 +1564,15 @@ async function validateMdcFile(uri) {
             }
         }
 
+        // 6. Parse with the converter itself (same parser used for conversion)
+        try {
+            const result = await callConverter('validate', { input: filePath });
+            const target = result.valid ? warnings : errors;
+            result.errors.forEach(message => target.push(message));
+        } catch (converterError) {
+            warnings.push(`Converter validation unavailable: ${converterError.message}`);
+        }
+
         // Display results
         output.appendLine('='.repeat(50));
         
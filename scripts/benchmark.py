@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Benchmark convertmdc against a synthetic .mdc corpus.
+
+Generates a reproducible corpus (file count, rules per file, description size,
+share of unquoted globs and of malformed rule YAML are all adjustable), then
+times each phase of the pipeline separately and end to end.
+
+Usage:
+    python scripts/benchmark.py
+    python scripts/benchmark.py --files 2000 --rules 30 --description-lines 8
+    python scripts/benchmark.py --malformed 0.2 --json
+    python scripts/benchmark.py --json --history bench.jsonl
+
+Use --json for a machine-readable report, and --history to append each
+report to a JSON Lines file so results can be compared across releases.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import convertmdc  # noqa: E402
+from convertmdc import CursorRuleConverter  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SEVERITIES = ['error', 'warning', 'info']
+GLOBS = ['*.py', '*.ts, *.tsx', 'src/**/*.js', '**/*.{yml,yaml}', 'docs/*.md, *.rst']
+WORDS = ('use prefer avoid never always handler request response config module '
+         'function class test cache value error retry timeout buffer index').split()
+
+
+def make_description(rng: random.Random, lines: int) -> List[str]:
+    """Build a description of the given number of lines, with some inline code."""
+    result = []
+    for _ in range(lines):
+        words = rng.choices(WORDS, k=rng.randint(6, 14))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), f'`{rng.choice(WORDS)}()`')
+        result.append(' '.join(words).capitalize() + '.')
+    return result
+
+
+def make_mdc_file(rng: random.Random, index: int, rules: int, description_lines: int,
+                  unquoted_globs: bool, malformed: bool) -> str:
+    """
+    Render one synthetic .mdc file.
+
+    Args:
+        rng: Random source (seeded by the caller for reproducible corpora)
+        index: File number, used in ids and titles
+        rules: Number of rules in the file
+        description_lines: Lines per rule description
+        unquoted_globs: Leave globs unquoted so _preprocess_frontmatter has to fix them
+        malformed: Break one rule so YAML fails and the manual extraction runs
+
+    Returns:
+        File content
+    """
+    globs = rng.choice(GLOBS)
+    lines = [
+        '---',
+        f'description: Synthetic rules {index}',
+        f'globs: {globs}' if unquoted_globs else f'globs: "{globs}"',
+        f'alwaysApply: {"true" if index % 5 == 0 else "false"}',
+        '---',
+        '',
+        f'# Synthetic Rules {index}',
+        '',
+        ' '.join(make_description(rng, 2)),
+        '',
+        'rules:',
+    ]
+    broken = rng.randrange(rules) if malformed and rules else -1
+    for number in range(rules):
+        lines.append(f'  - id: rule-{index}-{number}')
+        lines.append(f'    severity: {rng.choice(SEVERITIES)}')
+        if number == broken:
+            # An unquoted "key: [" inside a plain scalar is invalid YAML
+            lines.append('    description: Check config: [unclosed')
+            continue
+        lines.append('    description: |')
+        lines.extend(f'      {line}' for line in make_description(rng, description_lines))
+    lines.extend(['', 'references:', f'  - https://example.com/rules/{index}', ''])
+    return '\n'.join(lines)
+
+
+def generate_corpus(root: Path, files: int, rules: int, description_lines: int,
+                    unquoted_globs: float, malformed: float, folders: int, seed: int) -> Dict[str, Any]:
+    """
+    Write a synthetic corpus under root, spread over a few folders.
+
+    Returns:
+        Description of the generated corpus
+    """
+    rng = random.Random(seed)
+    total_bytes = 0
+    unquoted_count = 0
+    malformed_count = 0
+    for index in range(files):
+        folder = root / f'group{index % max(folders, 1)}'
+        folder.mkdir(parents=True, exist_ok=True)
+        unquoted = rng.random() < unquoted_globs
+        broken = rng.random() < malformed
+        unquoted_count += unquoted
+        malformed_count += broken
+        content = make_mdc_file(rng, index, rules, description_lines, unquoted, broken)
+        path = folder / f'rules-{index:05d}.mdc'
+        path.write_text(content, encoding='utf-8')
+        total_bytes += len(content.encode('utf-8'))
+    return {
+        'files': files,
+        'rules_per_file': rules,
+        'description_lines': description_lines,
+        'unquoted_globs': unquoted_count,
+        'malformed': malformed_count,
+        'bytes': total_bytes,
+        'seed': seed,
+    }
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process and its children, in KiB."""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Run func repeat times and return the fastest wall time in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(corpus: Path, repeat: int, jobs: int) -> Dict[str, Any]:
+    """
+    Time each pipeline phase over the corpus.
+
+    Phases are measured in isolation (scan, read, preprocess, parse, render)
+    and then together through convert(), which also writes the output file
+    and reports its own per-phase timings.
+
+    Returns:
+        Per-phase seconds plus the totals used for the throughput figures
+    """
+    converter = CursorRuleConverter()
+    files: List[Path] = []
+    contents: List[str] = []
+    parsed: List[convertmdc.ParsedRuleFile] = []
+
+    def scan():
+        files[:] = [f for group in converter.scan_directory(corpus).values() for f in group]
+
+    def read():
+        contents[:] = [f.read_text(encoding='utf-8') for f in files]
+
+    def preprocess():
+        for content in contents:
+            sections = convertmdc.scan_mdc_sections(content)
+            if sections:
+                start, end = sections['frontmatter']
+                converter._preprocess_frontmatter(content[start:end])
+
+    def parse():
+        converter.errors = []
+        parsed[:] = [p for p in map(converter.parse_mdc_file, files) if p]
+
+    def render():
+        for data in parsed:
+            converter.convert_to_copilot_instructions(data)
+
+    phases = {}
+    for name, func in (('scan', scan), ('read', read), ('preprocess', preprocess),
+                       ('parse', parse), ('render', render)):
+        phases[name] = best_of(repeat, func)
+
+    rules = sum(len(data.rules) for data in parsed)
+    fallback_files = sum(1 for error in converter.errors if error.startswith('Warning: Could not fully parse'))
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        output = Path(out_dir) / 'copilot-instructions.md'
+
+        convert_phases: Dict[str, float] = {}
+
+        def convert():
+            run = CursorRuleConverter(jobs=jobs)
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                run.convert(corpus, output, backup_existing=False)
+            convert_phases.update(run.stats['phases'])
+
+        phases['convert'] = best_of(repeat, convert)
+        output_bytes = output.stat().st_size
+
+    return {
+        'phases': phases,
+        'convert_phases': convert_phases,
+        'files': len(files),
+        'parsed_files': len(parsed),
+        'rules': rules,
+        'fallback_files': fallback_files,
+        'output_bytes': output_bytes,
+    }
+
+
+def build_report(args: argparse.Namespace, corpus_info: Dict[str, Any],
+                 results: Dict[str, Any]) -> Dict[str, Any]:
+    phases = results['phases']
+    convert_seconds = phases['convert'] or float('inf')
+    parse_seconds = phases['parse'] or float('inf')
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'version': convertmdc.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'yaml_loader': convertmdc.yaml_loader().__name__,
+        'jobs': args.jobs,
+        'repeat': args.repeat,
+        'corpus': corpus_info,
+        'results': {
+            'files': results['files'],
+            'parsed_files': results['parsed_files'],
+            'rules': results['rules'],
+            'fallback_files': results['fallback_files'],
+            'output_bytes': results['output_bytes'],
+            'files_per_sec': round(results['files'] / convert_seconds, 1),
+            'rules_per_sec': round(results['rules'] / convert_seconds, 1),
+            'parse_files_per_sec': round(results['files'] / parse_seconds, 1),
+            'peak_rss_kb': peak_rss_kb(),
+        },
+        'phases': {name: round(seconds, 6) for name, seconds in phases.items()},
+        'convert_phases': {name: round(seconds, 6) for name, seconds in results['convert_phases'].items()},
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    corpus = report['corpus']
+    results = report['results']
+    print("=" * 60)
+    print("📈 CONVERTMDC BENCHMARK")
+    print("=" * 60)
+    print(f"Version:          {report['version']} (Python {report['python']}, {report['yaml_loader']})")
+    if 'path' in corpus:
+        print(f"Corpus:           {corpus['path']} ({corpus['files']} files, {corpus['bytes'] / 1024:.1f} KB)")
+    else:
+        print(f"Corpus:           {corpus['files']} files x {corpus['rules_per_file']} rules, "
+              f"{corpus['description_lines']} description lines")
+        print(f"                  {corpus['unquoted_globs']} unquoted globs, {corpus['malformed']} malformed, "
+              f"{corpus['bytes'] / 1024:.1f} KB")
+    print(f"Jobs / repeat:    {report['jobs']} / best of {report['repeat']}")
+    print()
+    print("Phases (seconds):")
+    for name, seconds in report['phases'].items():
+        print(f"  {name:<12} {seconds:10.4f}")
+    print()
+    print("Inside convert() (seconds, summed over workers):")
+    for name, seconds in report['convert_phases'].items():
+        print(f"  {name:<12} {seconds:10.4f}")
+    print()
+    print(f"Files/sec:        {results['files_per_sec']:.1f} (parse only: {results['parse_files_per_sec']:.1f})")
+    print(f"Rules/sec:        {results['rules_per_sec']:.1f}")
+    print(f"YAML fallbacks:   {results['fallback_files']}")
+    if results['peak_rss_kb'] is not None:
+        print(f"Peak RSS:         {results['peak_rss_kb'] / 1024:.1f} MB")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark convertmdc against a synthetic .mdc corpus',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--files', type=int, default=500, help='Number of .mdc files (default: 500)')
+    parser.add_argument('--rules', type=int, default=20, help='Rules per file (default: 20)')
+    parser.add_argument('--description-lines', type=int, default=3,
+                        help='Lines per rule description (default: 3)')
+    parser.add_argument('--unquoted-globs', type=float, default=0.5, metavar='RATIO',
+                        help='Share of files with unquoted globs (default: 0.5)')
+    parser.add_argument('--malformed', type=float, default=0.05, metavar='RATIO',
+                        help='Share of files with invalid rule YAML (default: 0.05)')
+    parser.add_argument('--folders', type=int, default=10, help='Folders to spread files over (default: 10)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per phase, best is kept (default: 3)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Worker processes for convert() (default: 1)')
+    parser.add_argument('--corpus', type=Path, metavar='DIR',
+                        help='Benchmark an existing directory instead of generating one')
+    parser.add_argument('--keep', type=Path, metavar='DIR',
+                        help='Generate the corpus into DIR and keep it')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--history', type=Path, metavar='FILE',
+                        help='Append the JSON report to FILE (one line per run)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            corpus = args.corpus
+            corpus_info = {
+                'path': str(corpus),
+                'bytes': sum(f.stat().st_size for f in corpus.glob('**/*.mdc')),
+            }
+        else:
+            corpus = args.keep or Path(tmp) / 'corpus'
+            corpus_info = generate_corpus(corpus, args.files, args.rules, args.description_lines,
+                                          args.unquoted_globs, args.malformed, args.folders, args.seed)
+
+        results = run_benchmark(corpus, max(args.repeat, 1), args.jobs)
+
+    if args.corpus:
+        corpus_info['files'] = results['files']
+    report = build_report(args, corpus_info, results)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.history:
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report, sort_keys=True) + '\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compare the memory held by parsed rules as plain dicts and as Rule records.
+
+parse_mdc_file() used to return each rule as the mapping PyYAML produced;
+it now returns Rule objects with __slots__ and interned ids and
+severities. This script parses the same synthetic corpus (see
+benchmark.py) both ways, keeps every rule alive, and reports the traced
+allocation per rule for each layout.
+
+Usage:
+    python scripts/memory_benchmark.py
+    python scripts/memory_benchmark.py --files 2000 --rules 50 --json
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import convertmdc  # noqa: E402
+from benchmark import generate_corpus  # noqa: E402
+
+
+def rule_mappings(files: List[Path]) -> List[List[Dict[str, Any]]]:
+    """Rules of each file as the dicts PyYAML returns, the layout parse_mdc_file used to keep."""
+    result = []
+    for path in files:
+        content = path.read_text(encoding='utf-8')
+        sections = convertmdc.scan_mdc_sections(content)
+        if not sections or not sections['rules']:
+            continue
+        line, start, end = sections['rules']
+        try:
+            parsed = convertmdc.load_yaml(convertmdc._section_yaml(content, 'rules', line, start, end))
+        except convertmdc.yaml.YAMLError:
+            continue
+        result.append(parsed.get('rules') or [])
+    return result
+
+
+def rule_records(files: List[Path]) -> List[List[convertmdc.Rule]]:
+    """Rules of each file as Rule records, built from the same mappings."""
+    return [[convertmdc.Rule.from_dict(rule) for rule in rules] for rules in rule_mappings(files)]
+
+
+def measure(build: Callable[[], List[List[Any]]]) -> Dict[str, Any]:
+    """Run build under tracemalloc and report the memory still held by its result."""
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rules = sum(len(rules) for rules in held)
+    return {
+        'rules': rules,
+        'held_bytes': current,
+        'peak_bytes': peak,
+        'bytes_per_rule': round(current / rules, 1) if rules else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare memory of dict and Rule rule layouts')
+    parser.add_argument('--files', type=int, default=500, help='Number of .mdc files (default: 500)')
+    parser.add_argument('--rules', type=int, default=20, help='Rules per file (default: 20)')
+    parser.add_argument('--description-lines', type=int, default=3,
+                        help='Lines per rule description (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed (default: 0)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / 'corpus'
+        generate_corpus(corpus, args.files, args.rules, args.description_lines,
+                        unquoted_globs=0.0, malformed=0.0, folders=10, seed=args.seed)
+        files = sorted(corpus.glob('**/*.mdc'))
+        report = {
+            'files': len(files),
+            'dicts': measure(lambda: rule_mappings(files)),
+            'records': measure(lambda: rule_records(files)),
+        }
+
+    dicts, records = report['dicts'], report['records']
+    report['saving'] = round(1 - records['held_bytes'] / dicts['held_bytes'], 3) if dicts['held_bytes'] else None
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['files']} files, {dicts['rules']} rules")
+    print(f"{'':10}{'held':>12}{'per rule':>12}{'peak':>12}")
+    for name in ('dicts', 'records'):
+        entry = report[name]
+        print(f"{name:10}{entry['held_bytes'] / 1024 / 1024:>10.1f}MB{entry['bytes_per_rule']:>11.0f}B"
+              f"{entry['peak_bytes'] / 1024 / 1024:>10.1f}MB")
+    print(f"Records hold {report['saving']:.0%} less")
+
+
+if __name__ == '__main__':
+    main()
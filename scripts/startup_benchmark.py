@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Measure how long convertmdc takes to start.
+
+The extension starts a fresh interpreter for every conversion, so for small
+rule sets start-up time is most of the wall-clock time. This script times
+short commands in new interpreters (best of --repeat), lists the slowest
+imports as reported by ``python -X importtime``, and checks that modules
+only some code paths need (PyYAML, asyncio, urllib.request,
+concurrent.futures) are not loaded by ``--version``. The bytecode cache of
+convertmdc.py is written first, as the extension's ``python -m convertmdc``
+runs use it; ``python convertmdc.py`` recompiles the script every time.
+
+Usage:
+    python scripts/startup_benchmark.py
+    python scripts/startup_benchmark.py --max-ms 120 --repeat 20
+    python scripts/startup_benchmark.py --json
+
+Exits with status 1 when the best start of ``-m convertmdc --version`` is
+slower than --max-ms, or when a deferred module is loaded at start-up.
+"""
+
+import argparse
+import json
+import py_compile
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / 'convertmdc.py'
+
+# Modules that should only be loaded by the paths that use them
+DEFERRED_MODULES = ('yaml', 'asyncio', 'urllib.request', 'concurrent.futures', 'subprocess', 'tempfile')
+
+SAMPLE_RULE_FILE = '''---
+description: Startup sample
+globs: *.py
+alwaysApply: false
+---
+
+rules:
+  - id: sample.rule
+    severity: warning
+    description: Keep start-up fast.
+'''
+
+
+def best_wall_time(command: List[str], repeat: int) -> float:
+    """Run a command in a fresh process repeat times and return the best wall time in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def import_times(command: List[str]) -> List[Dict[str, Any]]:
+    """
+    Run a command under -X importtime and parse its report.
+
+    Args:
+        command: Arguments after the interpreter
+
+    Returns:
+        One entry per imported module, in import order, with self and
+        cumulative microseconds and the nesting depth
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', *command], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+        })
+    return modules
+
+
+def run_benchmark(repeat: int) -> Dict[str, Any]:
+    """Time the start-up commands and collect the import report."""
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = Path(tmp) / 'sample.mdc'
+        sample.write_text(SAMPLE_RULE_FILE, encoding='utf-8')
+        commands = {
+            'python -c pass': [sys.executable, '-c', 'pass'],
+            'python -m convertmdc --version': [sys.executable, '-m', 'convertmdc', '--version'],
+            'python convertmdc.py --version': [sys.executable, str(SCRIPT), '--version'],
+            'python -m convertmdc FILE': [sys.executable, '-m', 'convertmdc', '--no-cache', str(sample)],
+        }
+        # Warm up the bytecode cache (also under PYTHONDONTWRITEBYTECODE) and the OS file cache
+        py_compile.compile(str(SCRIPT), doraise=True)
+        subprocess.run(commands['python -m convertmdc --version'], cwd=ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings = {name: best_wall_time(command, repeat) for name, command in commands.items()}
+
+    modules = import_times(['-m', 'convertmdc', '--version'])
+    loaded = {entry['module'] for entry in modules}
+    top_level = [entry for entry in modules if entry['depth'] == 0]
+    return {
+        'python': sys.version.split()[0],
+        'repeat': repeat,
+        'timings_ms': {name: round(seconds * 1000, 1) for name, seconds in timings.items()},
+        'slowest_imports': sorted(top_level, key=lambda entry: entry['cumulative_us'], reverse=True)[:10],
+        'deferred_loaded': [name for name in DEFERRED_MODULES if name in loaded],
+    }
+
+
+def print_report(report: Dict[str, Any], max_ms: float):
+    """Print a human-readable report."""
+    print(f"Python {report['python']}, best of {report['repeat']} runs")
+    print("\nWall time:")
+    for name, ms in report['timings_ms'].items():
+        print(f"  {name:<34} {ms:8.1f} ms")
+    print(f"  {'target (-m convertmdc --version)':<34} {max_ms:8.1f} ms")
+    print("\nSlowest top-level imports (-X importtime, cumulative):")
+    for entry in report['slowest_imports']:
+        print(f"  {entry['module']:<34} {entry['cumulative_us'] / 1000:8.1f} ms")
+    deferred = ', '.join(report['deferred_loaded']) or 'none'
+    print(f"\nDeferred modules loaded at start-up: {deferred}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure convertmdc start-up time')
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per command, best is kept (default: 10)')
+    parser.add_argument('--max-ms', type=float, default=100.0,
+                        help='Fail when -m convertmdc --version is slower than this (default: 100)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    report = run_benchmark(max(1, args.repeat))
+    report['max_ms'] = args.max_ms
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.max_ms)
+
+    too_slow = report['timings_ms']['python -m convertmdc --version'] > args.max_ms
+    if too_slow:
+        print(f"\nStart-up is slower than the {args.max_ms:.0f} ms target", file=sys.stderr)
+    if report['deferred_loaded']:
+        print(f"\nLoaded at start-up: {', '.join(report['deferred_loaded'])}", file=sys.stderr)
+    sys.exit(1 if too_slow or report['deferred_loaded'] else 0)
+
+
+if __name__ == '__main__':
+    main()
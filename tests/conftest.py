@@ -0,0 +1,71 @@
+"""Shared fixtures for the convertmdc tests."""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import convertmdc  # noqa: E402
+
+SAMPLE_RULE = '''---
+description: {description}
+globs: {globs}
+alwaysApply: false
+---
+
+# {description}
+
+rules:
+  - id: {rule_id}
+    severity: {severity}
+    description: |
+      {text}
+      - Keep it short.
+references:
+  - https://example.com/{rule_id}
+'''
+
+
+def write_rule(path: Path, rule_id: str = 'sample.rule', description: str = 'Sample rule',
+               globs: str = '*.py', severity: str = 'warning', text: str = 'Do the thing.') -> Path:
+    """Write a small well-formed .mdc file and return its path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(SAMPLE_RULE.format(rule_id=rule_id, description=description, globs=globs,
+                                       severity=severity, text=text), encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def rule_tree(tmp_path: Path) -> Path:
+    """A directory of rule files in nested folders, including one malformed file."""
+    root = tmp_path / 'rules'
+    write_rule(root / 'python.mdc', 'py.style', 'Python style', '*.py', 'error')
+    write_rule(root / 'web' / 'api.mdc', 'api.naming', 'API naming', 'src/api/**/*.ts', 'info')
+    write_rule(root / 'web' / 'ui.mdc', 'ui.a11y', 'UI accessibility', '*.tsx')
+    write_rule(root / 'ops' / 'deploy.mdc', 'ops.deploy', 'Deploys', '*.yml', 'error')
+    (root / 'ops' / 'broken.mdc').write_text('no frontmatter here\n', encoding='utf-8')
+    return root
+
+
+def convert(source: Path, output: Optional[Path], backup_existing: bool = False, dry_run: bool = False,
+            incremental: bool = False, **options) -> 'convertmdc.CursorRuleConverter':
+    """Convert source to output with a new converter built from options, and return the converter."""
+    converter = convertmdc.CursorRuleConverter(**options)
+    assert converter.convert(source, output, backup_existing=backup_existing, dry_run=dry_run,
+                             incremental=incremental)
+    return converter
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path: Path, monkeypatch):
+    """Keep the default cache directory and config lookups inside the test's directory."""
+    home = tmp_path / 'home'
+    home.mkdir()
+    monkeypatch.setenv('HOME', str(home))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(home / '.cache'))
+    monkeypatch.setenv('LOCALAPPDATA', str(home / 'AppData' / 'Local'))
+    return home
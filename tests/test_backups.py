@@ -0,0 +1,78 @@
+"""Backups in .backups: deduplicated storage and opt-in retention."""
+
+import convertmdc
+from convertmdc import BackupStore
+
+from conftest import write_rule
+
+
+def backups(store, name='out'):
+    return [path.name for _, _, path in store._existing(name, '.md', directories=False)]
+
+
+def back_up_versions(store, output, count):
+    for version in range(count):
+        output.write_text(f"version {version}\n", encoding='utf-8')
+        store.backup_file(output)
+
+
+def test_all_backups_are_kept_by_default(tmp_path):
+    store = BackupStore(tmp_path / '.backups')
+    back_up_versions(store, tmp_path / 'out.md', 12)
+    assert convertmdc.DEFAULT_BACKUP_KEEP == 0
+    assert len(backups(store)) == 12
+
+
+def test_keep_prunes_oldest_and_their_objects(tmp_path):
+    store = BackupStore(tmp_path / '.backups', keep=3)
+    back_up_versions(store, tmp_path / 'out.md', 5)
+    kept = backups(store)
+    assert len(kept) == 3
+    assert (tmp_path / '.backups' / kept[-1]).read_text(encoding='utf-8') == 'version 4\n'
+    assert len(list(store.objects_dir.glob('*/*'))) == 3
+
+
+def test_unchanged_output_is_not_backed_up_again(tmp_path):
+    store = BackupStore(tmp_path / '.backups')
+    output = tmp_path / 'out.md'
+    output.write_text('same\n', encoding='utf-8')
+    first, created = store.backup_file(output)
+    again, created_again = store.backup_file(output)
+    assert created and not created_again
+    assert again == first
+
+
+def test_keep_days_drops_old_backups_but_never_the_newest(tmp_path):
+    backup_dir = tmp_path / '.backups'
+    backup_dir.mkdir()
+    (backup_dir / 'out_20200101_000000.md').write_text('old\n', encoding='utf-8')
+    store = BackupStore(backup_dir, keep_days=1)
+    output = tmp_path / 'out.md'
+    output.write_text('old\n', encoding='utf-8')
+    # Matches the newest backup, which is kept however old it is
+    store.backup_file(output)
+    assert backups(store) == ['out_20200101_000000.md']
+    output.write_text('new\n', encoding='utf-8')
+    store.backup_file(output)
+    assert len(backups(store)) == 1 and backups(store) != ['out_20200101_000000.md']
+
+
+def test_compressed_backups_match_their_source(tmp_path):
+    store = BackupStore(tmp_path / '.backups', compress=True)
+    output = tmp_path / 'out.md'
+    output.write_text('compressed\n', encoding='utf-8')
+    backup_path, _ = store.backup_file(output)
+    assert backup_path.suffix == '.gz'
+    assert BackupStore.hash_file(backup_path) == BackupStore.hash_file(output)
+    assert store.backup_file(output) == (backup_path, False)
+
+
+def test_converter_backs_up_overwritten_output(tmp_path):
+    source = write_rule(tmp_path / 'rules' / 'a.mdc', text='First.').parent
+    output = tmp_path / 'out.md'
+    for text in ('First.', 'Second.', 'Third.'):
+        write_rule(source / 'a.mdc', text=text)
+        assert convertmdc.CursorRuleConverter().convert(source, output)
+    store = BackupStore(tmp_path / '.backups')
+    assert len(backups(store)) == 2
+    assert 'Third.' in output.read_text(encoding='utf-8')
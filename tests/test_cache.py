@@ -0,0 +1,95 @@
+"""Conversion cache: warm runs must produce the same output as cold ones."""
+
+import json
+import shutil
+import sys
+
+import pytest
+
+import convertmdc
+
+from conftest import convert
+
+
+def test_cached_output_is_byte_identical(rule_tree, tmp_path):
+    convert(rule_tree, tmp_path / 'plain.md')
+    cache_dir = tmp_path / 'cache'
+    cold = convert(rule_tree, tmp_path / 'cold.md', cache_dir=cache_dir)
+    warm = convert(rule_tree, tmp_path / 'warm.md', cache_dir=cache_dir)
+    assert (cold.cache.hits, cold.cache.misses) == (0, 5)
+    assert (warm.cache.hits, warm.cache.misses) == (5, 0)
+    expected = (tmp_path / 'plain.md').read_bytes()
+    assert (tmp_path / 'cold.md').read_bytes() == expected
+    assert (tmp_path / 'warm.md').read_bytes() == expected
+    assert warm.errors == cold.errors
+    assert warm.stats['total_rules'] == cold.stats['total_rules']
+
+
+def test_same_files_in_another_checkout_hit(rule_tree, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    convert(rule_tree, tmp_path / 'first.md', cache_dir=cache_dir)
+    checkout = tmp_path / 'checkout'
+    shutil.copytree(rule_tree, checkout)
+    shutil.rmtree(rule_tree)
+    warm = convert(checkout, tmp_path / 'second.md', cache_dir=cache_dir)
+    assert warm.cache.hits == 5
+    # Cached errors name the file that was converted this time
+    assert warm.errors == [f"No frontmatter found in {checkout / 'ops' / 'broken.mdc'}"]
+    # Index records of the removed tree are dropped
+    convert(checkout, tmp_path / 'third.md', cache_dir=cache_dir)
+    reloaded = convertmdc.ConversionCache(cache_dir, warm.cache_signature())
+    assert all(path.startswith(str(checkout)) for path in reloaded._files)
+
+
+def test_changed_content_or_settings_miss(rule_tree, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    convert(rule_tree, tmp_path / 'out.md', cache_dir=cache_dir)
+    (rule_tree / 'python.mdc').write_text(
+        (rule_tree / 'python.mdc').read_text(encoding='utf-8').replace('Do the thing.', 'Changed.'),
+        encoding='utf-8')
+    warm = convert(rule_tree, tmp_path / 'out.md', cache_dir=cache_dir)
+    assert (warm.cache.hits, warm.cache.misses) == (4, 1)
+    assert 'Changed.' in (tmp_path / 'out.md').read_text(encoding='utf-8')
+    other_format = convert(rule_tree, tmp_path / 'out.json', cache_dir=cache_dir, output_format='json')
+    assert other_format.cache.hits == 0
+
+
+@pytest.mark.skipif(sys.platform in ('win32', 'darwin'), reason='XDG layout')
+def test_default_cache_dir_is_per_user(isolated_home):
+    assert convertmdc.default_cache_dir() == isolated_home / '.cache' / 'convertmdc'
+
+
+def test_switching_settings_keeps_every_signature_warm(rule_tree, tmp_path):
+    (rule_tree / 'ops' / 'broken.mdc').unlink()
+    cache_dir = tmp_path / 'cache'
+    runs = [convert(rule_tree, tmp_path / 'out.md', cache_dir=cache_dir, **options)
+            for options in ({}, {}, {'dedupe': True}, {}, {'dedupe': True})]
+    assert [(run.cache.hits, run.cache.misses) for run in runs] == [(0, 4), (4, 0), (0, 4), (4, 0), (4, 0)]
+    objects = list((cache_dir / 'objects').rglob('*.json'))
+    assert len(objects) == 8
+    index = json.loads((cache_dir / 'index.json').read_text(encoding='utf-8'))
+    assert sorted(index['entries']) == sorted(path.stem for path in objects)
+
+
+def test_eviction_spans_signatures(rule_tree, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    convert(rule_tree, tmp_path / 'out.md', cache_dir=cache_dir)
+    size = sum(path.stat().st_size for path in (cache_dir / 'objects').rglob('*.json'))
+    convert(rule_tree, tmp_path / 'out.md', cache_dir=cache_dir, dedupe=True, cache_max_bytes=size)
+    # The older signature's entries are evicted first and nothing is left behind unindexed
+    index = json.loads((cache_dir / 'index.json').read_text(encoding='utf-8'))
+    assert sorted(index['entries']) == sorted(path.stem for path in (cache_dir / 'objects').rglob('*.json'))
+    assert sum(size for size, _ in index['entries'].values()) <= size
+    assert list(index['signatures']) == [convertmdc.CursorRuleConverter(dedupe=True).cache_signature()]
+    referenced = {record[2] for files in index['signatures'].values() for record in files.values()}
+    assert referenced == set(index['entries'])
+
+
+def test_objects_of_another_format_are_removed(rule_tree, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    convert(rule_tree, tmp_path / 'out.md', cache_dir=cache_dir)
+    index = json.loads((cache_dir / 'index.json').read_text(encoding='utf-8'))
+    (cache_dir / 'index.json').write_text(json.dumps(dict(index, format=-1)), encoding='utf-8')
+    rerun = convert(rule_tree, tmp_path / 'out.md', cache_dir=cache_dir)
+    assert rerun.cache.hits == 0
+    assert len(list((cache_dir / 'objects').rglob('*.json'))) == 5
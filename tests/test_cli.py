@@ -0,0 +1,50 @@
+"""Command-line help and option checks."""
+
+import subprocess
+import sys
+import warnings
+
+import pytest
+
+from conftest import ROOT
+
+
+def run(*args, cwd=None):
+    return subprocess.run([sys.executable, str(ROOT / 'convertmdc.py'), *args],
+                          capture_output=True, text=True, cwd=cwd, timeout=60)
+
+
+def test_module_compiles_without_warnings():
+    source = (ROOT / 'convertmdc.py').read_text(encoding='utf-8')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        compile(source, 'convertmdc.py', 'exec')
+
+
+def test_help_lists_the_examples():
+    completed = run('--help')
+    assert completed.returncode == 0
+    # Continuation backslashes in the examples render as a single backslash
+    assert '--backup-keep 5 --backup-keep-days 30 \\ ' in completed.stdout
+    assert '--stats-json stats.json \\ ' in completed.stdout
+
+
+def test_help_describes_backup_retention():
+    stdout = ' '.join(run('--help').stdout.split())
+    assert 'all of them are kept unless --backup-keep or --backup-keep-days is set' in stdout
+    assert 'newest 10' not in stdout
+
+
+@pytest.mark.parametrize('args, message', [
+    (['--format', 'bogus'], "invalid choice: 'bogus'"),
+    (['--format', 'json', '--dedupe'], 'only work with --format copilot'),
+    (['--format', 'instructions'], 'writes one file per source'),
+    (['--shard'], '--shard needs an OUTPUT directory'),
+    (['--max-tokens', '0'], '--max-tokens must be a positive integer'),
+    (['--backup-keep', '-1'], '--backup-keep and --backup-keep-days must be 0 or more'),
+    (['--sink', 'bogus'], "Unknown sink 'bogus'"),
+])
+def test_invalid_options_are_rejected(rule_tree, tmp_path, args, message):
+    completed = run(*args, str(rule_tree), cwd=tmp_path)
+    assert completed.returncode == 2
+    assert message in completed.stderr
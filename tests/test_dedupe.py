@@ -0,0 +1,56 @@
+"""--dedupe: rule spans are only kept for the cross-file rule index."""
+
+import convertmdc
+
+from conftest import convert, write_rule
+
+
+def duplicate_tree(root):
+    write_rule(root / 'a.mdc', 'shared.rule', 'First', text='Same text.')
+    write_rule(root / 'b.mdc', 'shared.rule', 'Second', text='Same text.')
+    write_rule(root / 'c.mdc', 'shared.rule', 'Third', text='Other text.')
+    return root
+
+
+def test_spans_are_only_kept_with_dedupe(tmp_path):
+    source = duplicate_tree(tmp_path / 'rules')
+    plain = convertmdc.CursorRuleConverter()
+    plain.process_file(source / 'a.mdc')
+    assert 'rules' not in plain.file_metadata[str(source / 'a.mdc')]
+    deduped = convertmdc.CursorRuleConverter(dedupe=True)
+    deduped.process_file(source / 'a.mdc')
+    assert deduped.file_metadata[str(source / 'a.mdc')]['rules'][0][:3] == [
+        'shared.rule', convertmdc.description_digest('Same text.\n- Keep it short.\n'), 'warning']
+
+
+def test_duplicates_and_conflicts(tmp_path):
+    source = duplicate_tree(tmp_path / 'rules')
+    converter = convert(source, tmp_path / 'out.md', dedupe=True)
+    output = (tmp_path / 'out.md').read_text(encoding='utf-8')
+    assert output.count('Same text.') == 1
+    assert 'Same rule as in' in output
+    assert '**Conflict:**' in output and 'Other text.' in output
+    assert any(error.startswith('Conflicting definitions of rule shared.rule') for error in converter.errors)
+
+
+def test_cache_without_spans_is_not_reused_for_dedupe(tmp_path):
+    source = duplicate_tree(tmp_path / 'rules')
+    cache_dir = tmp_path / 'cache'
+    convert(source, tmp_path / 'plain.md', cache_dir=cache_dir)
+    convert(source, tmp_path / 'cold.md', cache_dir=cache_dir, dedupe=True)
+    warm = convert(source, tmp_path / 'warm.md', cache_dir=cache_dir, dedupe=True)
+    assert warm.cache.hits == 3
+    assert (tmp_path / 'warm.md').read_bytes() == (tmp_path / 'cold.md').read_bytes()
+    assert 'Same rule as in' in (tmp_path / 'warm.md').read_text(encoding='utf-8')
+
+
+def test_compact_and_dedupe_agree_on_duplicate_descriptions(tmp_path):
+    source = tmp_path / 'rules'
+    write_rule(source / 'a.mdc', 'first.rule', 'First', text='Same text')
+    write_rule(source / 'b.mdc', 'second.rule', 'Second', text='SAME   text')
+    write_rule(source / 'c.mdc', 'first.rule', 'Third', text='Same text')
+    compacted = convert(source, tmp_path / 'compact.md', compact=True)
+    assert compacted.compactor.duplicates == 2
+    deduped = convert(source, tmp_path / 'dedupe.md', dedupe=True)
+    assert deduped.rule_index.duplicates == 1
+    assert deduped.rule_index.conflicts == 0
@@ -0,0 +1,92 @@
+"""DirectoryScanner: one walk that prunes ignored and .gitignore'd directories.
+
+File names are listed as in the tree, so the git comparison only uses
+patterns that cannot match the rule.mdc files themselves.
+"""
+
+import random
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from convertmdc import DEFAULT_IGNORE_DIRS, DirectoryScanner
+
+DIR_NAMES = ['a', 'b', 'build', 'cache', 'docs', 'gen', 'keep', 'out']
+PATTERNS = ['build', 'build/', '/build', 'cache/', '**/gen', 'docs/gen', '/a/b', 'b*', '!keep',
+            '!build', 'out/', '!out', '[ab]', 'd?cs', '**/keep/*/', 'a/**/cache', '# build', '\\!keep',
+            'gen/', '*/out']
+
+
+def make_tree(root: Path, paths):
+    for path in paths:
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text('---\n---\n', encoding='utf-8')
+    return root
+
+
+def relative(root, files):
+    return [path.relative_to(root).as_posix() for path in files]
+
+
+def test_matches_glob_without_ignores(tmp_path):
+    root = make_tree(tmp_path, ['x.mdc', 'a/y.mdc', 'a/b/z.mdc', 'node_modules/n.mdc', 'a/notes.md'])
+    scanner = DirectoryScanner(ignore_dirs=(), use_gitignore=False)
+    assert scanner.scan(root) == sorted(root.glob('**/*.mdc'))
+    assert relative(root, scanner.scan(root, recursive=False)) == ['x.mdc']
+
+
+def test_default_ignore_dirs_are_pruned(tmp_path):
+    root = make_tree(tmp_path, ['x.mdc', 'node_modules/pkg/n.mdc', '.venv/v.mdc', 'src/.git/g.mdc',
+                                'src/s.mdc'])
+    assert '.convertmdc-cache' in DEFAULT_IGNORE_DIRS
+    assert relative(root, DirectoryScanner().scan(root)) == ['src/s.mdc', 'x.mdc']
+
+
+def test_gitignore_rules(tmp_path):
+    root = make_tree(tmp_path, ['keep.mdc', 'build/b.mdc', 'src/build/c.mdc', 'src/gen/g.mdc',
+                                'docs/gen/d.mdc', 'docs/api/a.mdc', 'tmp/t.mdc', 'tmp/keep/k.mdc'])
+    (root / '.gitignore').write_text('/build\ndocs/gen/\ntmp/*\n!tmp/keep\n', encoding='utf-8')
+    (root / 'src' / '.gitignore').write_text('gen\n', encoding='utf-8')
+    # Only directories are matched, so tmp/* keeps the files directly in tmp
+    assert relative(root, DirectoryScanner().scan(root)) == [
+        'docs/api/a.mdc', 'keep.mdc', 'src/build/c.mdc', 'tmp/keep/k.mdc', 'tmp/t.mdc']
+    assert len(DirectoryScanner(use_gitignore=False).scan(root)) == 8
+
+
+def test_cached_listing_follows_changes(tmp_path):
+    root = make_tree(tmp_path, ['a/x.mdc', 'b/y.mdc'])
+    scanner = DirectoryScanner(cache_listings=True)
+    assert relative(root, scanner.scan(root)) == ['a/x.mdc', 'b/y.mdc']
+    time.sleep(0.01)
+    (root / '.gitignore').write_text('b\n', encoding='utf-8')
+    assert relative(root, scanner.scan(root)) == ['a/x.mdc']
+    time.sleep(0.01)
+    make_tree(root, ['a/z.mdc'])
+    assert relative(root, scanner.scan(root)) == ['a/x.mdc', 'a/z.mdc']
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='needs git')
+@pytest.mark.parametrize('seed', range(3))
+def test_gitignore_agrees_with_git(tmp_path, seed):
+    rng = random.Random(seed)
+    for case in range(15):
+        root = tmp_path / f"case{case}"
+        paths = set()
+        for _ in range(25):
+            depth = rng.randint(0, 3)
+            paths.add('/'.join([rng.choice(DIR_NAMES) for _ in range(depth)] + ['rule.mdc']))
+        make_tree(root, sorted(paths))
+        directories = [root] + [path for path in root.rglob('*') if path.is_dir()]
+        for directory in rng.sample(directories, min(3, len(directories))):
+            lines = rng.sample(PATTERNS, rng.randint(1, 4))
+            (directory / '.gitignore').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        subprocess.run(['git', 'init', '-q', str(root)], check=True)
+        listed = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard', '--', '*.mdc'],
+                                cwd=root, check=True, capture_output=True, text=True).stdout.split()
+        scanner = DirectoryScanner(ignore_dirs=('.git',))
+        assert sorted(relative(root, scanner.scan(root))) == sorted(listed), (
+            {str(path.relative_to(root)): path.read_text() for path in root.rglob('.gitignore')})
@@ -0,0 +1,84 @@
+"""--incremental: reusing sections of the previous output must match a full run."""
+
+import os
+
+import convertmdc
+
+from conftest import convert, write_rule
+
+
+def assert_matches_full_run(source, output, tmp_path):
+    full = tmp_path / 'full.md'
+    convert(source, full)
+    assert output.read_bytes() == full.read_bytes()
+
+
+def touch_later(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+
+def test_first_run_writes_manifest_and_second_is_unchanged(rule_tree, tmp_path):
+    output = tmp_path / 'out.md'
+    convert(rule_tree, output, incremental=True)
+    assert convertmdc.CursorRuleConverter.manifest_path_for(output).is_file()
+    mtime = output.stat().st_mtime_ns
+    again = convert(rule_tree, output, incremental=True)
+    assert again.manifest_unchanged
+    assert output.stat().st_mtime_ns == mtime
+    assert again.stats['successful'] == 4 and again.stats['failed'] == 1
+    assert len(again.errors) == 1
+
+
+def test_added_file(rule_tree, tmp_path, capsys):
+    output = tmp_path / 'out.md'
+    convert(rule_tree, output, incremental=True)
+    write_rule(rule_tree / 'web' / 'forms.mdc', 'ui.forms', 'Forms', '*.tsx')
+    capsys.readouterr()
+    converter = convert(rule_tree, output, incremental=True)
+    assert 'Incremental: 5 unchanged, 1 to convert, 0 removed' in capsys.readouterr().out
+    # Stats of unchanged files are replayed from the manifest
+    assert converter.stats['total_files'] == 6 and converter.stats['successful'] == 5
+    assert_matches_full_run(rule_tree, output, tmp_path)
+
+
+def test_changed_file(rule_tree, tmp_path, capsys):
+    output = tmp_path / 'out.md'
+    convert(rule_tree, output, incremental=True)
+    write_rule(rule_tree / 'web' / 'api.mdc', 'api.naming', 'API naming', 'src/api/**/*.ts', 'info',
+               text='Use plural nouns for collections.')
+    touch_later(rule_tree / 'web' / 'api.mdc')
+    capsys.readouterr()
+    convert(rule_tree, output, incremental=True)
+    assert 'Incremental: 4 unchanged, 1 to convert, 0 removed' in capsys.readouterr().out
+    assert 'Use plural nouns' in output.read_text(encoding='utf-8')
+    assert_matches_full_run(rule_tree, output, tmp_path)
+
+
+def test_removed_file(rule_tree, tmp_path, capsys):
+    output = tmp_path / 'out.md'
+    convert(rule_tree, output, incremental=True)
+    (rule_tree / 'python.mdc').unlink()
+    capsys.readouterr()
+    convert(rule_tree, output, incremental=True)
+    assert 'Incremental: 4 unchanged, 0 to convert, 1 removed' in capsys.readouterr().out
+    assert 'Python style' not in output.read_text(encoding='utf-8')
+    assert_matches_full_run(rule_tree, output, tmp_path)
+
+
+def test_edited_output_is_rebuilt(rule_tree, tmp_path, capsys):
+    output = tmp_path / 'out.md'
+    convert(rule_tree, output, incremental=True)
+    output.write_text('edited by hand\n', encoding='utf-8')
+    capsys.readouterr()
+    convert(rule_tree, output, incremental=True)
+    assert 'Incremental: 0 unchanged, 5 to convert, 0 removed' in capsys.readouterr().out
+    assert_matches_full_run(rule_tree, output, tmp_path)
+
+
+def test_ignored_with_a_warning_when_unsupported(rule_tree, tmp_path, capsys):
+    output = tmp_path / 'out.md'
+    converter = convert(rule_tree, output, incremental=True, dedupe=True)
+    assert not converter.supports_incremental()
+    assert 'Warning: --incremental only works with Copilot output' in capsys.readouterr().err
+    assert not convertmdc.CursorRuleConverter.manifest_path_for(output).exists()
@@ -0,0 +1,47 @@
+"""--jobs: worker processes must produce the same output as a serial run."""
+
+import pytest
+
+import convertmdc
+
+from conftest import convert, write_rule
+
+
+@pytest.fixture
+def larger_tree(rule_tree):
+    for number in range(12):
+        write_rule(rule_tree / f"group{number % 3}" / f"rule{number:02}.mdc", f"rule.{number}",
+                   f"Rule {number}", f"src/{number}/**", ('error', 'warning', 'info')[number % 3])
+    return rule_tree
+
+
+@pytest.mark.parametrize('jobs', [2, 4])
+def test_parallel_output_is_byte_identical(larger_tree, tmp_path, jobs):
+    serial = convert(larger_tree, tmp_path / 'serial.md')
+    parallel = convert(larger_tree, tmp_path / 'parallel.md', jobs=jobs)
+    assert (tmp_path / 'parallel.md').read_bytes() == (tmp_path / 'serial.md').read_bytes()
+    assert parallel.errors == serial.errors
+    assert parallel.processed_files == serial.processed_files
+    for key in convertmdc.FILE_COUNTER_KEYS:
+        assert parallel.stats[key] == serial.stats[key]
+
+
+def test_parallel_with_cache_is_byte_identical(larger_tree, tmp_path):
+    convert(larger_tree, tmp_path / 'serial.md')
+    cache_dir = tmp_path / 'cache'
+    cold = convert(larger_tree, tmp_path / 'cold.md', cache_dir=cache_dir, jobs=3)
+    write_rule(larger_tree / 'group1' / 'rule04.mdc', 'rule.4', 'Rule 4', 'src/4/**', 'warning',
+               text='Changed since the cold run.')
+    convert(larger_tree, tmp_path / 'serial2.md')
+    warm = convert(larger_tree, tmp_path / 'warm.md', cache_dir=cache_dir, jobs=3)
+    assert cold.cache.misses == 17
+    assert (warm.cache.hits, warm.cache.misses) == (16, 1)
+    assert (tmp_path / 'cold.md').read_bytes() == (tmp_path / 'serial.md').read_bytes()
+    assert (tmp_path / 'warm.md').read_bytes() == (tmp_path / 'serial2.md').read_bytes()
+
+
+def test_parallel_dedupe_and_formats_match_serial(larger_tree, tmp_path):
+    for options in ({'dedupe': True}, {'compact': True}, {'output_format': 'json'}):
+        convert(larger_tree, tmp_path / 'serial.out', **options)
+        convert(larger_tree, tmp_path / 'parallel.out', jobs=2, **options)
+        assert (tmp_path / 'parallel.out').read_bytes() == (tmp_path / 'serial.out').read_bytes()
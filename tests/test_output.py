@@ -0,0 +1,58 @@
+"""Unchanged outputs are left alone: no write, no new mtime, no backup."""
+
+from conftest import convert, write_rule
+
+
+def test_unchanged_output_is_not_rewritten(rule_tree, tmp_path, capsys):
+    output = tmp_path / 'out.md'
+    first = convert(rule_tree, output)
+    assert first.stats['output_status'] == 'written'
+    mtime, inode = output.stat().st_mtime_ns, output.stat().st_ino
+    capsys.readouterr()
+    again = convert(rule_tree, output, backup_existing=True)
+    assert again.stats['output_status'] == 'unchanged'
+    assert 'Output unchanged' in capsys.readouterr().out
+    assert (output.stat().st_mtime_ns, output.stat().st_ino) == (mtime, inode)
+    assert not (tmp_path / '.backups').exists()
+
+
+def test_changed_output_is_backed_up_and_replaced(rule_tree, tmp_path):
+    output = tmp_path / 'out.md'
+    convert(rule_tree, output)
+    before = output.read_bytes()
+    write_rule(rule_tree / 'python.mdc', 'py.style', 'Python style', '*.py', 'error', text='Changed.')
+    changed = convert(rule_tree, output, backup_existing=True)
+    assert changed.stats['output_status'] == 'written'
+    assert 'Changed.' in output.read_text(encoding='utf-8')
+    backups = list((tmp_path / '.backups').glob('out_*.md'))
+    assert [backup.read_bytes() for backup in backups] == [before]
+
+
+def test_output_that_only_shares_a_prefix_is_rewritten(rule_tree, tmp_path):
+    output = tmp_path / 'out.md'
+    convert(rule_tree, output)
+    expected = output.read_bytes()
+    output.write_bytes(expected + b'trailing edit\n')
+    convert(rule_tree, output)
+    assert output.read_bytes() == expected
+    output.write_bytes(expected[:-10])
+    convert(rule_tree, output)
+    assert output.read_bytes() == expected
+
+
+def test_dry_run_writes_nothing(rule_tree, tmp_path):
+    output = tmp_path / 'out.md'
+    convert(rule_tree, output, dry_run=True)
+    assert not output.exists()
+
+
+def test_symlinked_output_updates_the_link_target(rule_tree, tmp_path):
+    target = tmp_path / 'shared' / 'instructions.md'
+    target.parent.mkdir()
+    target.write_text('old\n', encoding='utf-8')
+    link = tmp_path / 'out.md'
+    link.symlink_to(target)
+    convert(rule_tree, link, backup_existing=False)
+    assert link.is_symlink()
+    assert '# Python style' in target.read_text(encoding='utf-8')
+    assert [path.name for path in target.parent.iterdir()] == ['instructions.md']
@@ -0,0 +1,61 @@
+"""RepoMirrorCache: blob-filtered mirrors feeding sparse checkouts."""
+
+import asyncio
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import convertmdc
+
+from conftest import write_rule
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='needs git')
+
+
+def git(*args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                   check=True, capture_output=True)
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """A repository that serves partial clones, with rule files next to large blobs."""
+    root = tmp_path / 'remote'
+    write_rule(root / 'rules' / 'python.mdc', 'py.style', 'Python style')
+    write_rule(root / 'web.mdc', 'web.style', 'Web style', '*.ts')
+    (root / 'large.bin').write_bytes(bytes(range(256)) * 4096)
+    git('init', '-q', str(root))
+    git('-C', str(root), 'config', 'uploadpack.allowFilter', 'true')
+    git('-C', str(root), 'add', '.')
+    git('-C', str(root), 'commit', '-q', '-m', 'rules')
+    return root.as_uri()
+
+
+def test_mirror_has_only_the_rule_blobs(remote, tmp_path):
+    cache = convertmdc.RepoMirrorCache(tmp_path / 'repos')
+    first, second = tmp_path / 'first', tmp_path / 'second'
+    assert asyncio.run(cache.checkout(remote, first)) is None
+    assert asyncio.run(cache.checkout(remote, second)) is None
+    assert (cache.fetched, cache.reused) == (1, 1)
+    for checkout in (first, second):
+        assert sorted(path.relative_to(checkout).as_posix() for path in checkout.rglob('*.mdc')) == [
+            'rules/python.mdc', 'web.mdc']
+        assert not (checkout / 'large.bin').exists()
+    mirror = cache.mirror_path(remote)
+    missing = subprocess.run(['git', '-C', str(mirror), 'rev-list', '--objects', '--missing=print', 'HEAD'],
+                             check=True, capture_output=True, text=True).stdout.split()
+    assert sum(line.startswith('?') for line in missing) == 1
+
+
+def test_mirrors_of_another_index_format_are_deleted(remote, tmp_path):
+    cache = convertmdc.RepoMirrorCache(tmp_path / 'repos')
+    assert asyncio.run(cache.checkout(remote, tmp_path / 'checkout')) is None
+    cache.save()
+    index_path = tmp_path / 'repos' / 'index.json'
+    index = json.loads(index_path.read_text(encoding='utf-8'))
+    assert index['format'] == convertmdc._REPO_CACHE_FORMAT
+    index_path.write_text(json.dumps(dict(index, format=-1)), encoding='utf-8')
+    convertmdc.RepoMirrorCache(tmp_path / 'repos')
+    assert not cache.mirror_path(remote).exists()
@@ -0,0 +1,100 @@
+"""scan_mdc_sections must find the same sections as the regex cascade it replaced."""
+
+import random
+import re
+
+import pytest
+
+import convertmdc
+
+
+def regex_sections(content):
+    """Sections as parse_mdc_file found them with regular expressions before the scanner."""
+    frontmatter = re.match(r'^---\s*\n(.*?\n)---\s*\n', content, re.DOTALL)
+    if not frontmatter:
+        return None
+    rest = content[frontmatter.end():]
+    result = {'frontmatter': frontmatter.group(1), 'header': None, 'rules': None,
+              'enforcement': None, 'references': None}
+    rules = re.search(r'^rules:\s*\n(.*?)(?=^references:|^---|\Z)', rest, re.MULTILINE | re.DOTALL)
+    references = re.search(r'^references:\s*\n(.*?)(?=^---|\Z)', rest, re.MULTILINE | re.DOTALL)
+    if rules:
+        rules_content = rules.group(1)
+        enforcement = re.search(r'^enforcement:\s*\n(.*?)(\Z|^[a-z_]+:)', rules_content,
+                                re.MULTILINE | re.DOTALL)
+        if enforcement:
+            result['enforcement'] = enforcement.group(1).strip()
+            rules_content = rules_content[:enforcement.start()]
+        result['rules'] = rules_content
+        result['header'] = rest[:rules.start()].strip()
+    if references:
+        result['references'] = references.group(1)
+    return result
+
+
+def scanned_sections(content):
+    """The same sections, sliced from the offsets scan_mdc_sections returns."""
+    sections = convertmdc.scan_mdc_sections(content)
+    if sections is None:
+        return None
+
+    def text(start, end):
+        return convertmdc.decode_slice(content, start, end)
+
+    result = {'frontmatter': text(*sections['frontmatter']), 'header': None, 'rules': None,
+              'enforcement': None, 'references': None}
+    if sections['rules']:
+        line, start, end = sections['rules']
+        if sections['enforcement']:
+            enforcement_line, enforcement_start, enforcement_end = sections['enforcement']
+            result['enforcement'] = text(enforcement_start, enforcement_end).strip()
+            end = enforcement_line
+        result['rules'] = text(start, end)
+        result['header'] = text(sections['body'], line).strip()
+    if sections['references']:
+        result['references'] = text(*sections['references'][1:])
+    return result
+
+
+# Markers with every kind of trailing whitespace \s matches, and lines around them
+TOKENS = ['---', '---', '\n', '\n', '\n', '\t', ' ', '\xa0', '\x0b', '\x0c', '\x1c', '\x85', ' ',
+          '　', 'rules:', 'references:', 'enforcement:', 'a: b', '- x', 'foo_bar:', '...', 'r', '-', ':']
+
+
+@pytest.mark.parametrize('content', [
+    '---\n---\t\nfoo: 1\n---\n',
+    '---\n---\t\n---\nrules:\n  - id: a\n',
+    '---\n\n---\n\nrules:\n',
+    '---\t\na: 1\n---\xa0\nrules:\xa0\n  - id: a\n',
+    '--- \na: 1\n---  \nrules:\n  - id: a\nenforcement:\xa0\n  x\nreferences:\n  - r\n---\n',
+    '---\na: 1\n---\nrules:\n  - id: a\nenforcement:\n  lint\nother_key:\n  y\nreferences:\n  - r\n',
+    '---\na: 1\n',
+    'no frontmatter\n',
+])
+def test_known_layouts(content):
+    assert scanned_sections(content) == regex_sections(content)
+    assert scanned_sections(content.encode('utf-8')) == regex_sections(content)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_random_layouts_match_regex(seed):
+    rng = random.Random(seed)
+    for _ in range(20000):
+        content = ''.join(rng.choice(TOKENS) for _ in range(rng.randint(1, 18)))
+        if rng.random() < 0.7:
+            content = '---' + content
+        expected = regex_sections(content)
+        assert scanned_sections(content) == expected, repr(content)
+        # Memory-mapped files are scanned as UTF-8 bytes
+        assert scanned_sections(content.encode('utf-8')) == expected, repr(content)
+
+
+def test_mapped_files_parse_like_text(tmp_path, monkeypatch):
+    path = tmp_path / 'rule.mdc'
+    path.write_text('---\ndescription: Mapped\xa0rule\nglobs: *.py\n---\n\n# Head\n\nrules:\n'
+                    '  - id: m.one\n    description: |\n      Ünïcode text\n', encoding='utf-8')
+    text_result = convertmdc.CursorRuleConverter().parse_mdc_file(path)
+    monkeypatch.setattr(convertmdc, 'MMAP_THRESHOLD', 0)
+    mapped_result = convertmdc.CursorRuleConverter().parse_mdc_file(path)
+    assert mapped_result.to_dict() == text_result.to_dict()
+    assert mapped_result.rules[0].description == 'Ünïcode text'
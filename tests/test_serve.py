@@ -0,0 +1,117 @@
+"""JSON-RPC server (--serve) and batch requests."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import convertmdc
+from convertmdc import ConverterServer
+
+from conftest import ROOT
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    # No .convertmdcrc is picked up from the working directory
+    monkeypatch.chdir(tmp_path)
+    return ConverterServer(cache_dir=tmp_path / 'cache')
+
+
+def call(server, method, **params):
+    return server.handle_line(json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params}))
+
+
+def test_convert_matches_the_command_line(server, rule_tree, tmp_path):
+    assert convertmdc.CursorRuleConverter().convert(rule_tree, tmp_path / 'cli.md', backup_existing=False)
+    response = call(server, 'convert', input=str(rule_tree), output=str(tmp_path / 'rpc.md'), backup=False)
+    result = response['result']
+    assert result['success']
+    assert result['stats']['successful'] == 4 and result['stats']['failed'] == 1
+    assert 'Output written to' in result['log']
+    assert (tmp_path / 'rpc.md').read_bytes() == (tmp_path / 'cli.md').read_bytes()
+
+
+def test_convert_forwards_output_settings(server, rule_tree, tmp_path):
+    result = call(server, 'convert', input=str(rule_tree), output=str(tmp_path / 'out.json'),
+                  format='json', backup=False)['result']
+    assert result['success']
+    assert isinstance(json.loads((tmp_path / 'out.json').read_text(encoding='utf-8')), list)
+    result = call(server, 'convert', input=str(rule_tree), output=str(tmp_path / 'shards'),
+                  shard='file', backup=False)['result']
+    assert result['success']
+    assert (tmp_path / 'shards' / 'index.md').is_file()
+
+
+def test_command_line_settings_are_defaults(rule_tree, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    server = ConverterServer(settings={'format': 'json'})
+    call(server, 'convert', input=str(rule_tree), output=str(tmp_path / 'out.json'), backup=False)
+    assert (tmp_path / 'out.json').read_text(encoding='utf-8').startswith('[')
+    call(server, 'convert', input=str(rule_tree), output=str(tmp_path / 'out.md'), format='copilot', backup=False)
+    assert (tmp_path / 'out.md').read_text(encoding='utf-8').startswith('#')
+
+
+@pytest.mark.parametrize('params, message', [
+    ({'format': 'bogus'}, 'format must be one of'),
+    ({'format': 'json', 'dedupe': True}, 'only work with --format copilot'),
+    ({'format': 'instructions'}, 'writes one file per source'),
+    ({'sinks': 'per-file'}, 'sinks must be a list'),
+])
+def test_convert_rejects_unusable_settings(server, rule_tree, tmp_path, params, message):
+    response = call(server, 'convert', input=str(rule_tree), output=str(tmp_path / 'out.md'), **params)
+    assert response['error']['code'] == ConverterServer.INVALID_PARAMS
+    assert message in response['error']['message']
+    assert not (tmp_path / 'out.md').exists()
+
+
+def test_batch_converts_each_entry_with_the_settings(server, rule_tree, tmp_path):
+    entries = [[str(rule_tree / 'python.mdc'), str(tmp_path / 'python.json')],
+               {'input': str(rule_tree / 'web'), 'output': str(tmp_path / 'web.json')},
+               [str(rule_tree / 'ops' / 'broken.mdc'), str(tmp_path / 'broken.json')]]
+    summary = call(server, 'batch', entries=entries, format='json', backup=False)['result']
+    assert (summary['succeeded'], summary['failed']) == (2, 1)
+    assert [result['success'] for result in summary['results']] == [True, True, False]
+    assert len(json.loads((tmp_path / 'web.json').read_text(encoding='utf-8'))) == 2
+
+
+def test_batch_rejects_sinks(server, rule_tree, tmp_path):
+    response = call(server, 'batch', entries=[[str(rule_tree), str(tmp_path / 'out.md')]], sinks=['per-file'])
+    assert response['error']['code'] == ConverterServer.INVALID_PARAMS
+    assert not (tmp_path / 'out.md').exists()
+
+
+def test_validate_and_preview(server, rule_tree):
+    valid = call(server, 'validate', input=str(rule_tree / 'python.mdc'))['result']
+    assert valid['valid'] and valid['rule_count'] == 1 and valid['errors'] == []
+    broken = call(server, 'validate', input=str(rule_tree / 'ops' / 'broken.mdc'))['result']
+    assert not broken['valid'] and broken['errors']
+    preview = call(server, 'preview', input=str(rule_tree / 'python.mdc'))['result']
+    assert preview['content'].startswith('# Python style')
+
+
+def test_protocol_errors(server):
+    assert server.handle_line('{not json')['error']['code'] == ConverterServer.PARSE_ERROR
+    assert call(server, 'missing')['error']['code'] == ConverterServer.METHOD_NOT_FOUND
+    assert call(server, 'convert')['error']['code'] == ConverterServer.INVALID_PARAMS
+    notification = json.dumps({'jsonrpc': '2.0', 'method': 'version'})
+    assert server.handle_line(notification) is None
+
+
+def test_serve_keeps_stdout_to_the_protocol(rule_tree, tmp_path):
+    requests = [
+        {'jsonrpc': '2.0', 'id': 1, 'method': 'convert',
+         'params': {'input': str(rule_tree), 'output': str(tmp_path / 'out.md'), 'backup': False}},
+        {'jsonrpc': '2.0', 'id': 2, 'method': 'version'},
+        {'jsonrpc': '2.0', 'id': 3, 'method': 'shutdown'},
+        {'jsonrpc': '2.0', 'id': 4, 'method': 'version'},
+    ]
+    completed = subprocess.run(
+        [sys.executable, str(ROOT / 'convertmdc.py'), '--serve', '--no-cache'],
+        input=''.join(json.dumps(request) + '\n' for request in requests),
+        capture_output=True, text=True, cwd=tmp_path, timeout=60)
+    responses = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert [response['id'] for response in responses] == [1, 2, 3]
+    assert responses[0]['result']['success']
+    assert responses[1]['result']['version'] == convertmdc.__version__
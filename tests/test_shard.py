@@ -0,0 +1,58 @@
+"""--shard: one .instructions.md file per source or per applyTo scope."""
+
+import convertmdc
+
+from conftest import convert, write_rule
+
+
+def shard_names(output_dir):
+    return sorted(path.name for path in output_dir.glob('*.instructions.md'))
+
+
+def test_one_shard_per_source(rule_tree, tmp_path):
+    output_dir = tmp_path / 'instructions'
+    converter = convert(rule_tree, output_dir, shard_by='file')
+    assert shard_names(output_dir) == ['ops-deploy.instructions.md', 'python.instructions.md',
+                                       'web-api.instructions.md', 'web-ui.instructions.md']
+    assert converter.stats['shards'] == {'written': 4, 'unchanged': 0, 'removed': 0}
+    api = (output_dir / 'web-api.instructions.md').read_text(encoding='utf-8')
+    assert api.startswith('---\ndescription: "API naming"\napplyTo: "src/api/**/*.ts"\n---\n')
+    assert '### api.naming' in api
+    index = (output_dir / 'index.md').read_text(encoding='utf-8')
+    assert '[web-api.instructions.md](web-api.instructions.md)' in index
+    assert '`web/api.mdc`' in index
+
+
+def test_glob_shards_group_sources_with_the_same_scope(rule_tree, tmp_path):
+    write_rule(rule_tree / 'web' / 'forms.mdc', 'ui.forms', 'Forms', '*.tsx')
+    output_dir = tmp_path / 'instructions'
+    convert(rule_tree, output_dir, shard_by='glob')
+    names = shard_names(output_dir)
+    assert len(names) == 4
+    tsx = next(name for name in names if 'tsx' in name)
+    content = (output_dir / tsx).read_text(encoding='utf-8')
+    assert '### ui.a11y' in content and '### ui.forms' in content
+
+
+def test_rerun_leaves_unchanged_shards_and_removes_stale_ones(rule_tree, tmp_path):
+    output_dir = tmp_path / 'instructions'
+    convert(rule_tree, output_dir, shard_by='file')
+    mtime = (output_dir / 'python.instructions.md').stat().st_mtime_ns
+    (output_dir / 'notes.instructions.md').write_text('kept: not written by the converter\n', encoding='utf-8')
+    (rule_tree / 'ops' / 'deploy.mdc').unlink()
+    write_rule(rule_tree / 'web' / 'ui.mdc', 'ui.a11y', 'UI accessibility', '*.tsx', text='Changed.')
+    converter = convert(rule_tree, output_dir, shard_by='file')
+    assert converter.stats['shards'] == {'written': 1, 'unchanged': 2, 'removed': 1}
+    assert (output_dir / 'python.instructions.md').stat().st_mtime_ns == mtime
+    assert not (output_dir / 'ops-deploy.instructions.md').exists()
+    assert (output_dir / 'notes.instructions.md').exists()
+    assert 'Changed.' in (output_dir / 'web-ui.instructions.md').read_text(encoding='utf-8')
+
+
+def test_shards_match_instructions_format_per_file(rule_tree, tmp_path):
+    output_dir = tmp_path / 'instructions'
+    convert(rule_tree, output_dir, shard_by='file')
+    single = tmp_path / 'python.instructions.md'
+    converter = convertmdc.CursorRuleConverter(output_format='instructions')
+    assert converter.convert(rule_tree / 'python.mdc', single, backup_existing=False)
+    assert (output_dir / 'python.instructions.md').read_bytes() == single.read_bytes()
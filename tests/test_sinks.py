@@ -0,0 +1,42 @@
+"""--sink: extra outputs from one parse match separate runs."""
+
+from convertmdc import OutputSink
+
+from conftest import convert
+
+
+def tree_bytes(root):
+    return {path.relative_to(root).as_posix(): path.read_bytes()
+            for path in sorted(root.rglob('*')) if path.is_file()}
+
+
+def test_sinks_match_separate_runs(rule_tree, tmp_path):
+    convert(rule_tree, tmp_path / 'alone.md')
+    convert(rule_tree, tmp_path / 'alone.json', output_format='json')
+    convert(rule_tree, tmp_path / 'alone-shards', shard_by='file')
+    sinks = [OutputSink.parse(f"json:{tmp_path / 'out.json'}"),
+             OutputSink.parse(f"shard:{tmp_path / 'shards'}")]
+    converter = convert(rule_tree, tmp_path / 'out.md', sinks=sinks)
+    assert (tmp_path / 'out.md').read_bytes() == (tmp_path / 'alone.md').read_bytes()
+    assert (tmp_path / 'out.json').read_bytes() == (tmp_path / 'alone.json').read_bytes()
+    assert tree_bytes(tmp_path / 'shards') == tree_bytes(tmp_path / 'alone-shards')
+    assert [sink['kind'] for sink in converter.stats['sinks']] == ['json', 'shard']
+
+
+def test_per_file_sink_writes_next_to_each_source(rule_tree, tmp_path):
+    convert(rule_tree, tmp_path / 'out.md', sinks=[OutputSink.parse('per-file')])
+    written = sorted(path.relative_to(rule_tree).as_posix() for path in rule_tree.rglob('*-copilot.md'))
+    assert written == ['ops/deploy-copilot.md', 'python-copilot.md', 'web/api-copilot.md', 'web/ui-copilot.md']
+    convert(rule_tree / 'web' / 'api.mdc', tmp_path / 'api.md')
+    assert (rule_tree / 'web' / 'api-copilot.md').read_bytes() == (tmp_path / 'api.md').read_bytes()
+
+
+def test_cached_sinks_are_identical_and_left_unchanged(rule_tree, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    json_sink = f"json:{tmp_path / 'out.json'}"
+    convert(rule_tree, tmp_path / 'out.md', cache_dir=cache_dir, sinks=[OutputSink.parse(json_sink)])
+    first = (tmp_path / 'out.json').read_bytes()
+    warm = convert(rule_tree, tmp_path / 'out.md', cache_dir=cache_dir, sinks=[OutputSink.parse(json_sink)])
+    assert warm.cache.hits == 5
+    assert (tmp_path / 'out.json').read_bytes() == first
+    assert warm.sinks[0].unchanged == 1 and warm.sinks[0].written == 0
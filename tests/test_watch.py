@@ -0,0 +1,57 @@
+"""--watch: rebuilds follow changes and stay quiet about replacing their own output."""
+
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from conftest import ROOT, write_rule
+
+
+def read_lines(stream, lines):
+    for line in stream:
+        lines.put(line)
+
+
+def wait_for(lines, text, timeout=20):
+    seen = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            line = lines.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        seen.append(line)
+        if text in line:
+            return seen
+    raise AssertionError(f"{text!r} not printed; got {''.join(seen)!r}")
+
+
+def test_rebuilds_replace_output_quietly(rule_tree, tmp_path):
+    output = tmp_path / 'out.md'
+    output.write_text('previous\n', encoding='utf-8')
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / 'convertmdc.py'), '--watch', '--poll', '--poll-interval', '0.05',
+         '--debounce', '50', '--no-backup', '--no-cache', str(rule_tree), str(output)],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, cwd=tmp_path)
+    lines = queue.Queue()
+    threading.Thread(target=read_lines, args=(proc.stdout, lines), daemon=True).start()
+    try:
+        first = wait_for(lines, 'Output written to')
+        # --no-backup still announces replacing the existing file once
+        assert any('Overwriting existing file' in line for line in first)
+
+        write_rule(rule_tree / 'web' / 'forms.mdc', 'ui.forms', 'Forms', '*.tsx')
+        rebuilt = wait_for(lines, 'Output written to')
+        assert 'ui.forms' in output.read_text(encoding='utf-8')
+        assert not any('Overwriting existing file' in line for line in rebuilt)
+
+        # Touching a file without changing the output leaves it alone
+        mtime = output.stat().st_mtime_ns
+        write_rule(rule_tree / 'web' / 'forms.mdc', 'ui.forms', 'Forms', '*.tsx')
+        wait_for(lines, 'Output unchanged')
+        assert output.stat().st_mtime_ns == mtime
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
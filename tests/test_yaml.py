@@ -0,0 +1,67 @@
+"""load_yaml must return exactly what yaml.safe_load returns, or raise the same error."""
+
+import random
+
+import pytest
+import yaml
+
+import convertmdc
+
+# Lines rule files use, plus the ones the fast path has to leave to PyYAML
+FRAGMENTS = [
+    'description: Foo', 'description: "Quoted"', "description: 'single'", 'globs: *.py',
+    'alwaysApply: true', 'alwaysApply: no', 'x: ~', 'n: 12', 'n: 012', 'n: 1.5', 'yes: 1',
+    'rules:', 'references:', 'list:', '  - one', '  - two', '- plain', '  - plain',
+    '  - id: r1', '    severity: error', '    description: plain text', '    description: |',
+    '    description: |-', '    description: >', '      line one', '      line two', '',
+    ' ', '# comment', 'key: value # trailing', 'k: [a, b]', 'k: {a: 1}', 'k: &a v', 'k: *a',
+    'k: !!str 1', 'k: "esc\\n"', 'x: y: z', 'a:\tb', '\tx: y', '\t- id: tab', 'a: b\xa0',
+    '\xa0', '---', '---\t', '--- ', '...', '----', '- ', '  -', 'a:b', 'é: ü',
+]
+
+
+def outcome(load, text):
+    try:
+        return 'ok', load(text)
+    except yaml.YAMLError as e:
+        return 'error', type(e).__name__, str(e)
+
+
+def safe_load(text):
+    return yaml.load(text, Loader=yaml.SafeLoader)
+
+
+@pytest.mark.parametrize('text', [
+    '---\t\n  - plain\n',
+    '---\t\ndescription: Foo\nrules:\n',
+    'a:\tb\n',
+    '--- \ndescription: Foo\n',
+    'description: Foo\n...\n',
+    'description: Foo\n---\nglobs: x\n',
+    'rules:\xa0\n  - id: a\n',
+    'rules:\n  - id: a\n    description: |\n      text\n',
+])
+def test_known_cases(text):
+    assert outcome(convertmdc.load_yaml, text) == outcome(safe_load, text)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_random_documents_match_safe_load(seed):
+    rng = random.Random(seed)
+    for _ in range(3000):
+        text = '\n'.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 8)))
+        if rng.random() < 0.8:
+            text += '\n'
+        assert outcome(convertmdc.load_yaml, text) == outcome(safe_load, text), repr(text)
+
+
+def test_fast_path_takes_rule_documents():
+    text = ('rules:\n  - id: a.b\n    severity: error\n    description: |\n'
+            '      Use `x`.\n      - bullet\n  - id: c\n    description: plain\n')
+    assert convertmdc._FastYAMLParser(text).parse() == safe_load(text)
+
+
+@pytest.mark.parametrize('text', ['a:\tb\n', '---\na: b\n', 'a: b\n...\n'])
+def test_fast_path_leaves_tabs_and_markers_to_pyyaml(text):
+    with pytest.raises(convertmdc._FastPathUnsupported):
+        convertmdc._FastYAMLParser(text).parse()